@@ -0,0 +1,131 @@
+import argparse
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+import gamelogic
+from headless import HeadlessRunner
+
+TEAMS = ("blue", "red", "none")
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+def run_scenario(seed: int, config_filename: str, units_filename: str, steps: int, sample_every: int,
+                 delta_time: int = None, use_unit_store: bool = False) -> list[dict[str, float]]:
+    """
+    Runs one seeded headless simulation and samples the tile affiliation percentages.
+
+    Args:
+        seed (int): Seed for the run's random streams.
+        config_filename (str): Path to the JSON configuration file.
+        units_filename (str): Path to the JSON file containing unit data.
+        steps (int): Number of fixed time steps to simulate.
+        sample_every (int): Number of steps between samples.
+        delta_time (int, optional): Simulated milliseconds per step.
+        use_unit_store (bool): Run units on the NumPy-backed UnitStore.
+
+    Returns:
+        list[dict[str, float]]: Percentages after every sample_every steps, ending with the final state.
+    """
+    runner = HeadlessRunner(config_filename, units_filename, delta_time, use_unit_store, seed=seed)
+    samples = []
+    for step in range(1, steps + 1):
+        runner.step()
+        if step % sample_every == 0 or step == steps:
+            samples.append(gamelogic.calculate_tile_affiliation_percentages(runner.tiles))
+    return samples
+
+def _run_scenario_args(args: tuple) -> list[dict[str, float]]:
+    return run_scenario(*args)
+
+def quantile(sorted_values: list[float], q: float) -> float:
+    """
+    Linearly interpolated quantile of an already sorted list.
+    """
+    position = (len(sorted_values) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def aggregate(runs: list[list[dict[str, float]]], steps: int, sample_every: int) -> dict:
+    """
+    Aggregates per-run samples into mean and quantiles at each sample point plus win rates
+    on the final state. Runs must be given in seed order so results are reproducible.
+
+    Returns:
+        dict: {"runs", "samples": [{"step", "<team>": {"mean", "q05", ...}}], "win_rates"}.
+    """
+    sample_steps = [step for step in range(1, steps + 1) if step % sample_every == 0 or step == steps]
+    samples = []
+    for i, step in enumerate(sample_steps):
+        sample = {"step": step}
+        for team in TEAMS:
+            values = sorted(run[i][team] for run in runs)
+            stats = {"mean": math.fsum(values) / len(values)}
+            for q in QUANTILES:
+                stats[f"q{round(q * 100):02d}"] = quantile(values, q)
+            sample[team] = stats
+        samples.append(sample)
+
+    wins = {"blue": 0, "red": 0, "draw": 0}
+    for run in runs:
+        final = run[-1]
+        if final["blue"] > final["red"]:
+            wins["blue"] += 1
+        elif final["red"] > final["blue"]:
+            wins["red"] += 1
+        else:
+            wins["draw"] += 1
+    return {
+        "runs": len(runs),
+        "samples": samples,
+        "win_rates": {outcome: count / len(runs) for outcome, count in wins.items()},
+    }
+
+def run_batch(seeds: list[int], config_filename: str = "config.json", units_filename: str = "units.json",
+              steps: int = 1000, sample_every: int = 100, workers: int = 1, delta_time: int = None,
+              use_unit_store: bool = False) -> dict:
+    """
+    Runs one headless simulation per seed across a process pool and aggregates the outcomes.
+    Every run owns its random streams and results are collected in seed order, so the output
+    is identical for a given seed set regardless of the worker count.
+
+    Raises:
+        ValueError: If no seeds are given or steps/sample_every are not positive.
+    """
+    if not seeds:
+        raise ValueError("At least one seed is required.")
+    if steps <= 0 or sample_every <= 0:
+        raise ValueError("steps and sample_every must be positive.")
+    jobs = [(seed, config_filename, units_filename, steps, sample_every, delta_time, use_unit_store) for seed in seeds]
+    if workers <= 1:
+        runs = [_run_scenario_args(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            runs = list(pool.map(_run_scenario_args, jobs))
+    return aggregate(runs, steps, sample_every)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many seeded headless simulations and aggregate the outcomes.")
+    parser.add_argument("--config", default="config.json", help="Path to the configuration file.")
+    parser.add_argument("--units", default="units.json", help="Path to the unit data file.")
+    parser.add_argument("--runs", type=int, default=100, help="Number of runs.")
+    parser.add_argument("--first-seed", type=int, default=0, help="Seed of the first run; runs use consecutive seeds.")
+    parser.add_argument("--steps", type=int, default=1000, help="Steps per run.")
+    parser.add_argument("--sample-every", type=int, default=100, help="Steps between samples.")
+    parser.add_argument("--delta-time", type=int, default=None, help="Simulated milliseconds per step.")
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
+    parser.add_argument("--unit-store", action="store_true", help="Use the NumPy-backed unit store.")
+    parser.add_argument("--output", default=None, help="Write the aggregate as JSON to this file instead of stdout.")
+    args = parser.parse_args()
+
+    seeds = list(range(args.first_seed, args.first_seed + args.runs))
+    result = run_batch(seeds, args.config, args.units, args.steps, args.sample_every, args.workers,
+                       args.delta_time, args.unit_store)
+    text = json.dumps(result, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Render benchmarks draw offscreen
+import controllers
+import gamelogic
+import initialization
+from game_objects import Team, TileGrid
+
+GRID_SIZES = (20, 200, 2000)
+UNIT_COUNTS = (32, 1000, 100_000, 1_000_000)
+PRESETS = {
+    "quick": {"grids": (20, 200), "units": (32, 1000)},
+    "full": {"grids": GRID_SIZES, "units": UNIT_COUNTS},
+}
+MODES = ("object", "scheduler", "store")
+OBJECT_UNIT_LIMIT = 100_000  # Per-object modes take minutes per case beyond this
+RENDER_GRID_LIMIT = 200  # Larger maps do not fit an offscreen surface at any readable hex size
+DELTA_TIME = 16
+SEED = 1234
+
+def build_world(size: int, unit_count: int, mode: str = "object", seed: int = SEED) -> controllers.SimulationController:
+    """
+    Builds a size x size simulation with unit_count units at seeded random positions.
+    """
+    blue = controllers.TeamController(Team.BLUE, random.Random(f"{seed}:blue"))
+    red = controllers.TeamController(Team.RED, random.Random(f"{seed}:red"))
+    sim = controllers.SimulationController(blue, red, TileGrid(size, size), None,
+                                           use_unit_store=mode == "store", use_scheduler=mode == "scheduler")
+    placement = random.Random(seed)
+    for i in range(unit_count):
+        team = Team.BLUE if i % 2 == 0 else Team.RED
+        unit = sim.create_unit(placement.randrange(size), placement.randrange(size), team, placement.choice((1, 2, 4)))
+        (blue if team == Team.BLUE else red).add_unit(unit)
+    return sim
+
+def measure(run, repeats: int, prepare=None) -> dict:
+    """
+    Times `run` repeats times, calling `prepare` (untimed) before each run.
+
+    Returns:
+        dict: Median and minimum seconds per run and the number of repeats.
+    """
+    samples = []
+    for _ in range(repeats):
+        if prepare is not None:
+            prepare()
+        start = time.perf_counter()
+        run()
+        samples.append(time.perf_counter() - start)
+    return {"seconds": statistics.median(samples), "min_seconds": min(samples), "repeats": repeats}
+
+def bench_update(size: int, unit_count: int, mode: str, repeats: int) -> dict:
+    sim = build_world(size, unit_count, mode)
+
+    def prepare():
+        sim.blue_controller.move_units_randomly()
+        sim.red_controller.move_units_randomly()
+
+    return measure(lambda: sim.update(DELTA_TIME), repeats, prepare)
+
+def bench_move_randomly(size: int, unit_count: int, mode: str, repeats: int) -> dict:
+    sim = build_world(size, unit_count, mode)
+
+    def run():
+        sim.blue_controller.move_units_randomly()
+        sim.red_controller.move_units_randomly()
+
+    return measure(run, repeats, lambda: sim.update(DELTA_TIME))
+
+def bench_percentages(size: int, unit_count: int, repeats: int) -> dict:
+    sim = build_world(size, unit_count, "store" if unit_count > OBJECT_UNIT_LIMIT else "object")
+    return measure(lambda: gamelogic.calculate_tile_affiliation_percentages(sim.tiles), repeats)
+
+def bench_recount(size: int, unit_count: int, repeats: int) -> dict:
+    sim = build_world(size, unit_count, "store" if unit_count > OBJECT_UNIT_LIMIT else "object")
+    return measure(sim.tiles.recount, repeats)
+
+def bench_load_units(size: int, unit_count: int, mode: str, repeats: int, workdir: str) -> dict:
+    placement = random.Random(SEED)
+    data = [{"col": placement.randrange(size), "row": placement.randrange(size),
+             "team": "blue" if i % 2 == 0 else "red", "speed": 2} for i in range(unit_count)]
+    units_filename = os.path.join(workdir, f"units_{size}_{unit_count}.json")
+    with open(units_filename, 'w') as f:
+        json.dump(data, f)
+    holder = {}
+
+    def prepare():
+        holder["blue"] = controllers.TeamController(Team.BLUE)
+        holder["red"] = controllers.TeamController(Team.RED)
+        holder["sim"] = controllers.SimulationController(holder["blue"], holder["red"], TileGrid(size, size), None,
+                                                         use_unit_store=mode == "store")
+
+    return measure(lambda: initialization.load_units_from_json(units_filename, holder["blue"], holder["red"], holder["sim"]),
+                   repeats, prepare)
+
+def bench_draw_map(size: int, unit_count: int, repeats: int) -> dict:
+    import pygame
+    import renderer
+    pygame.init()
+    hex_size = max(2, int(1000 / (size * 1.8)))
+    screen = pygame.Surface((int(hex_size * 1.8 * (size + 1)), int(hex_size * 1.5 * (size + 1))))
+    sim = build_world(size, unit_count, "object")
+    render_controller = renderer.RenderController(screen, 60, hex_size, sim.tiles, sim.units)
+    first = measure(render_controller.draw_map, 1)
+
+    def prepare():
+        sim.blue_controller.move_units_randomly()
+        sim.red_controller.move_units_randomly()
+        sim.update(DELTA_TIME)
+
+    result = measure(render_controller.draw_map, repeats, prepare)
+    result["first_frame_seconds"] = first["seconds"]
+    return result
+
+def run_suite(preset: str, repeats: int, include_render: bool = True) -> dict:
+    """
+    Runs every benchmark case of a preset.
+
+    Returns:
+        dict: Case name -> timing results.
+    """
+    results = {}
+    grids = PRESETS[preset]["grids"]
+    unit_counts = PRESETS[preset]["units"]
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in grids:
+            for unit_count in unit_counts:
+                for mode in MODES:
+                    if mode != "store" and unit_count > OBJECT_UNIT_LIMIT:
+                        continue
+                    params = f"{mode},grid={size},units={unit_count}"
+                    results[f"update[{params}]"] = bench_update(size, unit_count, mode, repeats)
+                    results[f"move_units_randomly[{params}]"] = bench_move_randomly(size, unit_count, mode, repeats)
+                for mode in ("object", "store"):
+                    if mode == "object" and unit_count > OBJECT_UNIT_LIMIT:
+                        continue
+                    results[f"load_units_from_json[{mode},grid={size},units={unit_count}]"] = bench_load_units(
+                        size, unit_count, mode, repeats, workdir)
+                if include_render and size <= RENDER_GRID_LIMIT and unit_count <= OBJECT_UNIT_LIMIT:
+                    results[f"draw_map[grid={size},units={unit_count}]"] = bench_draw_map(size, unit_count, repeats)
+            results[f"calculate_tile_affiliation_percentages[grid={size}]"] = bench_percentages(size, unit_counts[0], repeats)
+            results[f"recount[grid={size}]"] = bench_recount(size, unit_counts[0], repeats)
+    for result in results.values():
+        result["per_second"] = 1.0 / result["seconds"] if result["seconds"] > 0 else float("inf")
+    return results
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta: float = 1e-4) -> list[str]:
+    """
+    Lists the cases whose best time grew by more than `threshold` (a fraction) over the
+    baseline. Slowdowns smaller than min_delta seconds are treated as timer noise.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]["min_seconds"]
+        after = result["min_seconds"]
+        if after > before * (1.0 + threshold) and after - before > min_delta:
+            regressions.append(f"{name}: {before * 1000:.3f}ms -> {after * 1000:.3f}ms ({after / before:.2f}x)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark simulation ticks/sec and renderer frame time.")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick", help="Which grid and unit scales to run.")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed repetitions per case.")
+    parser.add_argument("--no-render", action="store_true", help="Skip the draw_map benchmarks.")
+    parser.add_argument("--output", default=None, help="Write results as JSON to this file.")
+    parser.add_argument("--compare", default=None, help="Baseline results JSON to check for regressions.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown before a case counts as a regression.")
+    parser.add_argument("--min-delta", type=float, default=1e-4, help="Ignore slowdowns smaller than this many seconds.")
+    args = parser.parse_args()
+
+    results = run_suite(args.preset, args.repeats, not args.no_render)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "preset": args.preset,
+            "repeats": args.repeats,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    for name, result in results.items():
+        print(f"{name:70s} {result['seconds'] * 1000:10.3f} ms  {result['per_second']:12.1f}/s")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold, args.min_delta)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
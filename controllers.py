@@ -2,15 +2,45 @@ from __future__ import annotations  # For Python 3.7+
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from game_objects import Unit, Tile
+    from event_log import EventLogWriter
+import event_log
 import gamelogic
+import heapq
 import json
 import random
-from game_objects import Team, Direction
+from game_objects import Team, Direction, Unit, TileGrid, DIRECTIONS, DIRECTION_INDEX, TEAM_CODES, CODE_TEAMS
+from occupancy import OccupancyIndex
+from pathfinding import FlowFieldCache
+from territory import TerritoryTracker
+from unit_store import UnitStore, UnitView, make_rng
 
 class SimulationController:
-    def __init__(self, blue_controller, red_controller, tiles: list[list["Tile"]]):
+    def __init__(self, blue_controller, red_controller, tiles: list[list["Tile"]], config_filename: str = 'config.json',
+                 use_unit_store: bool = False, use_scheduler: bool = False, event_log: "EventLogWriter" = None,
+                 track_territory: bool = False):
         """
         Initializes the SimulationController with references to the team controllers.
+
+        Args:
+            blue_controller (TeamController): Controller for the blue team.
+            red_controller (TeamController): Controller for the red team.
+            tiles (list[list[Tile]]): A 2D list of Tile objects.
+            config_filename (str): Path to the JSON configuration file holding the grid dimensions.
+                Pass None to take the dimensions from a TileGrid instead of reading a file.
+            use_unit_store (bool): Keep unit state in a NumPy-backed UnitStore and update it
+                with array operations. Units are then created through create_unit().
+            use_scheduler (bool): Schedule each move's completion time in a priority queue so
+                update() only touches units whose move finishes in that window. In-flight
+                progress is then computed lazily from the move's start time.
+            event_log (EventLogWriter, optional): Binary log that records unit additions, move
+                starts, move completions and affiliation changes, plus periodic keyframes.
+            track_territory (bool): Keep each team's connected regions and the frontline up to
+                date as tiles change hands (see territory.py). Requires a TileGrid.
+
+        Raises:
+            ValueError: If the grid dimensions cannot be loaded, if both the unit store
+                and the scheduler are requested, or if territory tracking is requested
+                without a TileGrid.
         """
         self.blue_controller = blue_controller
         self.red_controller = red_controller
@@ -19,21 +49,138 @@ class SimulationController:
         blue_controller.simulation_controller = self
         red_controller.simulation_controller = self
         try:
-            with open('config.json', 'r') as f:
-                config = json.load(f)
-            self.rows = config['rows']
-            self.cols = config['cols']
+            if config_filename is None:
+                if not isinstance(tiles, TileGrid):
+                    raise ValueError("Grid dimensions can only be taken from a TileGrid.")
+                self.rows = tiles.rows
+                self.cols = tiles.cols
+            else:
+                with open(config_filename, 'r') as f:
+                    config = json.load(f)
+                self.rows = config['rows']
+                self.cols = config['cols']
             if not isinstance(self.rows, int) or not isinstance(self.cols, int) or self.rows <= 0 or self.cols <= 0:
                 raise ValueError("Grid dimensions must be positive integers.")
         except (FileNotFoundError, KeyError, json.JSONDecodeError) as e:
-            raise ValueError(f"Error loading grid dimensions from config.json: {e}")
+            raise ValueError(f"Error loading grid dimensions from {config_filename}: {e}")
+        self.occupancy = OccupancyIndex(self.rows, self.cols, self.topology)  # Which units stand on each tile
+        self._flow_fields = None
+        if use_unit_store and use_scheduler:
+            raise ValueError("The move scheduler works on Unit objects and cannot be combined with the unit store.")
+        self.unit_store = UnitStore(self.rows, self.cols, topology=self.topology) if use_unit_store else None
+        self.use_scheduler = use_scheduler
+        self.move_queue = []  # Heap of (completion_time, unit_id, unit) when scheduling
+        self.time = 0  # Simulated milliseconds elapsed
+        self.tick = 0  # Number of updates applied
+        self.moves_started = 0  # Running totals, for metrics
+        self.moves_completed = 0
+        self.event_log = event_log
+        self.territory = TerritoryTracker(tiles, self.topology) if track_territory else None
+
+    @property
+    def topology(self) -> gamelogic.HexTopology:
+        """
+        The grid's adjacency, which every move, neighborhood query and flow field follows.
+        Dense grids share a neighbor table built on first use; chunked grids compute
+        neighbors on the fly, so a sparse map never pays for a table.
+        """
+        return gamelogic.topology_for(self.tiles, self.rows, self.cols)
+
+    @property
+    def flow_fields(self) -> FlowFieldCache:
+        """
+        Flow fields shared by every team heading for the same goals.
+        """
+        if self._flow_fields is None:
+            self._flow_fields = FlowFieldCache(self.topology)
+        return self._flow_fields
+
+    def save_snapshot(self, filename: str):
+        """
+        Writes the full simulation state to a compact binary snapshot (see snapshot.py).
+        """
+        import snapshot  # Imported here because snapshot builds SimulationControllers
+        snapshot.save_snapshot(self, filename)
+
+    @classmethod
+    def from_snapshot(cls, filename: str, blue_controller: "TeamController", red_controller: "TeamController",
+                      event_log: "EventLogWriter" = None) -> "SimulationController":
+        """
+        Rebuilds a SimulationController from a snapshot without reading config.json or the unit file.
+        """
+        import snapshot
+        return snapshot.restore_snapshot(filename, blue_controller, red_controller, event_log)
+
+    def create_unit(self, col: int, row: int, team: Team, speed: int) -> "Unit":
+        """
+        Creates a unit and adds it to the simulation. When a unit store is in use the
+        unit is a UnitView onto the store, otherwise a plain Unit.
+        """
+        if self.unit_store is None:
+            return Unit(col, row, team, speed, self)
+        unit = UnitView(self.unit_store, self.unit_store.append(col, row, team, speed), self)
+        self.add_unit(unit)
+        return unit
+
+    def create_units(self, cols, rows, team_codes, speeds) -> list["Unit"]:
+        """
+        Creates a batch of units from parallel columns, as create_unit() would one by one.
+        With a unit store the rows are appended in bulk and the tiles they stand on are
+        claimed in one vectorized pass (later units win shared tiles, as in order).
+
+        Args:
+            cols (Sequence[int] | np.ndarray): Column of each unit.
+            rows (Sequence[int] | np.ndarray): Row of each unit.
+            team_codes (Sequence[int] | np.ndarray): Team code of each unit (see game_objects.TEAM_CODES).
+            speeds (Sequence[float] | np.ndarray): Speed of each unit.
+
+        Returns:
+            list[Unit]: The new units, in input order.
+        """
+        store = self.unit_store
+        if store is None:
+            return [self.create_unit(int(col), int(row), CODE_TEAMS[int(code)], speed)
+                    for col, row, code, speed in zip(cols, rows, team_codes, speeds)]
+
+        indices = store.extend(cols, rows, team_codes, speeds)
+        units = []
+        for index in indices.tolist():
+            unit = UnitView(store, index, self)
+            unit.unit_id = index
+            units.append(unit)
+        self.units.extend(units)
+        cells = store.col[indices] * self.rows + store.row[indices]
+        codes = store.team[indices]
+        self.occupancy.add_many(indices, codes, cells)
+        if self.event_log is not None and len(indices):
+            self.event_log.record_many(event_log.UNIT_ADDED, codes, self.tick, indices,
+                                       store.col[indices], store.row[indices], store.speed[indices])
+        if isinstance(self.tiles, TileGrid):
+            changed, old = self.tiles.assign_codes(cells, codes)
+            if self.territory is not None:
+                self.territory.record_changes(changed, old)
+            if self.event_log is not None and len(changed):
+                changed_cols, changed_rows = divmod(changed, self.rows)
+                self.event_log.record_many(event_log.AFFILIATION, self.tiles.get_codes(changed),
+                                           self.tick, -1, changed_cols, changed_rows, self.time)
+        else:
+            for unit in units:
+                self.claim_tile(unit.col, unit.row, unit.team)
+        return units
 
     def add_unit(self, unit: "Unit"):
         """
-        Adds a unit to the simulation.
+        Adds a unit to the simulation and assigns its unit_id (its index in self.units).
         """
+        if self.unit_store is not None and not isinstance(unit, UnitView):
+            raise ValueError("Units must be created through create_unit() when a unit store is in use.")
+        unit.unit_id = len(self.units)
         self.units.append(unit)
-        self.tiles[unit.col][unit.row].set_affiliation(unit.team)
+        self.occupancy.add(unit.unit_id, unit.team, unit.col, unit.row)
+        if self.event_log is not None:
+            self.event_log.record(event_log.UNIT_ADDED, TEAM_CODES[unit.team], self.tick, unit.unit_id,
+                                  unit.col, unit.row, unit.speed)
+        self.claim_tile(unit.col, unit.row, unit.team)
 
     def move_unit(self, unit: "Unit", direction: Direction):
         """
@@ -43,35 +190,17 @@ class SimulationController:
         if unit.is_moving:
             return  # Ignore if already moving
 
-        if not gamelogic.is_move_valid(unit, direction, self.rows, self.cols):
+        if isinstance(unit, UnitView):
+            self.record_store_moves(unit._store.start_moves([unit.index], [DIRECTION_INDEX[direction]]))
             return
 
-        # Choose movement offsets based on row parity
-        if unit.row % 2 == 0:  # Even row
-            offsets = {
-                Direction.W: (-1, 0),
-                Direction.NE: (0, -1),
-                Direction.SE: (0, 1),
-                Direction.E: (1, 0),
-                Direction.SW: (-1, 1),
-                Direction.NW: (-1, -1)
-            }
-        else:  # Odd row
-            offsets = {
-                Direction.W: (-1, 0),
-                Direction.NE: (1, -1),
-                Direction.SE: (1, 1),
-                Direction.E: (1, 0),
-                Direction.SW: (0, 1),
-                Direction.NW: (0, -1)
-            }
-        delta_col, delta_row = offsets[direction]
-        new_col = unit.col + delta_col
-        new_row = unit.row + delta_row
+        target = gamelogic.get_move_target(unit.col, unit.row, direction, self.topology)
+        if target is None:
+            return
+        new_col, new_row = target
 
         # Compute movement duration based on unit speed (higher speed => shorter duration)
-        base_move_duration = 1000  # milliseconds for a unit with speed 1
-        move_duration = base_move_duration / unit.speed
+        move_duration = gamelogic.BASE_MOVE_DURATION / unit.speed
 
         # Set animation parameters on the unit
         unit.is_moving = True
@@ -80,6 +209,31 @@ class SimulationController:
         unit.target_tile = (new_col, new_row)
         unit.move_duration = move_duration
         unit.elapsed_time = 0
+        self.moves_started += 1
+        if self.use_scheduler:
+            unit.move_start_time = self.time
+            heapq.heappush(self.move_queue, (self.time + move_duration, unit.unit_id, unit))
+        if self.event_log is not None:
+            self.event_log.record(event_log.MOVE_START, DIRECTION_INDEX[direction], self.tick, unit.unit_id,
+                                  new_col, new_row, self.time)
+
+    def record_store_moves(self, indices: "np.ndarray"):
+        """
+        Counts the moves just started for the given unit store indices and logs them,
+        if an event log is attached.
+        """
+        self.moves_started += len(indices)
+        if self.event_log is None or len(indices) == 0:
+            return
+        store = self.unit_store
+        self.event_log.record_many(event_log.MOVE_START, store.direction[indices], self.tick, indices,
+                                   store.target_col[indices], store.target_row[indices], self.time)
+
+    def get_move_progress(self, unit: "Unit") -> float:
+        """
+        Computes a scheduled unit's move progress (0.0 to 1.0) from its start time and duration.
+        """
+        return min((self.time - unit.move_start_time) / unit.move_duration, 1.0)
 
     def update(self, delta_time: int):
         """
@@ -88,28 +242,140 @@ class SimulationController:
         Args:
             delta_time (int): Milliseconds elapsed since the last update.
         """
-        for unit in self.units:
-            if unit.is_moving:
-                unit.elapsed_time += delta_time
-                # Calculate progress as a value between 0.0 and 1.0
-                unit.move_progress = min(unit.elapsed_time / unit.move_duration, 1.0)
-                if unit.move_progress >= 1.0:
-                    # Movement complete: update unit's grid position and stop the animation
-                    unit.is_moving = False
-                    unit.col, unit.row = unit.target_tile
-                    self.set_tile_affiliation(self.tiles[unit.col][unit.row], unit)
+        self.time += delta_time
+        self.tick += 1
+        if self.use_scheduler:
+            self.update_scheduled()
+        elif self.unit_store is not None:
+            self.update_store(delta_time)
+        else:
+            for unit in self.units:
+                if unit.is_moving:
+                    unit.elapsed_time += delta_time
+                    # Calculate progress as a value between 0.0 and 1.0
+                    unit.move_progress = min(unit.elapsed_time / unit.move_duration, 1.0)
+                    if unit.move_progress >= 1.0:
+                        self.complete_move(unit)
+
+        if self.territory is not None:
+            self.territory.maybe_rebuild(self.tick)
+        if self.event_log is not None and self.tick % self.event_log.keyframe_interval == 0:
+            self.event_log.keyframe(self)
+
+    def update_scheduled(self):
+        """
+        Completes the scheduled moves whose completion time has been reached.
+        """
+        due = []
+        while self.move_queue and self.move_queue[0][0] <= self.time:
+            due.append(heapq.heappop(self.move_queue)[2])
+        # Apply in unit order, as the per-unit loop in update() does
+        due.sort(key=lambda unit: unit.unit_id)
+        for unit in due:
+            unit.elapsed_time = self.time - unit.move_start_time
+            self.complete_move(unit)
+
+    def update_store(self, delta_time: int):
+        """
+        Advances the unit store and claims the tiles reached by completed moves.
+        """
+        store = self.unit_store
+        done = store.update(delta_time)
+        self.moves_completed += len(done)
+        self.occupancy.move_many(done, store.start_col[done] * self.rows + store.start_row[done],
+                                 store.col[done] * self.rows + store.row[done])
+        if self.event_log is not None and len(done):
+            self.event_log.record_many(event_log.MOVE_COMPLETE, 0, self.tick, done,
+                                       store.col[done], store.row[done], self.time)
+        if isinstance(self.tiles, TileGrid):
+            cells, old = self.tiles.assign_codes(store.col[done] * self.rows + store.row[done], store.team[done])
+            if self.territory is not None:
+                self.territory.record_changes(cells, old)
+            if self.event_log is not None and len(cells):
+                changed_cols, changed_rows = divmod(cells, self.rows)
+                self.event_log.record_many(event_log.AFFILIATION, self.tiles.get_codes(cells),
+                                           self.tick, -1, changed_cols, changed_rows, self.time)
+        else:
+            for index in done:
+                self.claim_tile(int(store.col[index]), int(store.row[index]), self.units[index].team)
+
+    def complete_move(self, unit: "Unit"):
+        """
+        Finishes a unit's move: updates its grid position, stops the animation and
+        claims the target tile.
+        """
+        unit.is_moving = False
+        unit.move_start_time = None
+        unit.move_progress = 1.0
+        self.moves_completed += 1
+        self.occupancy.move(unit.unit_id, (unit.col, unit.row), unit.target_tile)
+        unit.col, unit.row = unit.target_tile
+        if self.event_log is not None:
+            self.event_log.record(event_log.MOVE_COMPLETE, 0, self.tick, unit.unit_id, unit.col, unit.row, self.time)
+        self.claim_tile(unit.col, unit.row, unit.team)
+
+    def units_at(self, col: int, row: int, team: Team = None) -> list["Unit"]:
+        """
+        Returns the units standing on a tile (moving units count at their start tile),
+        optionally only those of one team.
+        """
+        return [self.units[unit_id] for unit_id in self.occupancy.units_at(col, row, team)]
+
+    def units_within(self, col: int, row: int, radius: int, team: Team = None) -> list["Unit"]:
+        """
+        Returns the units at most `radius` hex steps from (col, row), optionally only those of one team.
+        """
+        return [self.units[unit_id] for unit_id in self.occupancy.units_within(col, row, radius, team)]
+
+    def adjacent_enemies(self, unit: "Unit") -> list["Unit"]:
+        """
+        Returns the units of the other team standing on the tiles around the unit.
+        """
+        enemy = Team.RED if unit.team == Team.BLUE else Team.BLUE
+        return [self.units[unit_id] for unit_id in self.occupancy.units_adjacent(unit.col, unit.row, enemy)]
 
     def set_tile_affiliation(self, tile: "Tile", unit: "Unit"):
         """
         Updates the affiliation of the tile based on the unit's team.
         """
-        tile.set_affiliation(unit.team)
+        self.claim_tile(tile.col, tile.row, unit.team)
+
+    def claim_tile(self, col: int, row: int, team: Team) -> bool:
+        """
+        Gives the tile at (col, row) to the team. A TileGrid is written directly,
+        without creating a Tile view; tiles already owned by the team are left untouched.
+
+        Returns:
+            bool: True if the tile changed hands.
+        """
+        if isinstance(self.tiles, TileGrid):
+            old = self.tiles.get_code(col, row)
+            changed = self.tiles.set_affiliation(col, row, team)
+            if changed and self.territory is not None:
+                self.territory.record_change(col * self.rows + row, old)
+        else:
+            tile = self.tiles[col][row]
+            changed = tile.affiliation is not team
+            if changed:
+                tile.set_affiliation(team)
+        if changed and self.event_log is not None:
+            self.event_log.record(event_log.AFFILIATION, TEAM_CODES[team], self.tick, -1, col, row, self.time)
+        return changed
 
 class TeamController:
-    def __init__(self, team: Team):
+    def __init__(self, team: Team, rng: random.Random = None):
+        """
+        Args:
+            team (Team): The team whose units this controller commands.
+            rng (random.Random, optional): Random stream for this team's decisions.
+                Defaults to the module-level random generator.
+        """
         self.team = team
         self.units = []
         self.simulation_controller = None
+        self.rng = random if rng is None else rng
+        self.array_rng = None  # NumPy generator seeded from self.rng, created for the unit store
+        self.goals = None  # Goal cell indices for move_units_to_goals()
 
     def add_unit(self, unit: Unit):
         if unit.team != self.team:
@@ -118,7 +384,45 @@ class TeamController:
 
     def move_units_randomly(self):
         """Move all units to a random adjacent hex."""
+        store = self.simulation_controller.unit_store if self.simulation_controller else None
+        if store is not None:
+            if self.array_rng is None:
+                self.array_rng = make_rng(self.rng.getrandbits(64))
+            self.simulation_controller.record_store_moves(store.move_randomly(self.team, self.array_rng))
+            return
         directions = list(Direction)  # Get all possible directions (N, NE, SE, S, SW, NW)
         for unit in self.units:
-            random_direction = random.choice(directions)  # Pick a random direction
-            unit.move(random_direction)  # Move the unit in that direction
\ No newline at end of file
+            random_direction = self.rng.choice(directions)  # Pick a random direction
+            unit.move(random_direction)  # Move the unit in that direction
+
+    def set_goals(self, tiles: list[tuple[int, int]]):
+        """
+        Sets the (col, row) tiles this team's units head for in move_units_to_goals().
+        Each unit walks towards whichever goal is nearest.
+
+        Raises:
+            ValueError: If a goal tile lies outside the grid.
+        """
+        sim = self.simulation_controller
+        for col, row in tiles:
+            if not (0 <= col < sim.cols and 0 <= row < sim.rows):
+                raise ValueError(f"Goal tile ({col}, {row}) is outside the {sim.cols}x{sim.rows} grid.")
+        self.goals = frozenset(col * sim.rows + row for col, row in tiles)
+
+    def move_units_to_goals(self):
+        """
+        Moves every idle unit one hex along the shared flow field towards the team's goals.
+        Units already on a goal, or with no path to one, stay where they are.
+        """
+        if not self.goals:
+            return
+        sim = self.simulation_controller
+        field = sim.flow_fields.get(self.goals)
+        if sim.unit_store is not None:
+            sim.record_store_moves(sim.unit_store.move_along(self.team, field.directions_array()))
+            return
+        for unit in self.units:
+            if not unit.is_moving:
+                direction = field.next_direction(unit.col, unit.row)
+                if direction >= 0:
+                    unit.move(DIRECTIONS[direction])
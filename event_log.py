@@ -0,0 +1,357 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from controllers import SimulationController
+import mmap
+import struct
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed to log unit store moves in bulk
+    np = None
+import gamelogic
+from game_objects import Team, TileGrid, TEAM_CODES, CODE_TEAMS
+
+MAGIC = b"HOIEVLOG"
+VERSION = 1
+# magic, version, rows, cols
+HEADER = struct.Struct("<8sHxxii")
+# kind, code, tick, unit_id, col, row, value. `code` is a direction index (MOVE_START) or
+# team code (UNIT_ADDED, AFFILIATION); `value` is the simulated time in milliseconds,
+# except for UNIT_ADDED where it holds the unit's speed.
+RECORD = struct.Struct("<BbxxIiiid")
+# col, row, target_col, target_row, team code, is_moving, move_start_time, speed
+UNIT_STATE = struct.Struct("<iiiibBxxdd")
+# tick, time, offset of the KEYFRAME record
+KEYFRAME_ENTRY = struct.Struct("<Idq")
+# offset of the keyframe index, number of keyframes, magic
+TRAILER = struct.Struct("<qI8s")
+
+UNIT_ADDED = 1
+MOVE_START = 2
+MOVE_COMPLETE = 3
+AFFILIATION = 4
+KEYFRAME = 5  # unit_id holds the unit count; tile codes and unit states follow the record
+
+if np is not None:
+    RECORD_DTYPE = np.dtype([
+        ("kind", "u1"), ("code", "i1"), ("pad", "V2"), ("tick", "<u4"), ("unit_id", "<i4"),
+        ("col", "<i4"), ("row", "<i4"), ("value", "<f8"),
+    ])
+
+class EventLogWriter:
+    """
+    Appends fixed-width binary event records to a log file through an in-memory buffer,
+    with a keyframe of the full simulation state every keyframe_interval ticks.
+    """
+    def __init__(self, filename: str, rows: int, cols: int, keyframe_interval: int = 600, buffer_size: int = 1 << 20):
+        """
+        Args:
+            filename (str): Path of the log file to create.
+            rows (int): Number of grid rows.
+            cols (int): Number of grid columns.
+            keyframe_interval (int): Ticks between keyframes.
+            buffer_size (int): Bytes to buffer before writing to disk.
+
+        Raises:
+            ValueError: If keyframe_interval is not positive.
+        """
+        if keyframe_interval <= 0:
+            raise ValueError(f"keyframe_interval must be positive, got {keyframe_interval}")
+        self.rows = rows
+        self.cols = cols
+        self.keyframe_interval = keyframe_interval
+        self.buffer_size = buffer_size
+        self.keyframes = []  # (tick, time, offset)
+        self.file = open(filename, 'wb')
+        self.written = 0
+        self.buffer = bytearray(HEADER.pack(MAGIC, VERSION, rows, cols))
+
+    def __enter__(self) -> "EventLogWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(self, kind: int, code: int, tick: int, unit_id: int, col: int, row: int, value: float):
+        """
+        Appends one record.
+        """
+        self.buffer += RECORD.pack(kind, code, tick, unit_id, col, row, value)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def record_many(self, kind: int, codes: "np.ndarray", tick: int, unit_ids: "np.ndarray",
+                    cols: "np.ndarray", rows: "np.ndarray", value: float):
+        """
+        Appends one record per element of cols/rows in a single vectorized pack.
+        Scalar arguments are broadcast to every record.
+        """
+        records = np.zeros(len(cols), dtype=RECORD_DTYPE)
+        records["kind"] = kind
+        records["code"] = codes
+        records["tick"] = tick
+        records["unit_id"] = unit_ids
+        records["col"] = cols
+        records["row"] = rows
+        records["value"] = value
+        self.buffer += records.tobytes()
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def keyframe(self, simulation_controller: "SimulationController"):
+        """
+        Appends a keyframe with every tile affiliation and unit state.
+        """
+        sim = simulation_controller
+        self.keyframes.append((sim.tick, sim.time, self.written + len(self.buffer)))
+        self.buffer += RECORD.pack(KEYFRAME, 0, sim.tick, len(sim.units), 0, 0, sim.time)
+        self.buffer += tile_codes(sim.tiles)
+        self.buffer += pack_unit_states(sim)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        self.file.write(self.buffer)
+        self.written += len(self.buffer)
+        self.buffer.clear()
+
+    def close(self):
+        """
+        Writes the keyframe index and trailer, then closes the file.
+        """
+        if self.file.closed:
+            return
+        index_offset = self.written + len(self.buffer)
+        for tick, time, offset in self.keyframes:
+            self.buffer += KEYFRAME_ENTRY.pack(tick, time, offset)
+        self.buffer += TRAILER.pack(index_offset, len(self.keyframes), MAGIC)
+        self.flush()
+        self.file.close()
+
+def tile_codes(tiles: list[list["Tile"]]) -> bytes:
+    """
+    Returns every tile's affiliation code in column-major order.
+    """
+    if isinstance(tiles, TileGrid):
+        return tiles.tobytes()
+    return bytes(TEAM_CODES[tile.affiliation] for column in tiles for tile in column)
+
+def pack_unit_states(simulation_controller: "SimulationController") -> bytes:
+    """
+    Packs every unit's position and in-flight move as UNIT_STATE records.
+    """
+    sim = simulation_controller
+    store = sim.unit_store
+    if store is not None:
+        n = store.size
+        states = np.zeros(n, dtype=[
+            ("col", "<i4"), ("row", "<i4"), ("target_col", "<i4"), ("target_row", "<i4"), ("team", "i1"),
+            ("is_moving", "u1"), ("pad", "V2"), ("move_start_time", "<f8"), ("speed", "<f8"),
+        ])
+        for name in ("col", "row", "target_col", "target_row", "team", "is_moving", "speed"):
+            states[name] = getattr(store, name)[:n]
+        states["move_start_time"] = sim.time - store.elapsed_time[:n]
+        return states.tobytes()
+
+    packed = bytearray()
+    for unit in sim.units:
+        start_time = unit.move_start_time
+        if start_time is None:
+            start_time = sim.time - unit.elapsed_time
+        packed += UNIT_STATE.pack(unit.col, unit.row, unit.target_tile[0], unit.target_tile[1],
+                                  TEAM_CODES[unit.team], unit.is_moving, start_time, unit.speed)
+    return bytes(packed)
+
+class EventLogReader:
+    """
+    Memory-maps an event log and indexes its keyframes.
+    """
+    def __init__(self, filename: str):
+        """
+        Raises:
+            ValueError: If the file is not an event log.
+        """
+        self.file = open(filename, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.rows, self.cols = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{filename} is not a version {VERSION} event log")
+        self.end = len(self.data)
+        self.keyframes = self._read_index()
+
+    def _read_index(self) -> list[tuple[int, float, int]]:
+        """
+        Reads the keyframe index from the trailer, or rebuilds it by scanning the records
+        if the writer was not closed cleanly.
+        """
+        if self.end >= HEADER.size + TRAILER.size:
+            index_offset, count, magic = TRAILER.unpack_from(self.data, self.end - TRAILER.size)
+            if magic == MAGIC:
+                self.end = index_offset
+                return [KEYFRAME_ENTRY.unpack_from(self.data, index_offset + i * KEYFRAME_ENTRY.size)
+                        for i in range(count)]
+        keyframes = []
+        for offset, record in self.records(HEADER.size):
+            if record[0] == KEYFRAME:
+                if self.next_offset(offset, record) > self.end:
+                    self.end = offset  # Drop a keyframe torn by an unclean shutdown
+                    break
+                keyframes.append((record[2], record[6], offset))
+        return keyframes
+
+    def records(self, offset: int):
+        """
+        Yields (offset, record) for every record from offset onwards, skipping keyframe payloads.
+        """
+        data = self.data
+        end = self.end
+        keyframe_payload = self.rows * self.cols
+        while offset + RECORD.size <= end:
+            record = RECORD.unpack_from(data, offset)
+            yield offset, record
+            offset += RECORD.size
+            if record[0] == KEYFRAME:
+                offset += keyframe_payload + record[3] * UNIT_STATE.size
+
+    def next_offset(self, offset: int, record: tuple) -> int:
+        """
+        Returns the offset of the record following the given one.
+        """
+        offset += RECORD.size
+        if record[0] == KEYFRAME:
+            offset += self.rows * self.cols + record[3] * UNIT_STATE.size
+        return offset
+
+    def read_keyframe(self, offset: int) -> tuple[int, float, bytes, list[tuple]]:
+        """
+        Decodes the keyframe at offset.
+
+        Returns:
+            tuple: (tick, time, tile codes, unit states)
+        """
+        _, _, tick, unit_count, _, _, time = RECORD.unpack_from(self.data, offset)
+        start = offset + RECORD.size
+        codes = self.data[start:start + self.rows * self.cols]
+        start += self.rows * self.cols
+        units = [UNIT_STATE.unpack_from(self.data, start + i * UNIT_STATE.size) for i in range(unit_count)]
+        return tick, time, codes, units
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+class ReplayUnit:
+    """
+    A unit rebuilt from an event log, with the attributes the renderer reads from a Unit.
+    """
+    def __init__(self, state: "ReplayState", col: int, row: int, team: Team, speed: float):
+        self.state = state
+        self.col = col
+        self.row = row
+        self.team = team
+        self.speed = speed
+        self.is_moving = False
+        self.start_tile = (col, row)
+        self.target_tile = (col, row)
+        self.move_start_time = 0.0
+        self.move_duration = 0.0
+
+    @property
+    def move_progress(self) -> float:
+        if not self.is_moving:
+            return 1.0
+        return min(max((self.state.time - self.move_start_time) / self.move_duration, 0.0), 1.0)
+
+class ReplayState:
+    """
+    Simulation state rebuilt from an event log. Seeking starts from the nearest keyframe
+    at or before the target, or continues forward from the current position.
+    """
+    def __init__(self, reader: EventLogReader):
+        self.reader = reader
+        self.tiles = TileGrid(reader.cols, reader.rows)
+        self.units = []
+        self.tick = 0
+        self.time = 0.0
+        self.offset = HEADER.size  # Next record to apply
+
+    def seek_tick(self, tick: int):
+        """
+        Rebuilds the state right after update number `tick`.
+        """
+        self._seek(0, tick, 2)
+        self.tick = tick
+
+    def seek_time(self, time: float):
+        """
+        Rebuilds the state at simulated time `time` (milliseconds).
+        """
+        self._seek(1, time, 6)
+        self.time = time
+
+    def _seek(self, key: int, target: float, record_field: int):
+        keyframe = None
+        for entry in self.reader.keyframes:
+            if entry[key] > target:
+                break
+            keyframe = entry
+        current = (self.tick, self.time)[key]
+        if current > target or (keyframe is not None and keyframe[key] > current):
+            if keyframe is None:
+                self._reset()
+            else:
+                self._load_keyframe(keyframe[2])
+        for offset, record in self.reader.records(self.offset):
+            if record_field == 2:
+                # Moves started at tick T are issued after update T, so they belong to the next tick
+                if record[2] > target or (record[0] == MOVE_START and record[2] == target):
+                    break
+            # UNIT_ADDED carries a speed instead of a time, so only its tick can be compared
+            elif record[0] != UNIT_ADDED and record[6] > target:
+                break
+            self._apply(record)
+            self.offset = self.reader.next_offset(offset, record)
+
+    def _reset(self):
+        self.tiles.load_codes(bytes(len(self.tiles.codes)))
+        self.units[:] = []
+        self.tick = 0
+        self.time = 0.0
+        self.offset = HEADER.size
+
+    def _load_keyframe(self, offset: int):
+        tick, time, codes, units = self.reader.read_keyframe(offset)
+        self.tiles.load_codes(codes)
+        rebuilt = []
+        for col, row, target_col, target_row, team, is_moving, start_time, speed in units:
+            unit = ReplayUnit(self, col, row, CODE_TEAMS[team], speed)
+            if is_moving:
+                self._start_move(unit, target_col, target_row, start_time)
+            rebuilt.append(unit)
+        self.units[:] = rebuilt  # Keep the list object shared with the renderer
+        self.tick = tick
+        self.time = time
+        self.offset = offset
+
+    def _start_move(self, unit: ReplayUnit, target_col: int, target_row: int, start_time: float):
+        unit.is_moving = True
+        unit.start_tile = (unit.col, unit.row)
+        unit.target_tile = (target_col, target_row)
+        unit.move_start_time = start_time
+        unit.move_duration = gamelogic.BASE_MOVE_DURATION / unit.speed
+
+    def _apply(self, record: tuple):
+        kind, code, tick, unit_id, col, row, value = record
+        if kind == UNIT_ADDED:
+            self.units.append(ReplayUnit(self, col, row, CODE_TEAMS[code], value))
+            return
+        self.tick = tick
+        self.time = value
+        if kind == MOVE_START:
+            self._start_move(self.units[unit_id], col, row, value)
+        elif kind == MOVE_COMPLETE:
+            unit = self.units[unit_id]
+            unit.is_moving = False
+            unit.col, unit.row = col, row
+        elif kind == AFFILIATION:
+            self.tiles.set_affiliation(col, row, CODE_TEAMS[code])
@@ -3,6 +3,10 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from controllers import SimulationController, TeamController
 from enum import Enum
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the vectorized grid helpers
+    np = None
 
 # Define the Team enumeration for blue and red teams
 class Team(Enum):
@@ -17,6 +21,14 @@ class Direction(Enum):
     SW = "southwest"
     NW = "northwest"
 
+# Fixed direction order used wherever directions are stored as small integers
+DIRECTIONS = tuple(Direction)
+DIRECTION_INDEX = {direction: index for index, direction in enumerate(DIRECTIONS)}
+
+# Compact integer codes for team affiliation (0 means neutral)
+TEAM_CODES = {None: 0, Team.BLUE: 1, Team.RED: 2}
+CODE_TEAMS = (None, Team.BLUE, Team.RED)
+
 # Define the Unit class
 class Unit:
     def __init__(self, col: int, row: int, team: Team, speed: int, simulation_controller: "SimulationController"):
@@ -41,6 +53,21 @@ class Unit:
         self.target_tile = (col, row)
         self.move_duration = 0  # in milliseconds
         self.elapsed_time = 0
+        self.move_start_time = None  # Simulated start time of a scheduled move (see SimulationController)
+
+    @property
+    def move_progress(self) -> float:
+        """
+        Progress of the current move from 0.0 to 1.0. Moves scheduled by the
+        SimulationController are computed lazily from their start time.
+        """
+        if self.move_start_time is None:
+            return self._move_progress
+        return self.simulation_controller.get_move_progress(self)
+
+    @move_progress.setter
+    def move_progress(self, progress: float):
+        self._move_progress = progress
 
     def move(self, direction: Direction):
         """
@@ -62,9 +89,12 @@ class Unit:
 
 class Tile:
     """
-    Represents a single hex tile on the map.
+    Represents a single hex tile on the map. Tiles that belong to a TileGrid are
+    lightweight views: their affiliation lives in the grid's compact code array.
     """
-    def __init__(self, col: int, row: int, affiliation: Team = None):
+    __slots__ = ("col", "row", "grid", "_affiliation")
+
+    def __init__(self, col: int, row: int, affiliation: Team = None, grid: "TileGrid" = None):
         """
         Initialize a Tile with grid coordinates and optional affiliation.
 
@@ -72,10 +102,20 @@ class Tile:
             col (int): The column (hex coordinate).
             row (int): The row (hex coordinate).
             affiliation (Team, optional): The team (BLUE or RED) that owns this tile, if any.
+            grid (TileGrid, optional): The grid that stores this tile's affiliation.
         """
         self.col = col
         self.row = row
-        self.affiliation = affiliation  # This can be None if the tile is neutral
+        self.grid = grid
+        self._affiliation = None  # Only used by tiles outside a grid; None means neutral
+        if affiliation is not None:
+            self.set_affiliation(affiliation)
+
+    @property
+    def affiliation(self) -> Team:
+        if self.grid is None:
+            return self._affiliation
+        return self.grid.get_affiliation(self.col, self.row)
 
     def set_affiliation(self, team: Team):
         """
@@ -84,7 +124,10 @@ class Tile:
         Args:
             team (Team): The team to affiliate with the tile.
         """
-        self.affiliation = team
+        if self.grid is None:
+            self._affiliation = team
+        else:
+            self.grid.set_affiliation(self.col, self.row, team)
 
     def get_affiliation_color(self) -> tuple:
         """
@@ -93,9 +136,418 @@ class Tile:
         Returns:
             tuple: (R, G, B) color values.
         """
-        if self.affiliation == Team.BLUE:
-            return (150, 150, 255)  # Light bluish color to denote Blue affiliation
-        elif self.affiliation == Team.RED:
-            return (255, 150, 150)  # Light reddish color to denote Red affiliation
-        else:
-            return (200, 200, 200)  # Neutral gray
\ No newline at end of file
+        return AFFILIATION_COLORS[TEAM_CODES[self.affiliation]]
+
+# Fill colors indexed by affiliation code: neutral gray, light blue, light red
+AFFILIATION_COLORS = ((200, 200, 200), (150, 150, 255), (255, 150, 150))
+
+class TileColumn:
+    """
+    One column of a TileGrid, so tiles can still be addressed as tiles[col][row].
+    """
+    __slots__ = ("grid", "col")
+
+    def __init__(self, grid: "TileGrid", col: int):
+        self.grid = grid
+        self.col = col
+
+    def __getitem__(self, row: int) -> Tile:
+        if row < 0:
+            row += self.grid.rows
+        if not 0 <= row < self.grid.rows:
+            raise IndexError(f"Row {row} out of range")
+        return Tile(self.col, row, grid=self.grid)
+
+    def __iter__(self):
+        for row in range(self.grid.rows):
+            yield Tile(self.col, row, grid=self.grid)
+
+    def __len__(self) -> int:
+        return self.grid.rows
+
+class TileGrid:
+    """
+    A column-major hex grid (indexed as tiles[col][row]) that stores every tile's
+    affiliation as one byte in a contiguous array (see TEAM_CODES) and creates Tile
+    views on demand. It keeps running blue/red/neutral counts, so affiliation
+    statistics cost O(1) regardless of map size.
+    """
+    def __init__(self, cols: int, rows: int, debug: bool = False):
+        """
+        Args:
+            cols (int): Number of grid columns.
+            rows (int): Number of grid rows.
+            debug (bool): Verify the running counts against a full recount whenever they are read.
+        """
+        self.cols = cols
+        self.rows = rows
+        self.debug = debug
+        self.codes = bytearray(cols * rows)  # Affiliation code per cell, index col * rows + row
+        self.counts = {Team.BLUE: 0, Team.RED: 0, None: cols * rows}
+        self.dirty = None  # Set of (col, row) changed since the last pop_dirty(), once tracking is enabled
+
+    def __getitem__(self, col: int) -> TileColumn:
+        if col < 0:
+            col += self.cols
+        if not 0 <= col < self.cols:
+            raise IndexError(f"Column {col} out of range")
+        return TileColumn(self, col)
+
+    def __iter__(self):
+        for col in range(self.cols):
+            yield TileColumn(self, col)
+
+    def __len__(self) -> int:
+        return self.cols
+
+    def get_affiliation(self, col: int, row: int) -> Team:
+        return CODE_TEAMS[self.codes[col * self.rows + row]]
+
+    def get_code(self, col: int, row: int) -> int:
+        """
+        Returns a tile's affiliation code (see TEAM_CODES).
+        """
+        return self.codes[col * self.rows + row]
+
+    def get_codes(self, cells: "np.ndarray") -> "np.ndarray":
+        """
+        Returns the affiliation codes of many cells (col * rows + row) as an int8 array.
+        """
+        return self.as_array().reshape(-1)[cells]
+
+    def tobytes(self) -> bytes:
+        """
+        Returns every tile's affiliation code in column-major order.
+        """
+        return bytes(self.codes)
+
+    def cells_with(self, code: int) -> list[int]:
+        """
+        Returns the cells (col * rows + row) holding an affiliation code, in ascending order.
+        """
+        if np is not None:
+            return np.flatnonzero(np.frombuffer(self.codes, dtype=np.int8) == code).tolist()
+        return [cell for cell, value in enumerate(self.codes) if value == code]
+
+    def set_affiliation(self, col: int, row: int, team: Team) -> bool:
+        """
+        Sets a tile's affiliation and updates the running counts.
+
+        Returns:
+            bool: True if the tile changed hands.
+        """
+        index = col * self.rows + row
+        old = self.codes[index]
+        new = TEAM_CODES[team]
+        if old == new:
+            return False
+        self.codes[index] = new
+        self.counts[CODE_TEAMS[old]] -= 1
+        self.counts[team] += 1
+        if self.dirty is not None:
+            self.dirty.add((col, row))
+        return True
+
+    def assign_codes(self, cells: "np.ndarray", codes: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+        """
+        Vectorized set_affiliation for many cells at once. When a cell appears more than
+        once the last entry wins, as if the assignments had been applied in order.
+
+        Args:
+            cells (np.ndarray): Cell indices (col * rows + row).
+            codes (np.ndarray): Affiliation codes, one per cell.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The cells that changed hands and their previous codes.
+        """
+        grid = self.as_array().reshape(-1)
+        cells, last = np.unique(np.asarray(cells)[::-1], return_index=True)
+        codes = np.asarray(codes, dtype=np.int8)[::-1][last]
+        old = grid[cells]
+        changed = old != codes
+        cells, old, codes = cells[changed], old[changed], codes[changed]
+        grid[cells] = codes
+        delta = np.bincount(codes, minlength=3) - np.bincount(old, minlength=3)
+        for code, team in enumerate(CODE_TEAMS):
+            self.counts[team] += int(delta[code])
+        if self.dirty is not None:
+            self.dirty.update(divmod(int(cell), self.rows) for cell in cells)
+        return cells, old
+
+    def load_codes(self, codes: bytes):
+        """
+        Replaces every tile's affiliation code at once, recounting and marking changed tiles dirty.
+        """
+        if self.dirty is not None:
+            if np is not None:
+                changed = np.flatnonzero(np.frombuffer(self.codes, dtype=np.int8) != np.frombuffer(codes, dtype=np.int8))
+                self.dirty.update(divmod(int(cell), self.rows) for cell in changed)
+            else:
+                self.dirty.update(divmod(cell, self.rows) for cell, (old, new) in enumerate(zip(self.codes, codes)) if old != new)
+        self.codes[:] = codes
+        self.counts = self.recount()
+
+    def as_array(self) -> "np.ndarray":
+        """
+        Returns the affiliation codes as a (cols, rows) int8 NumPy view (no copy).
+        """
+        return np.frombuffer(self.codes, dtype=np.int8).reshape(self.cols, self.rows)
+
+    def enable_dirty_tracking(self):
+        """
+        Starts recording which tiles change affiliation, for consumers such as the renderer.
+        """
+        if self.dirty is None:
+            self.dirty = set()
+
+    def pop_dirty(self) -> set[tuple[int, int]]:
+        """
+        Returns the (col, row) of every tile changed since the last call and resets the set.
+        """
+        dirty = self.dirty or set()
+        self.dirty = set()
+        return dirty
+
+    def get_counts(self) -> dict[Team, int]:
+        """
+        Returns the running tile counts keyed by Team.BLUE, Team.RED and None (neutral).
+
+        Raises:
+            ValueError: In debug mode, if the running counts disagree with a full recount.
+        """
+        if self.debug:
+            recount = self.recount()
+            if recount != self.counts:
+                raise ValueError(f"Affiliation counters out of sync: running {self.counts}, recount {recount}")
+        return self.counts
+
+    def recount(self) -> dict[Team, int]:
+        """
+        Counts tile affiliations with a full scan of the code array.
+        """
+        blue = self.codes.count(TEAM_CODES[Team.BLUE])
+        red = self.codes.count(TEAM_CODES[Team.RED])
+        return {Team.BLUE: blue, Team.RED: red, None: len(self.codes) - blue - red}
+
+class ChunkedTileGrid(TileGrid):
+    """
+    A TileGrid that stores affiliations in square chunks of chunk_size x chunk_size tiles,
+    allocated on the first write of a non-neutral affiliation (which includes a unit
+    entering the chunk, since units claim the tile they stand on). Untouched chunks
+    read as neutral without being allocated, so memory follows the area units have
+    reached rather than the size of the map.
+
+    Chunks are numbered column-major like cells (chunk = chunk_col * chunk_rows + chunk_row),
+    and a chunk's bytes are indexed local_col * chunk_size + local_row.
+    """
+    def __init__(self, cols: int, rows: int, chunk_size: int = 64, debug: bool = False):
+        """
+        Args:
+            cols (int): Number of grid columns.
+            rows (int): Number of grid rows.
+            chunk_size (int): Tiles per chunk side. Must be even, so every chunk starts on
+                an even row and shares the same odd-r layout.
+            debug (bool): Verify the running counts against a full recount whenever they are read.
+
+        Raises:
+            ValueError: If chunk_size is not a positive even number.
+        """
+        if chunk_size <= 0 or chunk_size % 2:
+            raise ValueError(f"chunk_size must be a positive even number, got {chunk_size}")
+        self.cols = cols
+        self.rows = rows
+        self.debug = debug
+        self.chunk_size = chunk_size
+        self.chunk_cols = -(-cols // chunk_size)
+        self.chunk_rows = -(-rows // chunk_size)
+        self.chunks = {}  # chunk index -> bytearray of affiliation codes, only for touched chunks
+        self.counts = {Team.BLUE: 0, Team.RED: 0, None: cols * rows}
+        self.dirty = None
+
+    def chunk_of(self, col: int, row: int) -> int:
+        return (col // self.chunk_size) * self.chunk_rows + row // self.chunk_size
+
+    def chunk_origin(self, chunk: int) -> tuple[int, int]:
+        """
+        Returns the (col, row) of a chunk's first tile.
+        """
+        chunk_col, chunk_row = divmod(chunk, self.chunk_rows)
+        return chunk_col * self.chunk_size, chunk_row * self.chunk_size
+
+    def chunk_extent(self, chunk: int) -> tuple[int, int]:
+        """
+        Returns how many (cols, rows) of a chunk lie inside the map; edge chunks are partial.
+        """
+        col, row = self.chunk_origin(chunk)
+        return min(self.chunk_size, self.cols - col), min(self.chunk_size, self.rows - row)
+
+    def get_code(self, col: int, row: int) -> int:
+        size = self.chunk_size
+        data = self.chunks.get((col // size) * self.chunk_rows + row // size)
+        return 0 if data is None else data[(col % size) * size + row % size]
+
+    def get_affiliation(self, col: int, row: int) -> Team:
+        return CODE_TEAMS[self.get_code(col, row)]
+
+    def set_affiliation(self, col: int, row: int, team: Team) -> bool:
+        """
+        Sets a tile's affiliation and updates the running counts, allocating its chunk
+        unless the tile stays neutral.
+
+        Returns:
+            bool: True if the tile changed hands.
+        """
+        size = self.chunk_size
+        chunk = (col // size) * self.chunk_rows + row // size
+        new = TEAM_CODES[team]
+        data = self.chunks.get(chunk)
+        if data is None:
+            if new == 0:
+                return False
+            data = self.chunks[chunk] = bytearray(size * size)
+        offset = (col % size) * size + row % size
+        old = data[offset]
+        if old == new:
+            return False
+        data[offset] = new
+        self.counts[CODE_TEAMS[old]] -= 1
+        self.counts[team] += 1
+        if self.dirty is not None:
+            self.dirty.add((col, row))
+        return True
+
+    def _group_by_chunk(self, cells: "np.ndarray"):
+        """
+        Yields (chunk, positions in cells, offsets within the chunk) for each chunk the cells touch.
+        """
+        cols, rows = np.divmod(cells, self.rows)
+        size = self.chunk_size
+        chunks = (cols // size) * self.chunk_rows + rows // size
+        offsets = (cols % size) * size + rows % size
+        order = np.argsort(chunks, kind="stable")
+        bounds = np.flatnonzero(np.diff(chunks[order])) + 1
+        for group in np.split(order, bounds):
+            if len(group):
+                yield int(chunks[group[0]]), group, offsets[group]
+
+    def get_codes(self, cells: "np.ndarray") -> "np.ndarray":
+        cells = np.asarray(cells)
+        result = np.zeros(len(cells), dtype=np.int8)
+        for chunk, group, offsets in self._group_by_chunk(cells):
+            data = self.chunks.get(chunk)
+            if data is not None:
+                result[group] = np.frombuffer(data, dtype=np.int8)[offsets]
+        return result
+
+    def assign_codes(self, cells: "np.ndarray", codes: "np.ndarray") -> tuple["np.ndarray", "np.ndarray"]:
+        cells, last = np.unique(np.asarray(cells)[::-1], return_index=True)
+        codes = np.asarray(codes, dtype=np.int8)[::-1][last]
+        old = np.zeros(len(cells), dtype=np.int8)
+        for chunk, group, offsets in self._group_by_chunk(cells):
+            data = self.chunks.get(chunk)
+            if data is None:
+                if not codes[group].any():
+                    continue  # Neutral writes never allocate a chunk
+                data = self.chunks[chunk] = bytearray(self.chunk_size * self.chunk_size)
+            view = np.frombuffer(data, dtype=np.int8)
+            old[group] = view[offsets]
+            view[offsets] = codes[group]
+        changed = old != codes
+        cells, old, codes = cells[changed], old[changed], codes[changed]
+        delta = np.bincount(codes, minlength=3) - np.bincount(old, minlength=3)
+        for code, team in enumerate(CODE_TEAMS):
+            self.counts[team] += int(delta[code])
+        if self.dirty is not None:
+            self.dirty.update(divmod(int(cell), self.rows) for cell in cells)
+        return cells, old
+
+    def cells_with(self, code: int) -> list[int]:
+        """
+        Returns the cells holding a team's affiliation code, in ascending order. Only the
+        allocated chunks are scanned.
+
+        Raises:
+            ValueError: If code is the neutral code, which every unallocated chunk holds.
+        """
+        if code == TEAM_CODES[None]:
+            raise ValueError("ChunkedTileGrid can only list the cells of a team.")
+        size = self.chunk_size
+        cells = []
+        for chunk, data in self.chunks.items():
+            col, row = self.chunk_origin(chunk)
+            if np is not None:
+                local_col, local_row = np.divmod(np.flatnonzero(np.frombuffer(data, dtype=np.int8) == code), size)
+                cells.extend(((col + local_col) * self.rows + row + local_row).tolist())
+            else:
+                cells.extend((col + offset // size) * self.rows + row + offset % size
+                             for offset, value in enumerate(data) if value == code)
+        cells.sort()
+        return cells
+
+    def load_codes(self, codes: bytes):
+        """
+        Replaces every tile's affiliation code from a full column-major code array. Chunks
+        that end up all neutral are released.
+        """
+        size = self.chunk_size
+        for chunk in range(self.chunk_cols * self.chunk_rows):
+            col, row = self.chunk_origin(chunk)
+            width, height = self.chunk_extent(chunk)
+            data = bytearray(size * size)
+            for local_col in range(width):
+                start = (col + local_col) * self.rows + row
+                data[local_col * size:local_col * size + height] = codes[start:start + height]
+            old = self.chunks.get(chunk)
+            if self.dirty is not None and data != (old or bytes(size * size)):
+                previous = old or bytes(size * size)
+                self.dirty.update((col + offset // size, row + offset % size)
+                                  for offset in range(size * size) if data[offset] != previous[offset])
+            if data.count(0) == len(data):
+                self.chunks.pop(chunk, None)
+            else:
+                self.chunks[chunk] = data
+        self.counts = self.recount()
+
+    def load_chunks(self, chunks: dict[int, bytes]):
+        """
+        Replaces every tile's affiliation code with whole chunks (chunk index -> codes, laid
+        out as in `chunks`), marking changed tiles dirty. Chunks that are not given, or are
+        all neutral, end up unallocated.
+        """
+        size = self.chunk_size
+        chunks = {chunk: bytearray(data) for chunk, data in chunks.items()}
+        if self.dirty is not None:
+            for chunk in set(self.chunks) | set(chunks):
+                old = self.chunks.get(chunk) or bytes(size * size)
+                new = chunks.get(chunk) or bytes(size * size)
+                col, row = self.chunk_origin(chunk)
+                self.dirty.update((col + offset // size, row + offset % size)
+                                  for offset in range(size * size) if old[offset] != new[offset])
+        self.chunks = {chunk: data for chunk, data in chunks.items() if data.count(0) != len(data)}
+        self.counts = self.recount()
+
+    def tobytes(self) -> bytes:
+        size = self.chunk_size
+        codes = bytearray(self.cols * self.rows)
+        for chunk, data in self.chunks.items():
+            col, row = self.chunk_origin(chunk)
+            width, height = self.chunk_extent(chunk)
+            for local_col in range(width):
+                start = (col + local_col) * self.rows + row
+                codes[start:start + height] = data[local_col * size:local_col * size + height]
+        return bytes(codes)
+
+    def as_array(self) -> "np.ndarray":
+        """
+        Returns the affiliation codes as a (cols, rows) int8 NumPy array. Unlike
+        TileGrid.as_array() this is a read-only copy of the whole map.
+        """
+        return np.frombuffer(self.tobytes(), dtype=np.int8).reshape(self.cols, self.rows)
+
+    def recount(self) -> dict[Team, int]:
+        """
+        Counts tile affiliations with a scan of the allocated chunks.
+        """
+        blue = sum(data.count(TEAM_CODES[Team.BLUE]) for data in self.chunks.values())
+        red = sum(data.count(TEAM_CODES[Team.RED]) for data in self.chunks.values())
+        return {Team.BLUE: blue, Team.RED: red, None: self.cols * self.rows - blue - red}
@@ -1,66 +1,235 @@
+from array import array
+import functools
+try:
+    import numpy as np
+except ImportError:  # NumPy speeds up building the neighbor table and batched moves
+    np = None
 import game_objects
 
-def is_move_valid(unit: "game_objects.Unit", direction: "game_objects.Direction", rows: int, cols: int) -> bool:
+BASE_MOVE_DURATION = 1000  # milliseconds for a unit with speed 1
+
+# Movement offsets (delta_col, delta_row) indexed by [row parity][direction index],
+# in the order of game_objects.DIRECTIONS (pointy-top, odd-r layout).
+HEX_OFFSETS = (
+    ((-1, 0), (0, -1), (0, 1), (1, 0), (-1, 1), (-1, -1)),  # Even row: W, NE, SE, E, SW, NW
+    ((-1, 0), (1, -1), (1, 1), (1, 0), (0, 1), (0, -1)),    # Odd row: W, NE, SE, E, SW, NW
+)
+
+class HexTopology:
     """
-    Checks if a unit's move in the specified direction is valid based on the grid boundaries.
+    Precomputed adjacency for a rows x cols odd-r hex grid.
+
+    Cells are numbered column-major (cell = col * rows + row, matching tiles[col][row]).
+    neighbors[cell * 6 + d] holds the cell reached by moving in direction index d,
+    or -1 if that move would leave the grid.
+    """
+    def __init__(self, rows: int, cols: int):
+        """
+        Args:
+            rows (int): Number of grid rows.
+            cols (int): Number of grid columns.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.cell_count = rows * cols
+
+    @functools.cached_property
+    def neighbors(self) -> array:
+        """
+        The neighbor table, built on first use.
+        """
+        rows, cols = self.rows, self.cols
+        neighbors = array("i")
+        if np is not None:
+            # One direction at a time, so the temporaries stay at one column of the table
+            col = np.repeat(np.arange(cols, dtype=np.intc), rows)
+            row = np.tile(np.arange(rows, dtype=np.intc), cols)
+            odd = (row & 1).astype(np.bool_)
+            table = np.empty((self.cell_count, 6), dtype=np.intc)
+            for direction, ((even_col, even_row), (odd_col, odd_row)) in enumerate(zip(*HEX_OFFSETS)):
+                new_col = col + np.where(odd, odd_col, even_col).astype(np.intc)
+                new_row = row + np.where(odd, odd_row, even_row).astype(np.intc)
+                valid = (new_col >= 0) & (new_col < cols) & (new_row >= 0) & (new_row < rows)
+                table[:, direction] = np.where(valid, new_col * rows + new_row, -1)
+            neighbors.frombytes(table.tobytes())
+        else:
+            for col in range(cols):
+                for row in range(rows):
+                    for delta_col, delta_row in HEX_OFFSETS[row & 1]:
+                        new_col = col + delta_col
+                        new_row = row + delta_row
+                        if 0 <= new_col < cols and 0 <= new_row < rows:
+                            neighbors.append(new_col * rows + new_row)
+                        else:
+                            neighbors.append(-1)
+        return neighbors
+
+    def cell_index(self, col: int, row: int) -> int:
+        return col * self.rows + row
+
+    def cell_coords(self, cell: int) -> tuple[int, int]:
+        return divmod(cell, self.rows)
+
+    def neighbor(self, cell: int, direction_index: int) -> int:
+        """
+        Returns the neighboring cell in the given direction, or -1 if it is off-grid.
+        """
+        return self.neighbors[cell * 6 + direction_index]
+
+    def neighbors_of(self, cell: int) -> list[int]:
+        """
+        Returns all on-grid neighbors of a cell.
+        """
+        base = cell * 6
+        return [n for n in self.neighbors[base:base + 6] if n >= 0]
+
+    def neighbor_ring(self, cell: int) -> list[int]:
+        """
+        Returns the six neighbors of a cell in direction order, with -1 for off-grid ones.
+        """
+        base = cell * 6
+        return self.neighbors[base:base + 6].tolist()
+
+    def as_array(self) -> "np.ndarray":
+        """
+        Returns the neighbor table as a (cells, 6) NumPy view (no copy).
+        """
+        return np.frombuffer(self.neighbors, dtype=np.intc).reshape(self.cell_count, 6)
+
+    def move_targets(self, cells: "np.ndarray", directions: "np.ndarray") -> "np.ndarray":
+        """
+        Looks up the cells reached by moving from each cell in the given directions.
+        cells and directions broadcast against each other like NumPy indices.
+
+        Returns:
+            np.ndarray: Target cells, -1 where the move would leave the grid.
+        """
+        return self.as_array()[cells, directions]
+
+class ImplicitHexTopology(HexTopology):
+    """
+    The same adjacency as HexTopology, computed from HEX_OFFSETS on every query instead
+    of read from a table, so it costs no memory however large the grid is. Used for
+    sparse (chunked) maps, where a table with six entries per cell would dwarf the tiles.
+    """
+    def neighbor(self, cell: int, direction_index: int) -> int:
+        col, row = divmod(cell, self.rows)
+        delta_col, delta_row = HEX_OFFSETS[row & 1][direction_index]
+        col += delta_col
+        row += delta_row
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return col * self.rows + row
+        return -1
+
+    def neighbors_of(self, cell: int) -> list[int]:
+        return [n for n in self.neighbor_ring(cell) if n >= 0]
+
+    def neighbor_ring(self, cell: int) -> list[int]:
+        rows, cols = self.rows, self.cols
+        col, row = divmod(cell, rows)
+        return [(col + delta_col) * rows + row + delta_row
+                if 0 <= col + delta_col < cols and 0 <= row + delta_row < rows else -1
+                for delta_col, delta_row in HEX_OFFSETS[row & 1]]
+
+    @property
+    def neighbors(self) -> array:
+        raise ValueError("ImplicitHexTopology has no neighbor table; use get_topology(rows, cols) for one.")
+
+    def as_array(self) -> "np.ndarray":
+        raise ValueError("ImplicitHexTopology has no neighbor table; use get_topology(rows, cols) for one.")
+
+    def move_targets(self, cells: "np.ndarray", directions: "np.ndarray") -> "np.ndarray":
+        col, row = np.divmod(np.asarray(cells, dtype=np.intp), self.rows)
+        offsets = _offset_array()[row & 1, directions]
+        new_col = col + offsets[..., 0]
+        new_row = row + offsets[..., 1]
+        valid = (new_col >= 0) & (new_col < self.cols) & (new_row >= 0) & (new_row < self.rows)
+        return np.where(valid, new_col * self.rows + new_row, -1)
+
+@functools.lru_cache(maxsize=8)
+def get_topology(rows: int, cols: int, implicit: bool = False) -> HexTopology:
+    """
+    Returns the shared topology for a grid size. A HexTopology builds its neighbor table
+    on first use, so holding one costs nothing until a query needs the table.
 
     Args:
-        unit_col (int): The current column of the unit.
-        unit_row (int): The current row of the unit.
-        direction (Direction): The direction in which the unit intends to move (e.g., W, NE, SE, E, SW, NW).
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+        implicit (bool): Return an ImplicitHexTopology, which has no table to build.
+    """
+    return ImplicitHexTopology(rows, cols) if implicit else HexTopology(rows, cols)
+
+def topology_for(tiles, rows: int, cols: int) -> HexTopology:
+    """
+    Returns the topology for a grid of tiles: the shared neighbor table for dense grids,
+    and an ImplicitHexTopology for a ChunkedTileGrid, which may be too large for a table.
+    """
+    return get_topology(rows, cols, implicit=isinstance(tiles, game_objects.ChunkedTileGrid))
+
+@functools.lru_cache(maxsize=1)
+def _offset_array() -> "np.ndarray":
+    return np.array(HEX_OFFSETS, dtype=np.int32)  # (parity, direction, 2)
+
+def get_move_target(col: int, row: int, direction: "game_objects.Direction", topology: HexTopology) -> tuple[int, int] | None:
+    """
+    Looks up the tile reached by moving one hex from (col, row) in the given direction.
+
+    Args:
+        col (int): Start column.
+        row (int): Start row.
+        direction (Direction): The direction of the move.
+        topology (HexTopology): Adjacency of the grid, normally SimulationController.topology.
 
     Returns:
-        bool: True if the move is within the grid boundaries, False otherwise.
+        tuple[int, int] | None: The target (col, row), or None if it lies outside the grid.
 
     Raises:
-        ValueError: If the JSON file cannot be loaded, is missing required keys, or contains invalid data.
         ValueError: If an invalid direction is provided.
     """
-    
-
-    # Define movement offsets based on row parity (pointy-top, odd-r layout)
-    if unit.row % 2 == 0:  # Even row
-        offsets = {
-            game_objects.Direction.W: (-1, 0),    # West
-            game_objects.Direction.NE: (0, -1),   # Northeast
-            game_objects.Direction.SE: (0, 1),    # Southeast
-            game_objects.Direction.E: (1, 0),     # East
-            game_objects.Direction.SW: (-1, 1),   # Southwest
-            game_objects.Direction.NW: (-1, -1)   # Northwest
-        }
-    else:  # Odd row
-        offsets = {
-            game_objects.Direction.W: (-1, 0),    # West
-            game_objects.Direction.NE: (1, -1),   # Northeast
-            game_objects.Direction.SE: (1, 1),    # Southeast
-            game_objects.Direction.E: (1, 0),     # East
-            game_objects.Direction.SW: (0, 1),    # Southwest
-            game_objects.Direction.NW: (0, -1)    # Northwest
-        }
-
-    # Get the offset for the given direction
     try:
-        delta_col, delta_row = offsets[direction]
+        direction_index = game_objects.DIRECTION_INDEX[direction]
     except KeyError:
         raise ValueError(f"Invalid direction: {direction}")
+    rows = topology.rows
+    if not (0 <= col < topology.cols and 0 <= row < rows):
+        return None
+    target = topology.neighbor(col * rows + row, direction_index)
+    if target < 0:
+        return None
+    return divmod(target, rows)
 
-    # Calculate the new position
-    new_col = unit.col + delta_col
-    new_row = unit.row + delta_row
+def is_move_valid(unit: "game_objects.Unit", direction: "game_objects.Direction", topology: HexTopology) -> bool:
+    """
+    Checks if a unit's move in the specified direction is valid based on the grid boundaries.
 
-    # Check if the new position is within grid boundaries
-    return 0 <= new_col < cols and 0 <= new_row < rows
+    Args:
+        unit (Unit): The unit that intends to move.
+        direction (Direction): The direction in which the unit intends to move (e.g., W, NE, SE, E, SW, NW).
+        topology (HexTopology): Adjacency of the grid, normally SimulationController.topology.
+
+    Returns:
+        bool: True if the move is within the grid boundaries, False otherwise.
+
+    Raises:
+        ValueError: If an invalid direction is provided.
+    """
+    return get_move_target(unit.col, unit.row, direction, topology) is not None
 
 def calculate_tile_affiliation_percentages(tiles: list[list["game_objects.Tile"]]) -> dict[str, float]:
     """
     Calculates the percentage of tiles affiliated with each team and those with no affiliation.
+    A TileGrid answers from its running counters in O(1); a plain 2D list is scanned.
     
     Args:
-        tiles (list[list[Tile]]): A 2D list of Tile objects.
+        tiles (list[list[Tile]]): A TileGrid or a 2D list of Tile objects.
 
     Returns:
         dict[str, float]: A dictionary mapping "blue", "red", and "none" to their respective percentages.
     """
+    if isinstance(tiles, game_objects.TileGrid):
+        counts = tiles.get_counts()
+        return affiliation_percentages(counts[game_objects.Team.BLUE], counts[game_objects.Team.RED], tiles.cols * tiles.rows)
+
     total_tiles = 0
     blue_count = 0
     red_count = 0
@@ -73,6 +242,15 @@ def calculate_tile_affiliation_percentages(tiles: list[list["game_objects.Tile"]
             elif tile.affiliation == game_objects.Team.RED:
                 red_count += 1
 
+    return affiliation_percentages(blue_count, red_count, total_tiles)
+
+def affiliation_percentages(blue_count: int, red_count: int, total_tiles: int) -> dict[str, float]:
+    """
+    Converts blue/red tile counts into percentages of the whole grid.
+
+    Returns:
+        dict[str, float]: A dictionary mapping "blue", "red", and "none" to their respective percentages.
+    """
     if total_tiles == 0:
         # Edge case: if there are no tiles at all
         return {"blue": 0.0, "red": 0.0, "none": 0.0}
@@ -85,4 +263,4 @@ def calculate_tile_affiliation_percentages(tiles: list[list["game_objects.Tile"]
         "blue": blue_percentage,
         "red": red_percentage,
         "none": none_percentage
-    }
\ No newline at end of file
+    }
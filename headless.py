@@ -0,0 +1,147 @@
+import argparse
+import random
+import time
+import controllers
+import event_log
+import gamelogic
+import initialization
+from game_objects import Team, Unit, Tile
+from metrics import MetricsSink
+
+class HeadlessRunner:
+    def __init__(self, config_filename: str = "config.json", units_filename: str = "units.json", delta_time: int = None,
+                 use_unit_store: bool = False, use_scheduler: bool = False, seed: int = None,
+                 event_log_filename: str = None, keyframe_interval: int = 600, metrics_filename: str = None,
+                 metrics_every: int = 1):
+        """
+        Builds the simulation world without opening a window or importing pygame.
+
+        Args:
+            config_filename (str): Path to the JSON configuration file.
+            units_filename (str): Path to the unit file, JSON or a columnar .npz scenario.
+            delta_time (int, optional): Simulated milliseconds advanced per step.
+                Defaults to one frame at the configured fps.
+            use_unit_store (bool): Run units on the NumPy-backed UnitStore.
+            use_scheduler (bool): Complete moves through the event-driven move scheduler.
+            seed (int, optional): Seed for reproducible runs. Each team gets its own random
+                stream derived from it; unseeded runs use the module-level generator.
+            event_log_filename (str, optional): Record the run to this binary event log.
+            keyframe_interval (int): Ticks between event log keyframes.
+            metrics_filename (str, optional): Record per-tick metrics to this file (see metrics.py),
+                as CSV if it ends in .csv and columnar binary otherwise.
+            metrics_every (int): Keep only every Nth tick's metrics.
+
+        Raises:
+            ValueError: If delta_time is not a positive number.
+        """
+        config = initialization.load_config(config_filename)
+        if delta_time is None:
+            delta_time = round(1000 / config.get("fps", 60))
+        if delta_time <= 0:
+            raise ValueError(f"delta_time must be positive, got {delta_time}")
+        self.delta_time = delta_time
+        self.steps = 0
+
+        self.seed = seed
+        self.blue_controller = controllers.TeamController(Team.BLUE, team_rng(seed, Team.BLUE))
+        self.red_controller = controllers.TeamController(Team.RED, team_rng(seed, Team.RED))
+        self.tiles = initialization.initialize_tiles(config_filename)
+        self.event_log = None
+        if event_log_filename is not None:
+            self.event_log = event_log.EventLogWriter(event_log_filename, config["rows"], config["cols"], keyframe_interval)
+        self.simulation_controller = controllers.SimulationController(
+            self.blue_controller, self.red_controller, self.tiles, config_filename, use_unit_store, use_scheduler,
+            self.event_log
+        )
+        self.units = initialization.load_units(
+            units_filename, self.blue_controller, self.red_controller, self.simulation_controller
+        )
+        self.metrics = None if metrics_filename is None else MetricsSink(metrics_filename, every=metrics_every)
+
+    def step(self):
+        """
+        Advances the simulation by one fixed time step, mirroring one frame of main.main().
+        """
+        self.blue_controller.move_units_randomly()
+        self.red_controller.move_units_randomly()
+        if self.metrics is None:
+            self.simulation_controller.update(self.delta_time)
+        else:
+            start = time.perf_counter()
+            self.simulation_controller.update(self.delta_time)
+            self.metrics.sample(self.simulation_controller, (time.perf_counter() - start) * 1000)
+        self.steps += 1
+
+    def run(self, steps: int) -> tuple[list[list[Tile]], list[Unit]]:
+        """
+        Runs the simulation for a number of steps as fast as the CPU allows.
+
+        Args:
+            steps (int): Number of fixed time steps to simulate.
+
+        Returns:
+            tuple[list[list[Tile]], list[Unit]]: The final tiles and units.
+        """
+        for _ in range(steps):
+            self.step()
+        return self.tiles, self.units
+
+    def close(self):
+        """
+        Finishes the event log and the metrics file, if they are being recorded.
+        """
+        if self.event_log is not None:
+            self.event_log.close()
+        if self.metrics is not None:
+            self.metrics.close()
+
+def team_rng(seed: int, team: Team) -> random.Random | None:
+    """
+    Derives a team's random stream from a run seed, or None for unseeded runs.
+    String seeds are hashed deterministically, so streams match across processes.
+    """
+    if seed is None:
+        return None
+    return random.Random(f"{seed}:{team.value}")
+
+def run_headless(config_filename: str, units_filename: str, steps: int, delta_time: int = None,
+                 use_unit_store: bool = False, use_scheduler: bool = False, seed: int = None) -> tuple[list[list[Tile]], list[Unit]]:
+    """
+    Convenience wrapper that builds a HeadlessRunner and runs it to completion.
+
+    Returns:
+        tuple[list[list[Tile]], list[Unit]]: The final tiles and units.
+    """
+    return HeadlessRunner(config_filename, units_filename, delta_time, use_unit_store, use_scheduler, seed).run(steps)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the hex simulation without a window.")
+    parser.add_argument("--config", default="config.json", help="Path to the configuration file.")
+    parser.add_argument("--units", default="units.json", help="Path to the unit data file.")
+    parser.add_argument("--steps", type=int, default=10000, help="Number of steps to simulate.")
+    parser.add_argument("--delta-time", type=int, default=None, help="Simulated milliseconds per step.")
+    parser.add_argument("--unit-store", action="store_true", help="Use the NumPy-backed unit store.")
+    parser.add_argument("--scheduler", action="store_true", help="Use the event-driven move scheduler.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a reproducible run.")
+    parser.add_argument("--event-log", default=None, help="Record the run to this binary event log.")
+    parser.add_argument("--metrics", default=None, help="Record per-tick metrics to this file (.csv or binary).")
+    parser.add_argument("--metrics-every", type=int, default=1, help="Keep only every Nth tick's metrics.")
+    args = parser.parse_args()
+
+    runner = HeadlessRunner(args.config, args.units, args.delta_time, args.unit_store, args.scheduler, args.seed,
+                            args.event_log, metrics_filename=args.metrics, metrics_every=args.metrics_every)
+    start = time.perf_counter()
+    tiles, _ = runner.run(args.steps)
+    elapsed = time.perf_counter() - start
+    runner.close()
+
+    stats = gamelogic.calculate_tile_affiliation_percentages(tiles)
+    print(
+        f"Blue: {stats['blue']:.2f}%  |  "
+        f"Red: {stats['red']:.2f}%  |  "
+        f"None: {stats['none']:.2f}%"
+    )
+    print(f"{args.steps} steps in {elapsed:.3f}s ({args.steps / elapsed:.0f} ticks/sec)")
+
+if __name__ == "__main__":
+    main()
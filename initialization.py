@@ -1,7 +1,10 @@
 import json
-from game_objects import Team, Unit, Tile
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for columnar scenario files
+    np = None
+from game_objects import Team, Unit, TileGrid, ChunkedTileGrid, TEAM_CODES
 from controllers import TeamController, SimulationController
-import pygame
 
 def load_config(filename):
     """
@@ -20,75 +23,274 @@ def initialize_simulation(config_filename: str):
     fps = config.get("fps", 60)
     hex_size = config.get("hex_size", 40)
 
-     # Initialize Pygame
+     # Initialize Pygame (imported here so headless runs never load it)
+    import pygame
     pygame.init()
     screen = pygame.display.set_mode((window_width, window_height))
     pygame.display.set_caption("Hex Grid Visualization (Pygame)")
 
     return screen, fps, hex_size
 
-def load_units_from_json(json_file: str, blue_controller: TeamController, red_controller: TeamController, simulation_controller: SimulationController):
-    units = []
+def iter_json_records(f, chunk_size: int = 1 << 16):
+    """
+    Yields the elements of a top-level JSON array one at a time, reading the file in
+    chunks so the whole document is never held in memory. A file holding a single
+    object yields that object.
+
+    Args:
+        f (TextIO): Open text file positioned at the start of the document.
+        chunk_size (int): Number of characters read per refill.
+
+    Raises:
+        ValueError: If the document is not a JSON array or object, or is malformed.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        # Drops what has been parsed and appends the next chunk; returns False at end of file
+        nonlocal buffer, pos, eof
+        chunk = f.read(chunk_size)
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        eof = not chunk
+        return not eof
+
+    def skip_whitespace():
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n":
+                pos += 1
+            if pos < len(buffer) or not fill():
+                return
+
+    skip_whitespace()
+    if pos < len(buffer) and buffer[pos] == "{":
+        while fill():
+            pass
+        yield json.loads(buffer)  # A single unit is small; parse it whole
+        return
+    if pos >= len(buffer) or buffer[pos] != "[":
+        raise ValueError("Expected a JSON array of units.")
+    pos += 1
+    expect_value = True
+    after_comma = False  # An element must follow, so the array cannot close yet
+    while True:
+        skip_whitespace()
+        if pos >= len(buffer):
+            raise ValueError("Unterminated JSON array.")
+        if buffer[pos] == "]":
+            if after_comma:
+                raise ValueError(f"Trailing ',' before ']' in JSON array near character {pos}.")
+            return
+        if buffer[pos] == ",":
+            if expect_value:
+                raise ValueError(f"Unexpected ',' in JSON array near character {pos}.")
+            expect_value = True
+            after_comma = True
+            pos += 1
+            continue
+        if not expect_value:
+            raise ValueError(f"Expected ',' between JSON array elements near character {pos}.")
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if eof:
+                raise ValueError(f"Malformed unit data: {e}")
+            fill()  # The element may continue in the next chunk
+            continue
+        if not eof and not isinstance(record, (dict, list, str)) and (
+                end == len(buffer) or buffer[end] not in ",] \t\r\n"):
+            fill()  # A number or literal may be cut off at the chunk boundary
+            continue
+        yield record
+        pos = end
+        expect_value = False
+        after_comma = False
+
+def validate_unit_records(records: list[dict], rows: int, cols: int, first_index: int = 0) -> tuple:
+    """
+    Checks a batch of unit records and converts it to columns.
+
+    Args:
+        records (list[dict]): Unit records with 'col', 'row', 'team' and 'speed' keys.
+        rows (int): Number of grid rows.
+        cols (int): Number of grid columns.
+        first_index (int): Position of the first record in the file, for error messages.
+
+    Returns:
+        tuple: (cols, rows, team_codes, speeds) lists, one entry per record.
+
+    Raises:
+        ValueError: If a record is missing a key, names an unknown team or lies outside the grid.
+    """
+    unit_cols, unit_rows, team_codes, speeds = [], [], [], []
+    for offset, unit_data in enumerate(records):
+        try:
+            col = unit_data['col']
+            row = unit_data['row']
+            team = Team(unit_data['team'])  # Automatically raises ValueError if the team is invalid
+            speed = unit_data['speed']
+            inside = 0 <= col < cols and 0 <= row < rows
+        except KeyError as e:
+            raise ValueError(f"Missing key in unit data: {e}")
+        except TypeError:
+            raise ValueError(f"Unit {first_index + offset} is not a valid unit record: {unit_data!r}")
+        if not inside:
+            raise ValueError(f"Unit {first_index + offset} at ({col}, {row}) is outside the {cols}x{rows} grid.")
+        unit_cols.append(col)
+        unit_rows.append(row)
+        team_codes.append(TEAM_CODES[team])
+        speeds.append(speed)
+    return unit_cols, unit_rows, team_codes, speeds
+
+def _add_to_teams(units: list[Unit], blue_controller: TeamController, red_controller: TeamController):
+    # Teams were validated while loading, so units are appended without per-unit checks
+    blue_units = blue_controller.units
+    red_units = red_controller.units
+    for unit in units:
+        (blue_units if unit.team == Team.BLUE else red_units).append(unit)
+
+def load_units_from_json(json_file: str, blue_controller: TeamController, red_controller: TeamController,
+                         simulation_controller: SimulationController, batch_size: int = 10000) -> list[Unit]:
     """
     Loads unit data from a JSON file and assigns units to the provided team controllers.
+    Records are parsed incrementally and added in batches, so memory stays proportional
+    to the batch size rather than the file size.
 
     Args:
         json_file (str): Path to the JSON file containing unit data.
         blue_controller (TeamController): Controller for the blue team.
         red_controller (TeamController): Controller for the red team.
         simulation_controller (SimulationController): Controller for the simulation.
+        batch_size (int): Number of records validated and added at a time.
+
+    Returns:
+        list[Unit]: The loaded units, in file order.
+
     Raises:
-        ValueError: If the JSON data is missing required keys or contains invalid team values.
+        ValueError: If the JSON data is malformed, missing required keys, contains invalid
+            team values or places a unit outside the grid.
     """
+    sim = simulation_controller
+    units = []
+    batch = []
     with open(json_file, 'r') as f:
-        data = json.load(f)
-    
-    # Handle both single unit (dict) and multiple units (list)
-    if isinstance(data, dict):
-        data = [data]  # Convert single dict to a list with one item
-    
-    for unit_data in data:
+        for record in iter_json_records(f):
+            batch.append(record)
+            if len(batch) == batch_size:
+                units.extend(sim.create_units(*validate_unit_records(batch, sim.rows, sim.cols, len(units))))
+                batch.clear()
+        if batch:
+            units.extend(sim.create_units(*validate_unit_records(batch, sim.rows, sim.cols, len(units))))
+    _add_to_teams(units, blue_controller, red_controller)
+    return units
+
+def save_units_npz(npz_file: str, cols, rows, team_codes, speeds):
+    """
+    Writes unit columns to a columnar scenario file: an uncompressed .npz holding
+    'col' and 'row' (int32), 'team' (int8 team codes) and 'speed' (float64) arrays.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("Columnar scenario files require NumPy to be installed.")
+    np.savez(npz_file, col=np.asarray(cols, dtype=np.int32), row=np.asarray(rows, dtype=np.int32),
+             team=np.asarray(team_codes, dtype=np.int8), speed=np.asarray(speeds, dtype=np.float64))
+
+def convert_units_json_to_npz(json_file: str, npz_file: str, rows: int, cols: int, batch_size: int = 100000):
+    """
+    Converts a JSON unit file to the columnar .npz format, streaming the JSON in batches.
+
+    Raises:
+        ValueError: If the JSON data is invalid (see load_units_from_json).
+        ImportError: If NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("Columnar scenario files require NumPy to be installed.")
+    parts = []
+    batch = []
+    count = 0
+    with open(json_file, 'r') as f:
+        for record in iter_json_records(f):
+            batch.append(record)
+            if len(batch) == batch_size:
+                parts.append([np.asarray(column) for column in validate_unit_records(batch, rows, cols, count)])
+                count += len(batch)
+                batch.clear()
+        if batch:
+            parts.append([np.asarray(column) for column in validate_unit_records(batch, rows, cols, count)])
+    if not parts:
+        save_units_npz(npz_file, [], [], [], [])
+        return
+    save_units_npz(npz_file, *(np.concatenate(column) for column in zip(*parts)))
+
+def load_units_from_npz(npz_file: str, blue_controller: TeamController, red_controller: TeamController,
+                        simulation_controller: SimulationController) -> list[Unit]:
+    """
+    Bulk-loads a columnar scenario file written by save_units_npz(). The columns are
+    validated with array operations and handed to SimulationController.create_units()
+    in one call.
+
+    Returns:
+        list[Unit]: The loaded units, in file order.
+
+    Raises:
+        ValueError: If a column is missing or a unit has an unknown team or lies outside the grid.
+        ImportError: If NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("Columnar scenario files require NumPy to be installed.")
+    sim = simulation_controller
+    with np.load(npz_file) as data:
         try:
-            col = unit_data['col']
-            row = unit_data['row']
-            team_str = unit_data['team']
-            speed = unit_data['speed']
-            team = Team(team_str)  # Automatically raises ValueError if team_str is invalid
-            unit = Unit(col, row, team, speed, simulation_controller)
-            if team == Team.BLUE:
-                blue_controller.add_unit(unit)
-            elif team == Team.RED:
-                red_controller.add_unit(unit)
-            units.append(unit)
+            cols, rows, team_codes, speeds = (data[name] for name in ("col", "row", "team", "speed"))
         except KeyError as e:
-            raise ValueError(f"Missing key in unit data: {e}")
-        except ValueError as e:
-            raise e  # Re-raise ValueError from Team(team_str) or add_unit
-        
+            raise ValueError(f"Missing column in {npz_file}: {e}")
+    if not len(cols) == len(rows) == len(team_codes) == len(speeds):
+        raise ValueError(f"Columns in {npz_file} have different lengths.")
+    bad = np.flatnonzero((cols < 0) | (cols >= sim.cols) | (rows < 0) | (rows >= sim.rows))
+    if len(bad):
+        raise ValueError(f"Unit {bad[0]} at ({cols[bad[0]]}, {rows[bad[0]]}) is outside the {sim.cols}x{sim.rows} grid.")
+    bad = np.flatnonzero((team_codes != TEAM_CODES[Team.BLUE]) & (team_codes != TEAM_CODES[Team.RED]))
+    if len(bad):
+        raise ValueError(f"Unit {bad[0]} has invalid team code {team_codes[bad[0]]}.")
+    units = sim.create_units(cols, rows, team_codes, speeds)
+    _add_to_teams(units, blue_controller, red_controller)
     return units
 
-def initialize_tiles(config_filename: str) -> list[list[Tile]]:
+def load_units(filename: str, blue_controller: TeamController, red_controller: TeamController,
+               simulation_controller: SimulationController) -> list[Unit]:
+    """
+    Loads units from a columnar .npz scenario or a JSON unit file, chosen by extension.
     """
-    Loads the config file, reads 'rows' and 'cols', and creates a 2D array of Tile objects.
+    if filename.endswith(".npz"):
+        return load_units_from_npz(filename, blue_controller, red_controller, simulation_controller)
+    return load_units_from_json(filename, blue_controller, red_controller, simulation_controller)
+
+def initialize_tiles(config_filename: str, debug: bool = False) -> TileGrid:
+    """
+    Loads the config file, reads 'rows' and 'cols', and creates a grid of Tile objects.
+    If the config sets 'chunk_size', the grid is a sparse ChunkedTileGrid that only
+    allocates the chunks units reach.
 
     Args:
         config_filename (str): The path to the JSON configuration file.
+        debug (bool): Check the grid's running affiliation counters against a full
+            recount whenever they are read.
 
     Returns:
-        list[list[Tile]]: A 2D list (rows x cols) of Tile objects.
+        TileGrid: A column-major grid (tiles[col][row]) of Tile objects.
     """
     with open(config_filename, 'r') as f:
         config = json.load(f)
 
     rows = config["rows"]
     cols = config["cols"]
-
-    tiles = []
-    for x in range(cols):   # x = horizontal
-        column_tiles = []
-        for y in range(rows):  # y = vertical
-            tile = Tile(col=x, row=y) 
-            column_tiles.append(tile)
-        tiles.append(column_tiles)
-        
-    return tiles
+    chunk_size = config.get("chunk_size")
+    if chunk_size is not None:
+        return ChunkedTileGrid(cols, rows, chunk_size, debug=debug)
+    return TileGrid(cols, rows, debug=debug)
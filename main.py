@@ -1,15 +1,36 @@
+import argparse
 import sys
+import time
 import pygame
 import controllers
 import renderer
 import initialization
+from game_objects import TileGrid
+from metrics import MetricsSink
+from profiler import FrameProfiler, NULL_PROFILER
+from sim_thread import SimulationThread, render_time
+from time_warp import TimeWarp
+
+SPEED_KEYS = (pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4)  # Select time_warp.SPEEDS[0..3]
 
 # --- MAIN LOOP ---
 
 def main():
+    parser = argparse.ArgumentParser(description="Run the hex simulation in a window.")
+    parser.add_argument("--profile", action="store_true", help="Time each frame phase and show an overlay (F3 toggles it).")
+    parser.add_argument("--trace", default=None, help="Write a Chrome trace of the profiled frames to this file on exit.")
+    parser.add_argument("--pixel-buffer", action="store_true", help="Paint the map from a pixel-to-tile lookup instead of polygons.")
+    parser.add_argument("--metrics", default=None, help="Record per-tick metrics to this file (.csv or binary); lockstep mode only.")
+    parser.add_argument("--metrics-every", type=int, default=1, help="Keep only every Nth tick's metrics.")
+    parser.add_argument("--render-every", type=int, default=1, help="Draw the map only every Nth simulation tick; lockstep mode only.")
+    parser.add_argument("--threaded", action="store_true", help="Run the simulation on a worker thread at a fixed tick rate.")
+    args = parser.parse_args()
+
     screen, fps, hex_size = initialization.initialize_simulation("config.json")
     clock = pygame.time.Clock()
     running = True
+    profiler = FrameProfiler() if args.profile or args.trace else NULL_PROFILER
+    show_overlay = args.profile
 
     # Initialize controllers for both teams
     blue_controller = controllers.TeamController(controllers.Team.BLUE)
@@ -17,27 +38,100 @@ def main():
 
     # Load units from the JSON file and assign them to the controllers
     tiles = initialization.initialize_tiles("config.json")
-    simulation_controller = controllers.SimulationController(blue_controller, red_controller, tiles)
+    simulation_controller = controllers.SimulationController(blue_controller, red_controller, tiles,
+                                                             track_territory=True)
     units = initialization.load_units_from_json("units.json", blue_controller, red_controller, simulation_controller)
-    render_controller = renderer.RenderController(screen, fps, hex_size, tiles, units)
+    # Samples go to a ring buffer that a background thread writes out, so the loop never waits on disk
+    metrics = MetricsSink(args.metrics, every=args.metrics_every) if args.metrics else None
+    sim_thread = None
+    if args.threaded:
+        # The renderer draws published snapshots into its own grid and territory metrics, never the live ones
+        sim_thread = SimulationThread(simulation_controller, tick_ms=round(1000 / fps))
+        render_controller = renderer.RenderController(screen, fps, hex_size, TileGrid(tiles.cols, tiles.rows), [],
+                                                      pixel_buffer=args.pixel_buffer)
+        sim_thread.start()
+    else:
+        render_controller = renderer.RenderController(screen, fps, hex_size, tiles, units,
+                                                      simulation_controller.territory, args.pixel_buffer)
+    # Above 1x, ticks of one frame's length run until the frame's simulated time or 3/4 of the frame is used up
+    time_warp = TimeWarp(round(1000 / fps), 750 / fps, args.render_every)
+
+    def sim_tick(step_ms: int):
+        blue_controller.move_units_randomly()  # Moves all blue units randomly
+        red_controller.move_units_randomly()  # Moves all red units randomly
+        update_start = time.perf_counter()
+        simulation_controller.update(step_ms)
+        if metrics is not None:
+            metrics.sample(simulation_controller, (time.perf_counter() - update_start) * 1000)
+
+    def profiled_tick(step_ms: int):
+        # A frame may run many ticks, so per-tick phases go to their own series, not the frame
+        start = time.perf_counter_ns()
+        blue_controller.move_units_randomly()
+        red_controller.move_units_randomly()
+        update_start = time.perf_counter_ns()
+        simulation_controller.update(step_ms)
+        end = time.perf_counter_ns()
+        if metrics is not None:
+            metrics.sample(simulation_controller, (end - update_start) / 1e6)
+        profiler.sample("tick_ai", update_start - start)
+        profiler.sample("tick_update", end - update_start)
+
+    tick = profiled_tick if profiler.enabled else sim_tick
 
     while running:
-        clock.tick(fps)
+        # At 1x one tick per frame, so delta_time is the real time since the previous frame
+        delta_time = clock.tick(fps)
+        profiler.begin_frame()
+        view = (render_controller.camera.x, render_controller.camera.y, render_controller.camera.zoom)
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                show_overlay = not show_overlay
+            elif event.type == pygame.KEYDOWN and event.key in SPEED_KEYS:
+                time_warp.set_speed(SPEED_KEYS.index(event.key))
+                if sim_thread is not None:
+                    sim_thread.speed = time_warp.speed
+            else:
+                render_controller.camera.handle_event(event)
+                render_controller.handle_event(event)  # Hover and selection
+        render_controller.camera.pan_with_keys(pygame.key.get_pressed(), delta_time)
+        profiler.mark("input")
 
-        blue_controller.move_units_randomly()  # Moves all blue units randomly
-        red_controller.move_units_randomly()  # Moves all red units randomly
-        delta_time = clock.tick(fps)
-        simulation_controller.update(delta_time)
+        if sim_thread is not None:
+            snapshot = sim_thread.take_snapshot()
+            snapshot.render_time = render_time(snapshot, sim_thread.speed, sim_thread.tick_ms)
+            render_controller.show_snapshot(snapshot)
+            render_controller.status = sim_thread.status()
+            profiler.mark("sync")
+        else:
+            time_warp.advance(tick, delta_time)
+            profiler.mark("simulate")
+            render_controller.status = time_warp.status()
+            # Skipped frames keep the last drawn map on screen; moving the view always redraws
+            moved = view != (render_controller.camera.x, render_controller.camera.y, render_controller.camera.zoom)
+            if not time_warp.should_draw(force=moved):
+                profiler.end_frame()
+                continue
         # 3) Draw the hex grid with coordinates
         render_controller.draw_map()
+        if show_overlay:
+            profiler.draw_overlay(screen, render_controller.font)
+        profiler.mark("draw_map")
 
         pygame.display.flip()
+        profiler.mark("flip")
+        profiler.end_frame()
 
+    if sim_thread is not None:
+        sim_thread.stop()
+    if metrics is not None:
+        metrics.close()
+    if args.trace:
+        profiler.export_chrome_trace(args.trace)
     pygame.quit()
     sys.exit()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
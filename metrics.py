@@ -0,0 +1,197 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from controllers import SimulationController
+import struct
+import threading
+from array import array
+import gamelogic
+
+FIELDS = ("tick", "time_ms", "blue", "red", "none", "moves_started", "moves_completed", "tick_ms")
+MAGIC = b"HOIMETRC"
+VERSION = 1
+# magic, version, number of fields; the field names follow as one comma-separated UTF-8 string
+HEADER = struct.Struct("<8sHH")
+NAMES_LENGTH = struct.Struct("<I")
+# Rows in the block; the block then holds one float64 column per field
+BLOCK = struct.Struct("<I")
+
+DROP_OLDEST = "drop_oldest"  # A full buffer overwrites its oldest unwritten sample
+DROP_NEWEST = "drop_newest"  # A full buffer discards the new sample
+BLOCK_PRODUCER = "block"  # A full buffer makes record() wait for the writer
+POLICIES = (DROP_OLDEST, DROP_NEWEST, BLOCK_PRODUCER)
+
+class MetricsSink:
+    """
+    Records one row of FIELDS per sample into a preallocated ring buffer, which a
+    background writer thread drains to a CSV file or a columnar binary file. record()
+    only copies numbers into the buffer, so the simulation loop never waits on disk.
+
+    The buffer never grows: when the writer falls behind and the buffer fills up, the
+    backpressure policy decides whether the oldest samples are overwritten, new samples
+    are dropped, or the producer blocks. Dropped samples are counted in `dropped`.
+    """
+    def __init__(self, filename: str, capacity: int = 4096, every: int = 1, policy: str = DROP_OLDEST,
+                 flush_interval: float = 0.5, binary: bool = None):
+        """
+        Args:
+            filename (str): Path of the file to create.
+            capacity (int): Samples the ring buffer holds.
+            every (int): Decimation; only every Nth call to record() is kept.
+            policy (str): DROP_OLDEST, DROP_NEWEST or BLOCK_PRODUCER, applied when the buffer is full.
+            flush_interval (float): Seconds the writer waits before flushing a partly filled buffer.
+            binary (bool, optional): Write the columnar binary format instead of CSV.
+                Defaults to binary unless the filename ends in .csv.
+
+        Raises:
+            ValueError: If capacity or every is not positive, or the policy is unknown.
+        """
+        if capacity <= 0:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        if every <= 0:
+            raise ValueError(f"every must be positive, got {every}")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown backpressure policy {policy!r}, expected one of {POLICIES}")
+        self.capacity = capacity
+        self.every = every
+        self.policy = policy
+        self.flush_interval = flush_interval
+        self.binary = not filename.endswith(".csv") if binary is None else binary
+        self.width = len(FIELDS)
+        self.buffer = array("d", bytes(8 * capacity * self.width))
+        self.head = 0  # Slot of the oldest unwritten sample
+        self.size = 0  # Unwritten samples in the buffer
+        self.calls = 0
+        self.dropped = 0
+        self.closing = False
+        self.condition = threading.Condition()
+
+        if self.binary:
+            self.file = open(filename, "wb")
+            names = ",".join(FIELDS).encode()
+            self.file.write(HEADER.pack(MAGIC, VERSION, self.width) + NAMES_LENGTH.pack(len(names)) + names)
+        else:
+            self.file = open(filename, "w", newline="")
+            self.file.write(",".join(FIELDS) + "\n")
+        self.writer = threading.Thread(target=self._run, name="metrics-writer", daemon=True)
+        self.writer.start()
+
+    def __enter__(self) -> "MetricsSink":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def sample(self, simulation_controller: "SimulationController", tick_ms: float):
+        """
+        Records the simulation's current tick, territory shares and move totals, plus the
+        wall-clock milliseconds its last tick took.
+        """
+        sim = simulation_controller
+        stats = gamelogic.calculate_tile_affiliation_percentages(sim.tiles)
+        self.record((sim.tick, sim.time, stats["blue"], stats["red"], stats["none"],
+                     sim.moves_started, sim.moves_completed, tick_ms))
+
+    def record(self, values: tuple[float, ...]):
+        """
+        Appends one row of FIELDS, subject to decimation and the backpressure policy.
+        """
+        self.calls += 1
+        if (self.calls - 1) % self.every:
+            return
+        with self.condition:
+            if self.size == self.capacity:
+                if self.policy == DROP_NEWEST:
+                    self.dropped += 1
+                    return
+                if self.policy == DROP_OLDEST:
+                    self.head = (self.head + 1) % self.capacity
+                    self.size -= 1
+                    self.dropped += 1
+                else:
+                    self.condition.notify_all()
+                    self.condition.wait_for(lambda: self.size < self.capacity or self.closing)
+                    if self.size == self.capacity:
+                        self.dropped += 1  # Closed while waiting
+                        return
+            start = (self.head + self.size) % self.capacity * self.width
+            self.buffer[start:start + self.width] = array("d", values)
+            self.size += 1
+            if self.size * 2 >= self.capacity:
+                self.condition.notify_all()  # Wake the writer early rather than risk dropping samples
+
+    def _take(self) -> array:
+        """
+        Moves every unwritten sample out of the ring buffer, oldest first. Call with the condition held.
+        """
+        start = self.head * self.width
+        end = start + self.size * self.width
+        total = self.capacity * self.width
+        if end <= total:
+            rows = self.buffer[start:end]
+        else:
+            rows = self.buffer[start:] + self.buffer[:end - total]
+        self.head = (self.head + self.size) % self.capacity
+        self.size = 0
+        self.condition.notify_all()  # Release producers blocked on a full buffer
+        return rows
+
+    def _run(self):
+        while True:
+            with self.condition:
+                # Wake early once the buffer is half full, including if it filled while writing
+                self.condition.wait_for(lambda: self.closing or self.size * 2 >= self.capacity, self.flush_interval)
+                rows = self._take()
+                closing = self.closing
+            if rows:
+                self._write(rows)
+            if closing:
+                return
+
+    def _write(self, rows: array):
+        count = len(rows) // self.width
+        if self.binary:
+            self.file.write(BLOCK.pack(count))
+            for field in range(self.width):
+                self.file.write(rows[field::self.width].tobytes())
+        else:
+            self.file.write("".join(",".join(repr(value) for value in rows[i:i + self.width]) + "\n"
+                                    for i in range(0, len(rows), self.width)))
+
+    def close(self):
+        """
+        Writes the remaining samples, stops the writer thread and closes the file.
+        """
+        if self.file.closed:
+            return
+        with self.condition:
+            self.closing = True
+            self.condition.notify_all()
+        self.writer.join()
+        self.file.close()
+
+def read_metrics(filename: str) -> dict[str, list[float]]:
+    """
+    Reads a binary metrics file written by MetricsSink into one list per field.
+
+    Raises:
+        ValueError: If the file is not a metrics file.
+    """
+    with open(filename, "rb") as f:
+        data = f.read()
+    magic, version, width = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{filename} is not a version {VERSION} metrics file.")
+    offset = HEADER.size
+    (length,) = NAMES_LENGTH.unpack_from(data, offset)
+    offset += NAMES_LENGTH.size
+    names = data[offset:offset + length].decode().split(",")
+    offset += length
+    columns = {name: array("d") for name in names}
+    while offset < len(data):
+        (count,) = BLOCK.unpack_from(data, offset)
+        offset += BLOCK.size
+        for name in names:
+            columns[name].frombytes(data[offset:offset + 8 * count])
+            offset += 8 * count
+    return {name: column.tolist() for name, column in columns.items()}
@@ -0,0 +1,177 @@
+import gamelogic
+from game_objects import Team, TEAM_CODES
+
+class OccupancyIndex:
+    """
+    Tracks which units stand on each tile, keyed by cell index (col * rows + row), so
+    tile, neighborhood and radius queries never scan the full unit list. A moving unit
+    occupies its start tile until the move completes.
+
+    An occupied cell holds a lone unit's id directly and a set of ids once units stack.
+    Empty cells have no entry, so memory grows with the number of units, not the map size.
+    """
+    def __init__(self, rows: int, cols: int, topology: gamelogic.HexTopology = None):
+        """
+        Args:
+            rows (int): Number of grid rows.
+            cols (int): Number of grid columns.
+            topology (HexTopology, optional): Adjacency for neighborhood queries, normally
+                SimulationController.topology. Defaults to the shared table for the grid size.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.topology = gamelogic.get_topology(rows, cols) if topology is None else topology
+        self.occupants = {}  # cell -> unit id, or set of unit ids for stacks
+        self.unit_codes = bytearray()  # unit id -> team code
+
+    def add(self, unit_id: int, team: Team, col: int, row: int):
+        self._set_code(unit_id, TEAM_CODES[team])
+        self._insert(unit_id, col * self.rows + row)
+
+    def add_many(self, unit_ids, team_codes, cells):
+        """
+        Adds a batch of units given as parallel sequences (or NumPy arrays) of unit ids,
+        team codes and cell indices.
+        """
+        if hasattr(unit_ids, "tolist"):
+            unit_ids, team_codes, cells = unit_ids.tolist(), team_codes.tolist(), cells.tolist()
+        for unit_id, code in zip(unit_ids, team_codes):
+            self._set_code(unit_id, code)
+        for unit_id, cell in zip(unit_ids, cells):
+            self._insert(unit_id, cell)
+
+    def remove(self, unit_id: int, col: int, row: int):
+        self._discard(unit_id, col * self.rows + row)
+
+    def move(self, unit_id: int, old_tile: tuple[int, int], new_tile: tuple[int, int]):
+        """
+        Moves a unit's entry from old_tile to new_tile, both given as (col, row).
+        """
+        self._discard(unit_id, old_tile[0] * self.rows + old_tile[1])
+        self._insert(unit_id, new_tile[0] * self.rows + new_tile[1])
+
+    def move_many(self, unit_ids, old_cells, new_cells):
+        """
+        Moves a batch of units given as parallel sequences (or NumPy arrays) of unit ids
+        and cell indices, as produced by the unit store.
+        """
+        if hasattr(unit_ids, "tolist"):
+            unit_ids, old_cells, new_cells = unit_ids.tolist(), old_cells.tolist(), new_cells.tolist()
+        for unit_id, old_cell, new_cell in zip(unit_ids, old_cells, new_cells):
+            self._discard(unit_id, old_cell)
+            self._insert(unit_id, new_cell)
+
+    def _set_code(self, unit_id: int, code: int):
+        if unit_id >= len(self.unit_codes):
+            self.unit_codes.extend(bytes(unit_id + 1 - len(self.unit_codes)))
+        self.unit_codes[unit_id] = code
+
+    def _insert(self, unit_id: int, cell: int):
+        occupants = self.occupants.get(cell)
+        if occupants is None:
+            self.occupants[cell] = unit_id
+        elif type(occupants) is int:
+            self.occupants[cell] = {occupants, unit_id}
+        else:
+            occupants.add(unit_id)
+
+    def _discard(self, unit_id: int, cell: int):
+        occupants = self.occupants[cell]
+        if type(occupants) is int:
+            del self.occupants[cell]
+        else:
+            occupants.remove(unit_id)
+            if len(occupants) == 1:
+                self.occupants[cell] = occupants.pop()
+
+    def _members(self, cell: int) -> tuple[int, ...] | set[int]:
+        occupants = self.occupants.get(cell)
+        if occupants is None:
+            return ()
+        return (occupants,) if type(occupants) is int else occupants
+
+    def _collect(self, cells, code: int = None) -> list[int]:
+        found = []
+        unit_codes = self.unit_codes
+        for cell in cells:
+            members = self._members(cell)
+            if code is None:
+                found.extend(members)
+            else:
+                found.extend(unit_id for unit_id in members if unit_codes[unit_id] == code)
+        found.sort()
+        return found
+
+    def units_at(self, col: int, row: int, team: Team = None) -> list[int]:
+        """
+        Returns the ids of the units on a tile in ascending order, optionally only those of one team.
+        """
+        return self._collect((col * self.rows + row,), None if team is None else TEAM_CODES[team])
+
+    def count_at(self, col: int, row: int, team: Team = None) -> int:
+        """
+        Returns how many units stand on a tile, optionally only those of one team.
+        """
+        members = self._members(col * self.rows + row)
+        if team is None:
+            return len(members)
+        code = TEAM_CODES[team]
+        return sum(1 for unit_id in members if self.unit_codes[unit_id] == code)
+
+    def counts_at(self, col: int, row: int) -> dict[Team, int]:
+        """
+        Returns the per-team unit counts on a tile, e.g. {Team.BLUE: 3, Team.RED: 0}.
+        """
+        counts = [0, 0, 0]
+        for unit_id in self._members(col * self.rows + row):
+            counts[self.unit_codes[unit_id]] += 1
+        return {Team.BLUE: counts[1], Team.RED: counts[2]}
+
+    def is_contested(self, col: int, row: int) -> bool:
+        """
+        Returns True if units of both teams stand on the tile.
+        """
+        occupants = self.occupants.get(col * self.rows + row)
+        if occupants is None or type(occupants) is int:
+            return False
+        return len({self.unit_codes[unit_id] for unit_id in occupants}) > 1
+
+    def cells_within(self, col: int, row: int, radius: int) -> list[int]:
+        """
+        Returns the cells at most `radius` hex steps from (col, row), nearest rings first.
+        """
+        start = col * self.rows + row
+        seen = {start}
+        ring = [start]
+        cells = [start]
+        topology = self.topology
+        for _ in range(radius):
+            next_ring = []
+            for cell in ring:
+                for neighbor in topology.neighbor_ring(cell):
+                    if neighbor >= 0 and neighbor not in seen:
+                        seen.add(neighbor)
+                        next_ring.append(neighbor)
+            cells.extend(next_ring)
+            ring = next_ring
+        return cells
+
+    def units_within(self, col: int, row: int, radius: int, team: Team = None) -> list[int]:
+        """
+        Returns the ids of the units at most `radius` hex steps from (col, row), in
+        ascending order.
+
+        Args:
+            col (int): Column of the center tile.
+            row (int): Row of the center tile.
+            radius (int): Maximum hex distance; 0 is the tile itself, 1 adds its neighbors.
+            team (Team, optional): Only return units of this team.
+        """
+        return self._collect(self.cells_within(col, row, radius), None if team is None else TEAM_CODES[team])
+
+    def units_adjacent(self, col: int, row: int, team: Team = None) -> list[int]:
+        """
+        Returns the ids of the units on the six tiles around (col, row), not counting the tile itself.
+        """
+        return self._collect(self.topology.neighbors_of(col * self.rows + row),
+                             None if team is None else TEAM_CODES[team])
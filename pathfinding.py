@@ -0,0 +1,150 @@
+from array import array
+from collections import deque
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up building flow fields
+    np = None
+from gamelogic import HexTopology
+
+UNREACHABLE = -1
+
+class FlowField:
+    """
+    Distance to the nearest goal and the next step towards it for every cell, computed
+    with one multi-source breadth-first search over the hex grid. Every unit heading for
+    the same goals reads the same field instead of searching on its own.
+
+    direction[cell] is the direction index (see game_objects.DIRECTIONS) to move in from
+    that cell, or -1 for goal cells, blocked cells and cells that cannot reach a goal.
+    When several neighbors are equally close to a goal, the first in DIRECTIONS order wins.
+    """
+    def __init__(self, topology: HexTopology, goals, blocked=frozenset()):
+        """
+        Args:
+            topology (HexTopology): Adjacency of the grid, the same rules moves follow.
+            goals (Iterable[int]): Goal cell indices (col * rows + row).
+            blocked (Iterable[int]): Impassable cell indices. Blocked goals are ignored.
+
+        Raises:
+            ValueError: If a goal lies outside the grid.
+        """
+        self.topology = topology
+        self.goals = frozenset(goals)
+        self.blocked = frozenset(blocked)
+        cell_count = topology.cell_count
+        for cell in self.goals:
+            if not 0 <= cell < cell_count:
+                raise ValueError(f"Goal cell {cell} is outside the {topology.cols}x{topology.rows} grid.")
+        sources = sorted(self.goals - self.blocked)
+        if np is not None:
+            self.distance, self.direction = self._build_numpy(sources)
+        else:
+            self.distance, self.direction = self._build_python(sources)
+
+    def _build_numpy(self, sources: list[int]) -> tuple[array, array]:
+        topology = self.topology
+        distance = np.full(self.topology.cell_count, UNREACHABLE, dtype=np.int32)
+        if self.blocked:
+            distance[list(self.blocked)] = np.iinfo(np.int32).max  # Never reached, never expanded
+        frontier = np.array(sources, dtype=np.intp)
+        distance[frontier] = 0
+        step = 0
+        while len(frontier):
+            step += 1
+            candidates = topology.move_targets(frontier[:, None], np.arange(6)).reshape(-1)
+            candidates = candidates[candidates >= 0]
+            candidates = np.unique(candidates[distance[candidates] == UNREACHABLE])
+            distance[candidates] = step
+            frontier = candidates
+        if self.blocked:
+            distance[list(self.blocked)] = UNREACHABLE
+
+        # Step towards the first neighbor one closer to a goal; later directions are
+        # written first so earlier ones overwrite them
+        cells = np.arange(self.topology.cell_count)
+        wanted = np.where(distance > 0, distance - 1, -2)
+        direction = np.full(self.topology.cell_count, -1, dtype=np.int8)
+        for index in reversed(range(6)):
+            targets = topology.move_targets(cells, index)
+            closer = (targets >= 0) & (distance[targets] == wanted)
+            direction[closer] = index
+        return array("i", distance.tobytes()), array("b", direction.tobytes())
+
+    def _build_python(self, sources: list[int]) -> tuple[array, array]:
+        neighbor_ring = self.topology.neighbor_ring
+        cell_count = self.topology.cell_count
+        distance = array("i", [UNREACHABLE]) * cell_count
+        queue = deque(sources)
+        for cell in sources:
+            distance[cell] = 0
+        while queue:
+            cell = queue.popleft()
+            step = distance[cell] + 1
+            for neighbor in neighbor_ring(cell):
+                if neighbor >= 0 and distance[neighbor] == UNREACHABLE and neighbor not in self.blocked:
+                    distance[neighbor] = step
+                    queue.append(neighbor)
+
+        direction = array("b", [-1]) * cell_count
+        for cell in range(cell_count):
+            if distance[cell] > 0:
+                for index, neighbor in enumerate(neighbor_ring(cell)):
+                    if neighbor >= 0 and distance[neighbor] == distance[cell] - 1:
+                        direction[cell] = index
+                        break
+        return distance, direction
+
+    def next_direction(self, col: int, row: int) -> int:
+        """
+        Returns the direction index to move in from (col, row), or -1 if the unit should stay.
+        """
+        return self.direction[col * self.topology.rows + row]
+
+    def distance_to_goal(self, col: int, row: int) -> int:
+        """
+        Returns the number of moves from (col, row) to the nearest goal, or -1 if none is reachable.
+        """
+        return self.distance[col * self.topology.rows + row]
+
+    def directions_array(self) -> "np.ndarray":
+        """
+        Returns the per-cell directions as an int8 NumPy view (no copy).
+        """
+        return np.frombuffer(self.direction, dtype=np.int8)
+
+class FlowFieldCache:
+    """
+    Shares flow fields between everyone heading for the same goal set. Fields stay valid
+    until the set of blocked cells changes.
+    """
+    def __init__(self, topology: HexTopology, max_fields: int = 32):
+        """
+        Args:
+            topology (HexTopology): Adjacency of the grid.
+            max_fields (int): Number of goal sets whose fields are kept; the oldest is dropped first.
+        """
+        self.topology = topology
+        self.max_fields = max_fields
+        self.blocked = frozenset()
+        self.fields = {}  # frozenset of goal cells -> FlowField, in insertion order
+
+    def get(self, goals) -> FlowField:
+        """
+        Returns the flow field for a set of goal cells, building it on first use.
+        """
+        goals = frozenset(goals)
+        field = self.fields.get(goals)
+        if field is None:
+            if len(self.fields) >= self.max_fields:
+                del self.fields[next(iter(self.fields))]
+            field = self.fields[goals] = FlowField(self.topology, goals, self.blocked)
+        return field
+
+    def set_blocked(self, cells):
+        """
+        Replaces the set of impassable cells, invalidating every cached field if it changed.
+        """
+        cells = frozenset(cells)
+        if cells != self.blocked:
+            self.blocked = cells
+            self.fields.clear()
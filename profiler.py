@@ -0,0 +1,111 @@
+import json
+import time
+from collections import deque
+
+class FrameProfiler:
+    """
+    Records high-resolution timings for each phase of every frame. Call begin_frame() at
+    the top of the loop, mark(phase) after each phase finishes and end_frame() at the bottom.
+    """
+    enabled = True
+
+    def __init__(self, history: int = 300, trace_frames: int = 10000):
+        """
+        Args:
+            history (int): Number of recent frames used for the rolling statistics.
+            trace_frames (int): Number of recent frames kept for trace export.
+        """
+        self.history = history
+        self.samples = {}  # phase -> deque of durations in nanoseconds
+        self.trace = deque(maxlen=trace_frames)  # Per frame: list of (phase, start_ns, duration_ns)
+        self.origin = time.perf_counter_ns()
+        self.frame = []
+        self.last = self.origin
+
+    def begin_frame(self):
+        self.frame = []
+        self.last = time.perf_counter_ns()
+
+    def mark(self, phase: str):
+        """
+        Ends the named phase, which started at the previous mark (or the start of the frame).
+        """
+        now = time.perf_counter_ns()
+        self.frame.append((phase, self.last, now - self.last))
+        self.last = now
+
+    def end_frame(self):
+        for phase, _, duration in self.frame:
+            self.sample(phase, duration)
+        self.trace.append(self.frame)
+
+    def sample(self, series: str, duration: int):
+        """
+        Adds one duration in nanoseconds to a series of the rolling statistics without
+        touching the frame, for work that runs several times per frame such as ticks.
+        """
+        samples = self.samples.get(series)
+        if samples is None:
+            samples = self.samples[series] = deque(maxlen=self.history)
+        samples.append(duration)
+
+    def stats(self) -> dict[str, tuple[float, float, float]]:
+        """
+        Returns the rolling (min, avg, p99) duration in milliseconds for each phase.
+        """
+        result = {}
+        for phase, samples in self.samples.items():
+            ordered = sorted(samples)
+            p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+            result[phase] = (ordered[0] / 1e6, sum(ordered) / len(ordered) / 1e6, p99 / 1e6)
+        return result
+
+    def draw_overlay(self, surface, font, position: tuple[int, int] = (10, 10)):
+        """
+        Draws one line of min/avg/p99 milliseconds per phase onto a Pygame surface.
+        """
+        x, y = position
+        for phase, (low, avg, p99) in self.stats().items():
+            text = font.render(f"{phase:>10}  min {low:6.2f}  avg {avg:6.2f}  p99 {p99:6.2f} ms", True, (0, 0, 0), (255, 255, 255))
+            surface.blit(text, (x, y))
+            y += text.get_height()
+
+    def export_chrome_trace(self, filename: str):
+        """
+        Writes the recorded frames as a Chrome trace (chrome://tracing, Perfetto) JSON file.
+        """
+        events = []
+        for frame in self.trace:
+            for phase, start, duration in frame:
+                events.append({
+                    "name": phase, "ph": "X", "pid": 1, "tid": 1,
+                    "ts": (start - self.origin) / 1000, "dur": duration / 1000,
+                })
+        with open(filename, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+class NullProfiler:
+    """
+    Stand-in used when profiling is disabled; every hook is an empty method.
+    """
+    enabled = False
+
+    def begin_frame(self):
+        pass
+
+    def mark(self, phase: str):
+        pass
+
+    def end_frame(self):
+        pass
+
+    def sample(self, series: str, duration: int):
+        pass
+
+    def draw_overlay(self, surface, font, position: tuple[int, int] = (10, 10)):
+        pass
+
+    def export_chrome_trace(self, filename: str):
+        pass
+
+NULL_PROFILER = NullProfiler()
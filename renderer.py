@@ -1,9 +1,28 @@
 import math
 import pygame
-from game_objects import Team, Unit, Tile
+from collections import OrderedDict
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the pixel buffer render path
+    np = None
+from game_objects import Unit, Tile, TileGrid, ChunkedTileGrid, AFFILIATION_COLORS, TEAM_CODES, CODE_TEAMS
 import gamelogic
 import json
 
+MIN_ZOOM = 0.05
+MAX_ZOOM = 4.0
+ZOOM_STEP = 1.1  # Zoom factor per mouse wheel notch
+PAN_SPEED = 1.0  # Screen pixels per millisecond while a pan key is held
+MIN_LABEL_SIZE = 12  # Hexes smaller than this are drawn without coordinate labels
+CHUNK_PIXELS = 512  # Target width of a cached map chunk, in pixels
+CHUNK_CACHE_MAX_PIXELS = 16_000_000  # Rendered chunks kept beyond the visible ones, least recently drawn dropped first
+UNIT_COLORS = (None, (0, 0, 255), (255, 0, 0))  # Indexed by team code
+HIGHLIGHT_COLORS = {"hovered": (255, 255, 0), "selected": (255, 128, 0)}
+ARROW_COLOR = (0, 255, 0)
+ARROW_HEAD_LENGTH = 10
+ARROW_PROGRESS_THICKNESS = 8
+ARROW_PROGRESS_STEPS = 16  # Move progress is drawn in this many increments so arrow sprites can be shared
+
 def load_config(filename):
     """
     Loads a JSON file and returns a dictionary of config values.
@@ -11,21 +30,330 @@ def load_config(filename):
     with open(filename, 'r') as f:
         return json.load(f)
 
+class Camera:
+    """
+    Pan offset and zoom of the map view. (x, y) is the screen position of the zoomed map's
+    top-left corner negated, so a map point p is drawn at p * zoom - (x, y).
+    """
+    def __init__(self, zoom: float = 1.0):
+        self.x = 0.0
+        self.y = 0.0
+        self.zoom = zoom
+
+    @property
+    def offset(self) -> tuple[float, float]:
+        return self.x, self.y
+
+    def pan(self, dx: float, dy: float):
+        self.x += dx
+        self.y += dy
+
+    def zoom_at(self, factor: float, screen_x: float, screen_y: float):
+        """
+        Multiplies the zoom by factor, keeping the map point under (screen_x, screen_y) in place.
+        """
+        zoom = min(max(self.zoom * factor, MIN_ZOOM), MAX_ZOOM)
+        ratio = zoom / self.zoom
+        self.x = (self.x + screen_x) * ratio - screen_x
+        self.y = (self.y + screen_y) * ratio - screen_y
+        self.zoom = zoom
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        Zooms on the mouse wheel and pans while the middle or right button is dragged.
+
+        Returns:
+            bool: True if the event moved the camera.
+        """
+        if event.type == pygame.MOUSEWHEEL:
+            mouse_x, mouse_y = pygame.mouse.get_pos()
+            self.zoom_at(ZOOM_STEP ** event.y, mouse_x, mouse_y)
+            return True
+        if event.type == pygame.MOUSEMOTION and (event.buttons[1] or event.buttons[2]):
+            self.pan(-event.rel[0], -event.rel[1])
+            return True
+        return False
+
+    def pan_with_keys(self, pressed, delta_time: float):
+        """
+        Pans with the arrow keys or WASD, scaled by the frame's delta_time in milliseconds.
+        """
+        step = PAN_SPEED * delta_time
+        dx = (pressed[pygame.K_RIGHT] or pressed[pygame.K_d]) - (pressed[pygame.K_LEFT] or pressed[pygame.K_a])
+        dy = (pressed[pygame.K_DOWN] or pressed[pygame.K_s]) - (pressed[pygame.K_UP] or pressed[pygame.K_w])
+        self.pan(dx * step, dy * step)
+
 class RenderController:
-    def __init__(self, screen: pygame.Surface, fps: int, hex_size: int, tiles: list[list[Tile]], units: list[Unit]):
+    def __init__(self, screen: pygame.Surface, fps: int, hex_size: int, tiles: list[list[Tile]], units: list[Unit],
+                 territory: "TerritoryTracker" = None, pixel_buffer: bool = False):
+        """
+        Args:
+            screen (pygame.Surface): The window surface.
+            fps (int): Target frame rate.
+            hex_size (int): Hex radius at zoom 1.
+            tiles (list[list[Tile]]): The grid to draw.
+            units (list[Unit]): The units to draw.
+            territory (TerritoryTracker, optional): Region and frontline metrics shown under the map.
+            pixel_buffer (bool): Paint the territory through a PixelMap of the view instead of
+                drawing hex polygons. Tile labels are not drawn on this path. Requires a TileGrid.
+
+        Raises:
+            ValueError: If pixel_buffer is requested without a TileGrid.
+        """
+        if pixel_buffer and not isinstance(tiles, TileGrid):
+            raise ValueError("The pixel buffer renderer needs a TileGrid.")
         self.screen = screen
         self.fps = fps
         self.hex_size = hex_size
         self.font = pygame.font.Font(None, int(hex_size / 2))
         self.tiles = tiles
         self.units = units
+        self.territory = territory  # Region and frontline metrics shown under the map, if tracked
+        self.status = None  # Extra text for the stats line, such as the simulation speed
+        self.camera = Camera()
+        self.label_fonts = {}  # Font size -> Font for tile labels at the current zoom
+        self.unit_sprites = UnitSprites()
+        # Rendered map chunks of a TileGrid, (chunk_col, chunk_row) -> surface, least recently drawn first
+        self.chunk_surfaces = OrderedDict()
+        self.chunk_pixels = 0  # Total pixels of the surfaces in chunk_surfaces
+        self.neutral_chunks = {}  # (cols, rows) -> shared surface for untouched chunks of a ChunkedTileGrid
+        self.chunk_size_drawn = None  # Hex size the chunk surfaces were drawn at
+        self.chunk_span = None  # Tile columns and rows per chunk at that size
+        self.pixel_buffer = pixel_buffer
+        self.pixel_map = None  # PixelMap of the current view, rebuilt when the view changes
+        self.hovered = None  # (col, row) under the mouse
+        self.selected = None  # (col, row) last clicked
+
+    def label_font(self, size: float):
+        """
+        Returns the tile label font for a hex size, or None when labels would be unreadable.
+        """
+        if size < MIN_LABEL_SIZE:
+            return None
+        font_size = int(size / 2)
+        font = self.label_fonts.get(font_size)
+        if font is None:
+            font = self.label_fonts[font_size] = pygame.font.Font(None, font_size)
+        return font
+
+    def current_pixel_map(self) -> "PixelMap":
+        """
+        Returns the PixelMap for the current zoom and window size, rebuilding it if either
+        changed. Panning reuses it.
+        """
+        size = self.hex_size * self.camera.zoom
+        key = (self.tiles.cols, self.tiles.rows, size, self.screen.get_size())
+        if self.pixel_map is None or self.pixel_map.key != key:
+            self.pixel_map = PixelMap(*key)
+        return self.pixel_map
+
+    def tile_at(self, x: int, y: int) -> tuple[int, int] | None:
+        """
+        Returns the (col, row) of the tile under screen pixel (x, y), or None off the map.
+        """
+        if self.pixel_buffer:
+            return self.current_pixel_map().tile_at(x, y, self.camera.offset)
+        size = self.hex_size * self.camera.zoom
+        col, row = pixel_to_tile(x + self.camera.x, y + self.camera.y, size)
+        if 0 <= col < self.tiles.cols and 0 <= row < self.tiles.rows:
+            return col, row
+        return None
+
+    def handle_event(self, event: pygame.event.Event) -> bool:
+        """
+        Updates the hovered tile on mouse motion and the selected tile on a left click.
+
+        Returns:
+            bool: True if the event was a hover or selection event.
+        """
+        if event.type == pygame.MOUSEMOTION:
+            self.hovered = self.tile_at(*event.pos)
+            return True
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.selected = self.tile_at(*event.pos)
+            return True
+        return False
+
+    def draw_highlights(self, size: float, offset: tuple[float, float]):
+        for name, tile in (("hovered", self.hovered), ("selected", self.selected)):
+            if tile is not None:
+                center_x, center_y = get_hex_center(tile[0], tile[1], size)
+                corners = hex_corners(center_x - offset[0], center_y - offset[1], size)
+                pygame.draw.polygon(self.screen, HIGHLIGHT_COLORS[name], corners, width=2)
 
     def draw_map(self):
+        size = self.hex_size * self.camera.zoom
+        offset = self.camera.offset
+        if self.pixel_buffer:
+            self.current_pixel_map().draw(self.screen, self.tiles, offset)
+            self.draw_units_and_stats(size, offset)
+            return
         self.screen.fill((255, 255, 255))  # White background
-        draw_tiles(self.screen, self.tiles, self.hex_size, self.font)
-        draw_units(self.screen, self.units, self.hex_size)
-        render_affiliation_stats(self.screen, self.tiles, self.font, (1500, 1000))
-        
+        if isinstance(self.tiles, TileGrid):
+            self.draw_chunks(size, offset)
+        else:
+            draw_tiles(self.screen, self.tiles, size, self.label_font(size), offset)
+        self.draw_units_and_stats(size, offset)
+
+    def draw_units_and_stats(self, size: float, offset: tuple[float, float]):
+        self.draw_highlights(size, offset)
+        draw_units(self.screen, self.units, size, offset, self.unit_sprites)
+        lines = 1 if self.territory is None else 2
+        render_affiliation_stats(self.screen, self.tiles, self.font,
+                                 (10, self.screen.get_height() - lines * self.font.get_linesize() - 10), self.territory,
+                                 self.status)
+
+    def show_snapshot(self, snapshot: "FrameSnapshot"):
+        """
+        Draws a simulation thread's FrameSnapshot from now on. The renderer must have been
+        created with its own TileGrid, which mirrors the snapshot's tile affiliations. Only
+        the tiles the snapshot lists as changed are written, keeping the counts running.
+        """
+        if snapshot.codes is not None:
+            self.tiles.load_codes(snapshot.codes)
+        elif snapshot.changes:
+            if np is not None:
+                self.tiles.assign_codes(np.fromiter(snapshot.changes.keys(), dtype=np.intp, count=len(snapshot.changes)),
+                                        np.fromiter(snapshot.changes.values(), dtype=np.int8, count=len(snapshot.changes)))
+            else:
+                rows = self.tiles.rows
+                for cell, code in snapshot.changes.items():
+                    self.tiles.set_affiliation(cell // rows, cell % rows, CODE_TEAMS[code])
+        self.units = snapshot.units
+        self.territory = snapshot.territory
+
+    def draw_chunks(self, size: float, offset: tuple[float, float]):
+        """
+        Draws a TileGrid from rendered chunks of chunk_span() x chunk_span() tiles. Only
+        chunks in view are rendered, so a zoom step costs the visible tiles rather than the
+        whole map, and panning reuses them. Changed tiles are repainted into their chunk's
+        surface if it is cached. Untouched chunks of a ChunkedTileGrid share one surface
+        while tiles are too small to be labelled.
+        """
+        tiles = self.tiles
+        tiles.enable_dirty_tracking()
+        if self.chunk_size_drawn != size:
+            self.chunk_surfaces.clear()
+            self.chunk_pixels = 0
+            self.neutral_chunks.clear()
+            self.chunk_size_drawn = size
+            self.chunk_span = chunk_span(size)
+            tiles.pop_dirty()
+        else:
+            for col, row in tiles.pop_dirty():
+                self.redraw_tile(col, row)
+
+        col_start, col_end, row_start, row_end = visible_tile_range(
+            tiles.cols, tiles.rows, size, offset, self.screen.get_size())
+        if col_start == col_end or row_start == row_end:
+            return
+        span = self.chunk_span
+        blits = []
+        for chunk_col in range(col_start // span, (col_end - 1) // span + 1):
+            for chunk_row in range(row_start // span, (row_end - 1) // span + 1):
+                origin_x, origin_y = chunk_pixel_origin(chunk_col, chunk_row, span, size)
+                blits.append((self.chunk_surface(chunk_col, chunk_row, size),
+                              (origin_x - int(offset[0]), origin_y - int(offset[1]))))
+        self.screen.blits(blits, doreturn=False)
+        # Chunks drawn this frame sit at the end of the LRU, so they are never dropped
+        while self.chunk_pixels > CHUNK_CACHE_MAX_PIXELS and len(self.chunk_surfaces) > len(blits):
+            _, surface = self.chunk_surfaces.popitem(last=False)
+            self.chunk_pixels -= surface.get_width() * surface.get_height()
+
+    def chunk_surface(self, chunk_col: int, chunk_row: int, size: float) -> pygame.Surface:
+        """
+        Returns a chunk's rendered tiles, drawn relative to chunk_pixel_origin().
+        """
+        key = (chunk_col, chunk_row)
+        surface = self.chunk_surfaces.get(key)
+        if surface is not None:
+            self.chunk_surfaces.move_to_end(key)
+            return surface
+        if self.label_font(size) is None and self.is_neutral_chunk(chunk_col, chunk_row):
+            extent = self.chunk_extent(chunk_col, chunk_row)
+            surface = self.neutral_chunks.get(extent)
+            if surface is None:
+                surface = self.neutral_chunks[extent] = self.render_chunk(chunk_col, chunk_row, size)
+            return surface
+        surface = self.chunk_surfaces[key] = self.render_chunk(chunk_col, chunk_row, size)
+        self.chunk_pixels += surface.get_width() * surface.get_height()
+        return surface
+
+    def chunk_extent(self, chunk_col: int, chunk_row: int) -> tuple[int, int]:
+        """
+        Returns how many (cols, rows) of a chunk lie inside the map; edge chunks are partial.
+        """
+        span = self.chunk_span
+        return min(span, self.tiles.cols - chunk_col * span), min(span, self.tiles.rows - chunk_row * span)
+
+    def is_neutral_chunk(self, chunk_col: int, chunk_row: int) -> bool:
+        """
+        Returns True if a chunk lies entirely in unallocated chunks of a ChunkedTileGrid.
+        """
+        tiles = self.tiles
+        if not isinstance(tiles, ChunkedTileGrid):
+            return False
+        span = self.chunk_span
+        width, height = self.chunk_extent(chunk_col, chunk_row)
+        col, row = chunk_col * span, chunk_row * span
+        return not any(grid_col * tiles.chunk_rows + grid_row in tiles.chunks
+                       for grid_col in range(col // tiles.chunk_size, (col + width - 1) // tiles.chunk_size + 1)
+                       for grid_row in range(row // tiles.chunk_size, (row + height - 1) // tiles.chunk_size + 1))
+
+    def render_chunk(self, chunk_col: int, chunk_row: int, size: float) -> pygame.Surface:
+        span = self.chunk_span
+        width, height = self.chunk_extent(chunk_col, chunk_row)
+        pixel_width, pixel_height = map_pixel_size(width, height, size)
+        surface = pygame.Surface((pixel_width + 1, pixel_height + 1), pygame.SRCALPHA)
+        self.paint_tiles(surface, [(col, row) for col in range(chunk_col * span, chunk_col * span + width)
+                                   for row in range(chunk_row * span, chunk_row * span + height)],
+                         chunk_pixel_origin(chunk_col, chunk_row, span, size), size)
+        return surface
+
+    def paint_tiles(self, surface: pygame.Surface, tiles: list[tuple[int, int]], origin: tuple[int, int], size: float):
+        """
+        Paints tiles into a chunk surface whose top-left is map pixel `origin`: every fill
+        first, then the outlines, then the labels, so a repaint of a few tiles in the same
+        order reproduces the chunk exactly.
+        """
+        polygons = [tile_polygon(col, row, size, origin) for col, row in tiles]
+        for (col, row), corners in zip(tiles, polygons):
+            pygame.draw.polygon(surface, AFFILIATION_COLORS[self.tiles.get_code(col, row)], corners)
+        for corners in polygons:
+            pygame.draw.polygon(surface, (0, 0, 0), corners, width=1)
+        font = self.label_font(size)
+        if font is not None:
+            for col, row in tiles:
+                center_x, center_y = get_hex_center(col, row, size)
+                text = font.render(f"({col}, {row})", True, (0, 0, 0))
+                surface.blit(text, text.get_rect(center=(center_x - origin[0], center_y - origin[1])))
+
+    def redraw_tile(self, col: int, row: int):
+        """
+        Repaints one tile in its cached chunk surface, if there is one. The tile's bounding
+        rect is cleared and every hex of the chunk reaching into it is painted again in
+        paint_tiles()'s order, so the old fill leaves no trace on shared edges and vertices.
+        """
+        span = self.chunk_span
+        key = (col // span, row // span)
+        surface = self.chunk_surfaces.get(key)
+        if surface is None:
+            return
+        size = self.chunk_size_drawn
+        origin = chunk_pixel_origin(key[0], key[1], span, size)
+        rows = self.tiles.rows
+        topology = gamelogic.topology_for(self.tiles, rows, self.tiles.cols)
+        cell = col * rows + row
+        neighborhood = [divmod(other, rows) for other in sorted([cell] + topology.neighbors_of(cell))]
+        corners = tile_polygon(col, row, size, origin)
+        xs = [x for x, _ in corners]
+        ys = [y for _, y in corners]
+        surface.set_clip(pygame.Rect(min(xs), min(ys), max(xs) - min(xs) + 1, max(ys) - min(ys) + 1))
+        surface.fill((0, 0, 0, 0))
+        self.paint_tiles(surface, [(other_col, other_row) for other_col, other_row in neighborhood
+                                   if (other_col // span, other_row // span) == key], origin, size)
+        surface.set_clip(None)
+
 def hex_corners(center_x, center_y, size):
     """
     Returns the list of (x, y) corner coordinates for a pointy-top hex
@@ -73,103 +401,367 @@ def get_hex_center(col: int, row: int, size: float) -> tuple[float, float]:
     center_y = offset_y + size
     return center_x, center_y
 
-def draw_tiles(surface: pygame.Surface, tiles: list[list[Tile]], size: float, font: pygame.font.Font) -> None:
+def map_pixel_size(cols: int, rows: int, size: float) -> tuple[int, int]:
+    """
+    Returns the (width, height) in pixels needed to draw a whole cols x rows map at a hex size.
+    """
+    return math.ceil(math.sqrt(3) * size * cols + size) + 1, math.ceil(1.5 * size * rows + 0.5 * size) + 1
+
+def chunk_span(size: float) -> int:
+    """
+    Returns the tile columns and rows in a cached map chunk at a hex size, so a chunk is
+    about CHUNK_PIXELS wide. Always even, so every chunk starts on an even row.
+    """
+    return max(2, min(64, 2 * round(CHUNK_PIXELS / (2 * math.sqrt(3) * size))))
+
+def chunk_pixel_origin(chunk_col: int, chunk_row: int, span: int, size: float) -> tuple[int, int]:
+    """
+    Returns the whole map pixel at the top-left of a chunk's surface.
+    """
+    return math.floor(math.sqrt(3) * size * chunk_col * span), math.floor(1.5 * size * chunk_row * span)
+
+def tile_polygon(col: int, row: int, size: float, origin: tuple[int, int] = (0, 0)) -> list[tuple[int, int]]:
+    """
+    Returns a hex's corners on whole pixels, relative to map pixel `origin`. Corners are
+    rounded in map coordinates, so tiles from neighboring chunks meet exactly.
+    """
+    center_x, center_y = get_hex_center(col, row, size)
+    return [(int(x) - origin[0], int(y) - origin[1]) for x, y in hex_corners(center_x, center_y, size)]
+
+def visible_tile_range(cols: int, rows: int, size: float, offset: tuple[float, float],
+                       view_size: tuple[int, int]) -> tuple[int, int, int, int]:
     """
-    Draws a 2D list of Tile objects on the given surface.
+    Returns the half-open (col_start, col_end, row_start, row_end) range of tiles that may
+    overlap a view, by inverting the odd-r layout of get_hex_center. The range errs by at
+    most one tile on the generous side.
 
     Args:
-        surface (pygame.Surface): The Pygame surface to draw on.
-        tiles (list[list[Tile]]): A 2D list of Tile objects.
-        size (float): Radius of the hex tile.
-        font (pygame.font.Font): Pygame font for rendering the tile coordinates.
+        cols (int): Number of map columns.
+        rows (int): Number of map rows.
+        size (float): Radius of the hex at the current zoom.
+        offset (tuple[float, float]): Map pixel drawn at the view's top-left corner.
+        view_size (tuple[int, int]): (width, height) of the view in pixels.
     """
-    for row_of_tiles in tiles:
-        for tile in row_of_tiles:
-            # Determine the hex center based on tile's col and row
-            center_x, center_y = get_hex_center(tile.col, tile.row, size)
+    width = math.sqrt(3) * size
+    col_start = max(0, math.floor((offset[0] - size) / width) - 1)
+    col_end = min(cols, math.floor((offset[0] + view_size[0] - size) / width) + 2)
+    row_start = max(0, math.floor((offset[1] - 2 * size) / (1.5 * size)))
+    row_end = min(rows, math.floor((offset[1] + view_size[1]) / (1.5 * size)) + 1)
+    return col_start, max(col_start, col_end), row_start, max(row_start, row_end)
 
-            fill_color = tile.get_affiliation_color()
+def draw_tiles(surface: pygame.Surface, tiles: list[list[Tile]], size: float, font: pygame.font.Font,
+               offset: tuple[float, float] = (0, 0)) -> None:
+    """
+    Draws the Tile objects that fall inside the surface.
 
-            # Draw the hex
+    Args:
+        surface (pygame.Surface): The Pygame surface to draw on.
+        tiles (list[list[Tile]]): A 2D list of Tile objects, indexed [col][row].
+        size (float): Radius of the hex tile.
+        font (pygame.font.Font): Pygame font for rendering the tile coordinates, or None to skip them.
+        offset (tuple[float, float]): Map pixel drawn at the surface's top-left corner.
+    """
+    if isinstance(tiles, TileGrid):
+        cols, rows = tiles.cols, tiles.rows
+    else:
+        cols, rows = len(tiles), len(tiles[0]) if tiles else 0
+    col_start, col_end, row_start, row_end = visible_tile_range(cols, rows, size, offset, surface.get_size())
+    for col in range(col_start, col_end):
+        for row in range(row_start, row_end):
+            center_x, center_y = get_hex_center(col, row, size)
+            center_x -= offset[0]
+            center_y -= offset[1]
+            if isinstance(tiles, TileGrid):
+                # Read affiliation codes straight from the grid instead of creating Tile views
+                fill_color = AFFILIATION_COLORS[tiles.get_code(col, row)]
+            else:
+                fill_color = tiles[col][row].get_affiliation_color()
             draw_hex(surface, center_x, center_y, size, fill_color)
 
             # Optionally render the coordinates on top
-            text = font.render(f"({tile.col}, {tile.row})", True, (0, 0, 0))
-            text_rect = text.get_rect(center=(center_x, center_y))
-            surface.blit(text, text_rect)
+            if font is not None:
+                text = font.render(f"({col}, {row})", True, (0, 0, 0))
+                surface.blit(text, text.get_rect(center=(center_x, center_y)))
 
-def draw_units(surface: pygame.Surface, units: list[Unit], size: float) -> None:
+def pixel_to_tile(x: float, y: float, size: float) -> tuple[int, int]:
+    """
+    Returns the (col, row) of the hex containing map pixel (x, y), inverting the odd-r layout
+    of get_hex_center. The result may lie outside the map.
+    """
+    x -= size
+    y -= size
+    q = (math.sqrt(3) / 3 * x - y / 3) / size
+    r = 2 / 3 * y / size
+    # Round the fractional cube coordinates (q, r, -q - r) to the nearest hex
+    rq, rr, rs = round(q), round(r), round(-q - r)
+    dq, dr, ds = abs(rq - q), abs(rr - r), abs(rs + q + r)
+    if dq > dr and dq > ds:
+        rq = -rr - rs
+    elif dr > ds:
+        rr = -rq - rs
+    return rq + (rr - (rr & 1)) // 2, rr
+
+class PixelMap:
+    """
+    Maps screen pixels to the tile under them for one hex size and view size, so the
+    territory can be painted with a single palette gather per frame instead of one
+    polygon per tile, and the tile under the mouse is a single array lookup.
+
+    The odd-r layout repeats every column and every second row, so the lookup is built
+    once, as tile offsets for a patch one period larger than the view, and panning only
+    moves the window into it. Each frame gathers the codes of the visible tiles alone;
+    hex outlines are a cached mask over the same patch.
+    """
+    def __init__(self, cols: int, rows: int, size: float, view_size: tuple[int, int]):
+        """
+        Args:
+            cols (int): Number of map columns.
+            rows (int): Number of map rows.
+            size (float): Radius of the hex at the current zoom.
+            view_size (tuple[int, int]): (width, height) of the view in pixels.
+        """
+        if np is None:
+            raise ImportError("The pixel buffer renderer requires NumPy to be installed.")
+        self.key = (cols, rows, size, view_size)
+        self.cols = cols
+        self.rows = rows
+        self.size = size
+        self.view_size = view_size
+        self.col_width = math.sqrt(3) * size
+        self.pair_height = 3 * size  # Height of two rows, after which the layout repeats
+        self.palette = AFFILIATION_COLORS + ((255, 255, 255), (0, 0, 0))  # Codes, background, outline
+        # Patch pixel (i, j) is map pixel (i - 1, j - 1): one leading pixel for the outline test
+        width = view_size[0] + math.ceil(self.col_width) + 2
+        height = view_size[1] + math.ceil(self.pair_height) + 2
+        x = np.arange(width, dtype=np.float64)[:, None] - 1 - size
+        y = np.arange(height, dtype=np.float64)[None, :] - 1 - size
+        q = (math.sqrt(3) / 3 * x - y / 3) / size
+        r = np.broadcast_to(2 / 3 * y / size, q.shape)
+        s = -q - r
+        rq, rr, rs = np.rint(q), np.rint(r), np.rint(s)
+        dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+        fix_q = (dq > dr) & (dq > ds)
+        fix_r = ~fix_q & (dr > ds)
+        rq = np.where(fix_q, -rr - rs, rq).astype(np.int64)
+        rr = np.where(fix_r, -rq - rs, rr).astype(np.int64)
+        # (width, height) tile under each pixel, matching pygame.surfarray's (x, y) order
+        self.patch_col = (rq + (rr - (rr & 1)) // 2).astype(np.int32)
+        self.patch_row = rr.astype(np.int32)
+        # Every tile the patch touches gets a slot in a per-frame block of codes
+        self.first_col, self.first_row = int(self.patch_col.min()), int(self.patch_row.min())
+        self.block_shape = (int(self.patch_col.max()) - self.first_col + 1, int(self.patch_row.max()) - self.first_row + 1)
+        self.patch_slot = (self.patch_col - self.first_col) * self.block_shape[1] + (self.patch_row - self.first_row)
+        self.patch_edge = np.zeros(self.patch_slot.shape, dtype=bool)
+        self.patch_edge[1:, :] |= self.patch_slot[1:, :] != self.patch_slot[:-1, :]
+        self.patch_edge[:, 1:] |= self.patch_slot[:, 1:] != self.patch_slot[:, :-1]
+
+    def _anchor(self, offset: tuple[float, float]) -> tuple[int, int, int, int]:
+        """
+        Returns the (col, row) shift that moves the patch under the view, and the patch
+        pixel of the view's top-left corner. Rows shift in pairs to keep the layout.
+        """
+        col = math.floor(offset[0] / self.col_width)
+        row = 2 * math.floor(offset[1] / self.pair_height)
+        return col, row, int(offset[0] - col * self.col_width) + 1, int(offset[1] - row * 1.5 * self.size) + 1
+
+    def draw(self, surface: pygame.Surface, tiles: TileGrid, offset: tuple[float, float]):
+        """
+        Paints the territory and outlines onto a surface the size of the view.
+
+        Args:
+            surface (pygame.Surface): Surface the size of the view.
+            tiles (TileGrid): The grid to paint. Only the codes of tiles under the patch are read.
+            offset (tuple[float, float]): Map pixel drawn at the view's top-left corner.
+        """
+        width, height = self.view_size
+        shift_col, shift_row, x, y = self._anchor(offset)
+        # Codes of the tiles under the patch, background (3) where they lie off the map
+        block = np.full(self.block_shape, 3, dtype=np.int8)
+        col_start = shift_col + self.first_col
+        row_start = shift_row + self.first_row
+        cols = np.arange(max(col_start, 0), min(col_start + self.block_shape[0], self.cols))
+        rows = np.arange(max(row_start, 0), min(row_start + self.block_shape[1], self.rows))
+        if len(cols) and len(rows):
+            cells = (cols[:, None] * self.rows + rows[None, :]).reshape(-1)
+            block[cols[0] - col_start:cols[-1] - col_start + 1, rows[0] - row_start:rows[-1] - row_start + 1] = \
+                tiles.get_codes(cells).reshape(len(cols), len(rows))
+
+        # The view plus a leading pixel column and row, so outlines along the map's edge are kept
+        codes = np.take(block.reshape(-1), self.patch_slot[x - 1:x + width, y - 1:y + height])
+        inside = codes != 3
+        paint = codes[1:, 1:]
+        paint[self.patch_edge[x:x + width, y:y + height] & (inside[1:, 1:] | inside[:-1, 1:] | inside[1:, :-1])] = 4
+        palette = np.array([surface.map_rgb(color) for color in self.palette], dtype=np.uint32)
+        pygame.surfarray.blit_array(surface, np.take(palette, paint))
+
+    def tile_at(self, x: int, y: int, offset: tuple[float, float]) -> tuple[int, int] | None:
+        """
+        Returns the (col, row) of the tile under screen pixel (x, y), or None off the map.
+        """
+        width, height = self.view_size
+        if not (0 <= x < width and 0 <= y < height):
+            return None
+        shift_col, shift_row, patch_x, patch_y = self._anchor(offset)
+        col = int(self.patch_col[patch_x + x, patch_y + y]) + shift_col
+        row = int(self.patch_row[patch_x + x, patch_y + y]) + shift_row
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return col, row
+        return None
+
+class UnitSprites:
+    """
+    Pre-rendered unit glyphs, stack count badges and move arrows for one hex size, kept
+    across frames so draw_units() can hand a whole frame to a single Surface.blits call.
+    """
+    def __init__(self):
+        self.size = None
+        self.glyphs = {}  # Team mask (1 blue, 2 red, 3 both) -> square glyph
+        self.badges = {}  # Stack count -> rendered count
+        self.arrows = {}  # (dx, dy, progress step) -> (sprite, start point within the sprite)
+        self.badge_font = None
+
+    def prepare(self, size: float):
+        """
+        Drops every cached sprite if the hex size changed since the last frame.
+        """
+        if size == self.size:
+            return
+        self.size = size
+        self.glyphs.clear()
+        self.badges.clear()
+        self.arrows.clear()
+        self.badge_font = pygame.font.Font(None, max(int(size / 2), 8)) if size >= MIN_LABEL_SIZE else None
+
+    def glyph(self, mask: int) -> pygame.Surface:
+        sprite = self.glyphs.get(mask)
+        if sprite is None:
+            side = max(int(self.size), 1)
+            sprite = self.glyphs[mask] = pygame.Surface((side, side))
+            if mask == 3:  # Both teams share the tile: split the square
+                sprite.fill(UNIT_COLORS[1], (0, 0, side // 2, side))
+                sprite.fill(UNIT_COLORS[2], (side // 2, 0, side - side // 2, side))
+            else:
+                sprite.fill(UNIT_COLORS[mask])
+        return sprite
+
+    def badge(self, count: int) -> pygame.Surface:
+        sprite = self.badges.get(count)
+        if sprite is None:
+            sprite = self.badges[count] = self.badge_font.render(str(count), True, (0, 0, 0), (255, 255, 255))
+        return sprite
+
+    def arrow(self, dx: int, dy: int, step: int) -> tuple[pygame.Surface, tuple[int, int]]:
+        """
+        Returns the arrow sprite for a move spanning (dx, dy) pixels whose progress is
+        step / ARROW_PROGRESS_STEPS, and where the move's start lies within the sprite.
+        """
+        key = (dx, dy, step)
+        cached = self.arrows.get(key)
+        if cached is not None:
+            return cached
+        margin = ARROW_HEAD_LENGTH + ARROW_PROGRESS_THICKNESS
+        start = (margin + max(0, -dx), margin + max(0, -dy))
+        target = (start[0] + dx, start[1] + dy)
+        sprite = pygame.Surface((abs(dx) + 2 * margin + 1, abs(dy) + 2 * margin + 1), pygame.SRCALPHA)
+
+        # Draw a thin arrow line from the start to the target.
+        pygame.draw.line(sprite, ARROW_COLOR, start, target, 2)
+
+        # Draw a thick line from the start to the current progress tip.
+        progress = step / ARROW_PROGRESS_STEPS
+        tip = (int(start[0] + dx * progress), int(start[1] + dy * progress))
+        pygame.draw.line(sprite, ARROW_COLOR, start, tip, ARROW_PROGRESS_THICKNESS)
+
+        # --- Draw the arrow head at the target ---
+        angle = math.atan2(dy, dx)
+        offset_angle = math.pi / 6  # 30 degrees offset
+        for head_angle in (angle + offset_angle, angle - offset_angle):
+            point = (target[0] - ARROW_HEAD_LENGTH * math.cos(head_angle),
+                     target[1] - ARROW_HEAD_LENGTH * math.sin(head_angle))
+            pygame.draw.line(sprite, ARROW_COLOR, target, (int(point[0]), int(point[1])), 2)
+        cached = self.arrows[key] = (sprite, start)
+        return cached
+
+def draw_units(surface: pygame.Surface, units: list[Unit], size: float, offset: tuple[float, float] = (0, 0),
+               sprites: UnitSprites = None) -> None:
+    """
+    Draws units with one glyph per occupied tile, a count badge on stacks, and one arrow
+    per distinct in-flight move, all submitted in a single Surface.blits call. Moving
+    units are counted on their start tile until the move completes.
+
+    Args:
+        surface (pygame.Surface): The Pygame surface to draw on.
+        units (list[Unit]): Units to draw.
+        size (float): Radius of the hex tile.
+        offset (tuple[float, float]): Map pixel drawn at the surface's top-left corner.
+        sprites (UnitSprites, optional): Sprite cache to reuse across frames.
+    """
+    if sprites is None:
+        sprites = UnitSprites()
+    sprites.prepare(size)
+
+    stacks = {}  # (col, row) -> [unit count, team mask]
+    moves = set()  # (start tile, target tile, progress step), one arrow each
     for unit in units:
-        color = (0, 0, 255) if unit.team == Team.BLUE else (255, 0, 0)
         if unit.is_moving:
-            # Determine the center positions of the starting and target hexes.
-            start_center = get_hex_center(unit.start_tile[0], unit.start_tile[1], size)
-            target_center = get_hex_center(unit.target_tile[0], unit.target_tile[1], size)
-            
-            # Draw the unit's rectangle at its starting position.
-            pygame.draw.rect(surface, color, 
-                             (int(start_center[0]) - int(size/2), int(start_center[1]) - int(size/2), 
-                              int(size), int(size)))
-            
-            # Define arrow color as green.
-            arrow_color = (0, 255, 0)
-            
-            # Draw a thin arrow line from the start to the target.
-            pygame.draw.line(surface, arrow_color, 
-                             (int(start_center[0]), int(start_center[1])), 
-                             (int(target_center[0]), int(target_center[1])), 2)
-            
-            # Calculate the progress tip based on move_progress.
-            progress_tip_x = start_center[0] + (target_center[0] - start_center[0]) * unit.move_progress
-            progress_tip_y = start_center[1] + (target_center[1] - start_center[1]) * unit.move_progress
-            
-            # Draw a thick line from the start to the current progress tip.
-            progress_line_thickness = 8  # Adjust thickness as needed.
-            pygame.draw.line(surface, arrow_color, 
-                             (int(start_center[0]), int(start_center[1])), 
-                             (int(progress_tip_x), int(progress_tip_y)), 
-                             progress_line_thickness)
-            
-            # --- Draw the arrow head at the target ---
-            # Compute the angle from start to target.
-            dx = target_center[0] - start_center[0]
-            dy = target_center[1] - start_center[1]
-            angle = math.atan2(dy, dx)
-            arrow_head_length = 10  # Length of the arrowhead lines.
-            # Set angles for the arrowhead (adjust the offset angle as desired).
-            offset_angle = math.pi / 6  # 30 degrees offset
-            left_angle = angle + offset_angle
-            right_angle = angle - offset_angle
-            left_point = (target_center[0] - arrow_head_length * math.cos(left_angle),
-                          target_center[1] - arrow_head_length * math.sin(left_angle))
-            right_point = (target_center[0] - arrow_head_length * math.cos(right_angle),
-                           target_center[1] - arrow_head_length * math.sin(right_angle))
-            pygame.draw.line(surface, arrow_color, (int(target_center[0]), int(target_center[1])),
-                             (int(left_point[0]), int(left_point[1])), 2)
-            pygame.draw.line(surface, arrow_color, (int(target_center[0]), int(target_center[1])),
-                             (int(right_point[0]), int(right_point[1])), 2)
+            tile = unit.start_tile
+            moves.add((tile, unit.target_tile, int(unit.move_progress * ARROW_PROGRESS_STEPS)))
         else:
-            # For units that are not moving, draw them at their current grid center.
-            center = get_hex_center(unit.col, unit.row, size)
-            pygame.draw.rect(surface, color, 
-                             (int(center[0]) - int(size/2), int(center[1]) - int(size/2), 
-                              int(size), int(size)))
+            tile = (unit.col, unit.row)
+        stack = stacks.get(tile)
+        if stack is None:
+            stacks[tile] = [1, TEAM_CODES[unit.team]]
+        else:
+            stack[0] += 1
+            stack[1] |= TEAM_CODES[unit.team]
+
+    # Stacks and moves whose hexes lie entirely outside this box cannot touch the surface
+    view_width, view_height = surface.get_size()
+    left, top = offset[0] - 2 * size, offset[1] - 2 * size
+    right, bottom = offset[0] + view_width + 2 * size, offset[1] + view_height + 2 * size
+    half = int(size / 2)
+    blits = []
+    for (col, row), (count, mask) in stacks.items():
+        center_x, center_y = get_hex_center(col, row, size)
+        if not (left <= center_x <= right and top <= center_y <= bottom):
+            continue
+        glyph = sprites.glyph(mask)
+        x = int(center_x - offset[0]) - half
+        y = int(center_y - offset[1]) - half
+        blits.append((glyph, (x, y)))
+        if count > 1 and sprites.badge_font is not None:
+            badge = sprites.badge(count)
+            blits.append((badge, (x + glyph.get_width() - badge.get_width(), y + glyph.get_height() - badge.get_height())))
 
+    for start_tile, target_tile, step in moves:
+        start_x, start_y = get_hex_center(start_tile[0], start_tile[1], size)
+        if not (left <= start_x <= right and top <= start_y <= bottom):
+            continue  # Neighbouring targets are within one hex, so the arrow is off screen too
+        target_x, target_y = get_hex_center(target_tile[0], target_tile[1], size)
+        start_x, start_y = int(start_x - offset[0]), int(start_y - offset[1])
+        sprite, anchor = sprites.arrow(int(target_x - offset[0]) - start_x, int(target_y - offset[1]) - start_y, step)
+        blits.append((sprite, (start_x - anchor[0], start_y - anchor[1])))
+    surface.blits(blits, doreturn=False)
 
 def render_affiliation_stats(
     surface: pygame.Surface, 
     tiles: list[list[Tile]], 
     font: pygame.font.Font,
-    position: tuple[int, int] = (10, 10)
+    position: tuple[int, int] = (10, 10),
+    territory: "TerritoryTracker" = None,
+    status: str = None
 ):
     """
-    Renders the affiliation stats (percentages) onto the provided Pygame surface.
+    Renders the affiliation stats (percentages) onto the provided Pygame surface, followed
+    by a line of region and frontline metrics when a TerritoryTracker is given.
 
     Args:
         surface (pygame.Surface): The surface to draw on (typically the screen).
         stats (dict[str, float]): A dictionary like {"blue": 40.0, "red": 35.0, "none": 25.0}.
         font (pygame.font.Font): A Pygame Font object for rendering text.
         position (tuple[int, int]): The (x, y) position where text should start.
+        territory (TerritoryTracker, optional): Source of the region and frontline line.
+        status (str, optional): Text appended to the percentages, such as the simulation speed.
     """
     stats = gamelogic.calculate_tile_affiliation_percentages(tiles)
 
@@ -178,5 +770,18 @@ def render_affiliation_stats(
         f"Red: {stats['red']:.2f}%  |  "
         f"None: {stats['none']:.2f}%"
     )
+    if status:
+        text_str += f"  |  {status}"
     text_surface = font.render(text_str, True, (0, 0, 0))  # Render in black
-    surface.blit(text_surface, position)  # Blit at the specified (x, y)
\ No newline at end of file
+    surface.blit(text_surface, position)  # Blit at the specified (x, y)
+    if territory is None:
+        return
+
+    regions = territory.get_stats()
+    text_str = (
+        f"Blue regions: {regions['blue']['regions']} (largest {regions['blue']['largest']})  |  "
+        f"Red regions: {regions['red']['regions']} (largest {regions['red']['largest']})  |  "
+        f"Frontline: {regions['frontline']} tiles"
+    )
+    text_surface = font.render(text_str, True, (0, 0, 0))
+    surface.blit(text_surface, (position[0], position[1] + font.get_linesize()))
\ No newline at end of file
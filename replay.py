@@ -0,0 +1,89 @@
+import argparse
+import sys
+import pygame
+import initialization
+import renderer
+from event_log import EventLogReader, ReplayState
+
+class ReplayPlayer:
+    """
+    Plays an event log back through a RenderController at an adjustable speed.
+    """
+    def __init__(self, render_controller: renderer.RenderController, state: ReplayState, speed: float = 1.0):
+        """
+        Args:
+            render_controller (RenderController): Renderer drawing the replayed tiles and units.
+            state (ReplayState): The replay state; its tiles and units must be the ones the renderer draws.
+            speed (float): Simulated milliseconds played per real millisecond.
+        """
+        self.render_controller = render_controller
+        self.state = state
+        self.speed = speed
+        self.paused = False
+        self.playback_time = state.time
+
+    def advance(self, real_delta: int):
+        """
+        Moves playback forward by real_delta real milliseconds, scaled by the current speed.
+        """
+        if not self.paused:
+            self.playback_time += real_delta * self.speed
+        self.state.seek_time(self.playback_time)
+
+    def seek(self, time: float):
+        """
+        Jumps to an arbitrary simulated time, forwards or backwards.
+        """
+        self.playback_time = max(time, 0.0)
+        self.state.seek_time(self.playback_time)
+
+    def draw(self):
+        self.render_controller.draw_map()
+
+def main():
+    parser = argparse.ArgumentParser(description="Play back a recorded event log.")
+    parser.add_argument("log", help="Path to the event log.")
+    parser.add_argument("--config", default="config.json", help="Path to the configuration file for window settings.")
+    parser.add_argument("--speed", type=float, default=1.0, help="Playback speed multiplier.")
+    parser.add_argument("--start-tick", type=int, default=0, help="Tick to start playback from.")
+    args = parser.parse_args()
+
+    reader = EventLogReader(args.log)
+    state = ReplayState(reader)
+    state.seek_tick(args.start_tick)
+
+    screen, fps, hex_size = initialization.initialize_simulation(args.config)
+    clock = pygame.time.Clock()
+    render_controller = renderer.RenderController(screen, fps, hex_size, state.tiles, state.units)
+    player = ReplayPlayer(render_controller, state, args.speed)
+
+    running = True
+    while running:
+        delta_time = clock.tick(fps)
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    player.paused = not player.paused
+                elif event.key == pygame.K_UP:
+                    player.speed *= 2
+                elif event.key == pygame.K_DOWN:
+                    player.speed /= 2
+                elif event.key == pygame.K_LEFT:
+                    player.seek(player.playback_time - 10000)  # Back ten simulated seconds
+                elif event.key == pygame.K_RIGHT:
+                    player.seek(player.playback_time + 10000)
+            else:
+                render_controller.camera.handle_event(event)  # Arrow keys seek here, so only the mouse pans
+
+        player.advance(delta_time)
+        player.draw()
+        pygame.display.flip()
+
+    reader.close()
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+import argparse
+import multiprocessing
+import threading
+import time
+from multiprocessing import shared_memory
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the sharded simulation needs it
+    np = None
+import gamelogic
+from game_objects import Team, TileGrid, DIRECTIONS, TEAM_CODES, CODE_TEAMS
+from headless import HeadlessRunner
+from unit_store import make_rng
+
+BARRIER_TIMEOUT = 30.0  # Seconds any party waits for the others inside a tick before giving up
+
+class SharedArrays:
+    """
+    Named NumPy arrays laid out back to back in one shared memory block, so worker
+    processes can attach to all of them from the block name and the layout.
+    """
+    def __init__(self, layout: dict[str, tuple[tuple[int, ...], str]], name: str = None):
+        """
+        Args:
+            layout (dict[str, tuple[tuple[int, ...], str]]): Array name -> (shape, dtype).
+            name (str, optional): Attach to an existing block instead of creating one.
+        """
+        self.layout = layout
+        offsets = {}
+        size = 0
+        for key, (shape, dtype) in layout.items():
+            size = -(-size // 8) * 8  # Keep every array 8-byte aligned
+            offsets[key] = size
+            size += int(np.prod(shape, dtype=np.int64)) * np.dtype(dtype).itemsize
+        self.owner = name is None
+        if self.owner:
+            self.memory = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.arrays = {key: np.ndarray(shape, dtype=dtype, buffer=self.memory.buf, offset=offsets[key])
+                       for key, (shape, dtype) in layout.items()}
+        if self.owner:
+            for array in self.arrays.values():
+                array.fill(0)
+
+    def __getitem__(self, key: str) -> "np.ndarray":
+        return self.arrays[key]
+
+    def close(self):
+        self.arrays = {}  # Views must go before the buffer can be released
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+def shard_map(rows: int, cols: int, shard_cols: int, shard_rows: int) -> "np.ndarray":
+    """
+    Returns the shard owning each cell (col * rows + row) when the map is cut into
+    shard_cols x shard_rows rectangles of near-equal size, numbered column-major.
+    """
+    col_shard = np.arange(cols) * shard_cols // cols
+    row_shard = np.arange(rows) * shard_rows // rows
+    return (col_shard[:, None] * shard_rows + row_shard[None, :]).reshape(-1).astype(np.int32)
+
+def _shard_worker(shard: int, memory_name: str, layout: dict, rows: int, cols: int, shard_cols: int,
+                  shard_rows: int, delta_time: int, tick_barrier, exchange_barrier, timeout: float):
+    """
+    Runs one shard: its units' moves and the tiles inside its rectangle. Every tick has
+    three phases separated by barriers, so no array is ever written and read at once:
+
+    1. After the coordinator has written the actions, start this shard's moves, advance
+       them and put units arriving in another shard into this shard's outbox.
+    2. After every shard has filled its outbox, take over the units handed to this shard
+       and claim the tiles reached by all units arriving here, in unit order.
+    3. Wait for the coordinator to read the results and write the next actions.
+
+    Waiting for the coordinator to start a tick is unbounded, since it may pause between
+    steps; every wait inside a tick gives up after timeout seconds. A worker that fails
+    aborts both barriers, so the other parties stop waiting for it at once.
+    """
+    shared = SharedArrays(layout, memory_name)
+    try:
+        neighbors = gamelogic.get_topology(rows, cols).as_array()
+        owner = shard_map(rows, cols, shard_cols, shard_rows)
+        col, row, team = shared["col"], shared["row"], shared["team"]
+        is_moving, elapsed, duration = shared["is_moving"], shared["elapsed_time"], shared["move_duration"]
+        target_col, target_row = shared["target_col"], shared["target_row"]
+        actions, codes, counts = shared["actions"], shared["codes"], shared["counts"]
+        outbox, outbox_offsets, control = shared["outbox"], shared["outbox_offsets"], shared["control"]
+        shard_count = shard_cols * shard_rows
+        units = np.flatnonzero(owner[col.astype(np.int64) * rows + row] == shard)  # Ascending unit ids
+
+        while True:
+            tick_barrier.wait()
+            if control[0]:
+                return
+
+            # Start the moves chosen for idle units, as UnitStore.start_moves() does
+            chosen = units[(actions[units] >= 0) & ~is_moving[units]]
+            directions = actions[chosen].astype(np.intp)
+            targets = neighbors[col[chosen].astype(np.int64) * rows + row[chosen], directions]
+            valid = targets >= 0
+            chosen = chosen[valid]
+            target_col[chosen], target_row[chosen] = np.divmod(targets[valid], rows)
+            elapsed[chosen] = 0
+            is_moving[chosen] = True
+
+            # Advance every moving unit and complete finished moves, as UnitStore.update() does
+            moving = units[is_moving[units]]
+            elapsed[moving] += delta_time
+            progress = np.minimum(elapsed[moving] / duration[moving], 1.0)
+            done = moving[progress >= 1.0]
+            is_moving[done] = False
+            col[done] = target_col[done]
+            row[done] = target_row[done]
+
+            # Hand units that crossed into another shard over through the outbox, grouped by destination
+            destination = owner[col[done].astype(np.int64) * rows + row[done]]
+            leaving = destination != shard
+            order = np.argsort(destination[leaving], kind="stable")
+            handed = done[leaving][order]
+            outbox[shard, :len(handed)] = handed
+            outbox_offsets[shard] = np.searchsorted(destination[leaving][order], np.arange(shard_count + 1))
+            exchange_barrier.wait(timeout)
+
+            incoming = np.concatenate([outbox[source, outbox_offsets[source, shard]:outbox_offsets[source, shard + 1]]
+                                       for source in range(shard_count) if source != shard] + [done[:0]])
+            if len(handed):
+                units = units[~np.isin(units, handed, assume_unique=True)]
+            if len(incoming):
+                # A shard never receives its own units, so a merge keeps the ids unique
+                units = np.concatenate([units, incoming])
+                units.sort(kind="stable")  # Merges the two sorted runs
+            arrived = np.concatenate([done[~leaving], incoming]).astype(np.int64)
+
+            # Claim arrival tiles in unit order; the highest unit id wins a shared tile
+            arrived.sort()
+            cells = col[arrived].astype(np.int64) * rows + row[arrived]
+            cells, last = np.unique(cells[::-1], return_index=True)
+            new = team[arrived[::-1][last]]
+            old = codes[cells]
+            codes[cells] = new
+            counts[shard] += np.bincount(new, minlength=3) - np.bincount(old, minlength=3)
+            tick_barrier.wait(timeout)
+    except threading.BrokenBarrierError:
+        return  # Another party failed or gave up and reports it; this shard just stops
+    except BaseException:
+        tick_barrier.abort()
+        exchange_barrier.abort()
+        raise
+    finally:
+        shared.close()
+
+class ShardedSimulation:
+    """
+    Runs a unit store simulation split into shard_cols x shard_rows rectangular shards,
+    each owned by a worker process. Unit state and tile affiliations live in shared
+    memory; a shard moves the units standing in its rectangle and writes only its own
+    tiles. A unit that arrives in another shard is handed over through the sender's
+    outbox, which the receiver reads after a barrier, so no locks are taken.
+
+    The coordinator draws every unit's random direction exactly as the teams'
+    TeamControllers would, in the same order, so a run matches the single-process
+    unit store controller for the same seed and scenario tile for tile.
+
+    If a worker dies or a tick overruns the timeout, step() and close() stop the
+    remaining workers, release the shared memory and raise RuntimeError.
+    """
+    def __init__(self, runner: HeadlessRunner, shard_cols: int, shard_rows: int, timeout: float = BARRIER_TIMEOUT):
+        """
+        Args:
+            runner (HeadlessRunner): A freshly loaded runner using the unit store. Its world
+                is copied into shared memory; its TeamControllers' random streams drive the moves.
+            shard_cols (int): Number of shards across the map.
+            shard_rows (int): Number of shards down the map.
+            timeout (float): Seconds to wait for the workers to finish a tick or shut down.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If the runner does not use the unit store or a TileGrid, or a shard would be empty.
+        """
+        if np is None:
+            raise ImportError("ShardedSimulation requires NumPy to be installed.")
+        sim = runner.simulation_controller
+        if sim.unit_store is None or not isinstance(sim.tiles, TileGrid):
+            raise ValueError("The sharded simulation needs a runner using the unit store and a TileGrid.")
+        if not (0 < shard_cols <= sim.cols and 0 < shard_rows <= sim.rows):
+            raise ValueError(f"Cannot cut a {sim.cols}x{sim.rows} grid into {shard_cols}x{shard_rows} shards.")
+        self.rows = sim.rows
+        self.cols = sim.cols
+        self.delta_time = runner.delta_time
+        self.controllers = (runner.blue_controller, runner.red_controller)
+        self.shard_count = shard_cols * shard_rows
+        self.timeout = timeout
+        self.steps = 0
+
+        store = sim.unit_store
+        n = store.size
+        self.layout = {
+            "col": ((n,), "int32"), "row": ((n,), "int32"), "team": ((n,), "int8"),
+            "is_moving": ((n,), "bool"), "elapsed_time": ((n,), "float64"), "move_duration": ((n,), "float64"),
+            "target_col": ((n,), "int32"), "target_row": ((n,), "int32"), "actions": ((n,), "int8"),
+            "codes": ((self.rows * self.cols,), "int8"), "counts": ((self.shard_count, 3), "int64"),
+            "outbox": ((self.shard_count, max(n, 1)), "int32"),
+            "outbox_offsets": ((self.shard_count, self.shard_count + 1), "int64"),
+            "control": ((1,), "int8"),  # Non-zero tells the workers to exit
+        }
+        self.shared = SharedArrays(self.layout)
+        for name in ("col", "row", "team", "is_moving", "elapsed_time", "target_col", "target_row"):
+            self.shared[name][:] = getattr(store, name)[:n]
+        self.shared["move_duration"][:] = gamelogic.BASE_MOVE_DURATION / store.speed[:n]
+        self.shared["codes"][:] = sim.tiles.as_array().reshape(-1)
+        owner = shard_map(self.rows, self.cols, shard_cols, shard_rows)
+        codes = self.shared["codes"].astype(np.int64)
+        self.shared["counts"][:] = np.bincount(owner * 3 + codes, minlength=3 * self.shard_count).reshape(-1, 3)
+
+        context = multiprocessing.get_context()
+        self.tick_barrier = context.Barrier(self.shard_count + 1)
+        self.exchange_barrier = context.Barrier(self.shard_count)
+        self.workers = [
+            context.Process(target=_shard_worker, daemon=True,
+                            args=(shard, self.shared.memory.name, self.layout, self.rows, self.cols, shard_cols,
+                                  shard_rows, self.delta_time, self.tick_barrier, self.exchange_barrier, timeout))
+            for shard in range(self.shard_count)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def __enter__(self) -> "ShardedSimulation":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def step(self):
+        """
+        Advances every shard by one fixed time step, mirroring HeadlessRunner.step().
+
+        Raises:
+            RuntimeError: If a worker has died or the tick did not finish within the timeout.
+                The simulation is closed before raising.
+        """
+        if not self.workers:
+            raise RuntimeError("The sharded simulation has been closed.")
+        if any(worker.exitcode is not None for worker in self.workers):
+            raise RuntimeError(f"Step {self.steps} failed: {self._shut_down()}")
+        actions = self.shared["actions"]
+        actions.fill(-1)
+        team, is_moving = self.shared["team"], self.shared["is_moving"]
+        for controller in self.controllers:
+            # The same draws TeamController.move_units_randomly() makes on the unit store
+            if controller.array_rng is None:
+                controller.array_rng = make_rng(controller.rng.getrandbits(64))
+            candidates = np.flatnonzero((team == TEAM_CODES[controller.team]) & ~is_moving)
+            actions[candidates] = controller.array_rng.integers(0, len(DIRECTIONS), size=len(candidates))
+        try:
+            self.tick_barrier.wait(self.timeout)  # Workers run the tick
+            self.tick_barrier.wait(self.timeout)  # and have finished it
+        except threading.BrokenBarrierError:
+            failure = self._shut_down() or f"the tick did not finish within {self.timeout}s"
+            raise RuntimeError(f"Step {self.steps} failed: {failure}") from None
+        self.steps += 1
+
+    def run(self, steps: int):
+        for _ in range(steps):
+            self.step()
+
+    def tile_codes(self) -> bytes:
+        """
+        Returns every tile's affiliation code in column-major order.
+        """
+        return self.shared["codes"].tobytes()
+
+    def tiles(self) -> TileGrid:
+        """
+        Returns a TileGrid copy of the current affiliations.
+        """
+        tiles = TileGrid(self.cols, self.rows)
+        tiles.load_codes(self.tile_codes())
+        return tiles
+
+    def get_counts(self) -> dict[Team, int]:
+        """
+        Returns tile counts keyed by Team.BLUE, Team.RED and None, summed over the shards' running counts.
+        """
+        totals = self.shared["counts"].sum(axis=0)
+        return {team: int(totals[code]) for code, team in enumerate(CODE_TEAMS)}
+
+    def close(self):
+        """
+        Stops the workers and releases the shared memory.
+
+        Raises:
+            RuntimeError: If a worker failed or did not stop within the timeout.
+        """
+        if not self.workers:
+            return
+        self.shared["control"][0] = 1
+        if all(worker.exitcode is None for worker in self.workers):
+            try:
+                self.tick_barrier.wait(self.timeout)
+            except threading.BrokenBarrierError:
+                pass  # A worker is gone; _shut_down() collects its exit code
+        failure = self._shut_down()
+        if failure:
+            raise RuntimeError(f"Shutting down the shards failed: {failure}")
+
+    def _shut_down(self) -> str:
+        """
+        Aborts the barriers, joins the workers (terminating any that do not exit within the
+        timeout) and releases the shared memory. Returns a description of the workers that
+        failed, or an empty string if every worker exited cleanly.
+        """
+        stopped = []  # Shards terminated here
+        # A process killed while waiting on a barrier never acknowledges being woken, so
+        # aborting would block; the survivors may be stuck on it and are terminated instead.
+        killed = any(worker.exitcode is not None and worker.exitcode < 0 for worker in self.workers)
+        if not killed:
+            self.tick_barrier.abort()
+            self.exchange_barrier.abort()
+        deadline = time.monotonic() + (0 if killed else self.timeout)
+        for shard, worker in enumerate(self.workers):
+            worker.join(max(deadline - time.monotonic(), 0))
+            if worker.is_alive():
+                stopped.append(shard)
+                worker.terminate()
+                worker.join()
+        failed = [f"shard {shard} exited with code {worker.exitcode}" for shard, worker in enumerate(self.workers)
+                  if worker.exitcode and shard not in stopped]
+        if not killed:
+            failed += [f"shard {shard} did not stop within {self.timeout}s" for shard in stopped]
+        self.workers = []
+        self.shared.close()
+        return "; ".join(failed)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the hex simulation split into shards across worker processes.")
+    parser.add_argument("--config", default="config.json", help="Path to the configuration file.")
+    parser.add_argument("--units", default="units.json", help="Path to the unit data file.")
+    parser.add_argument("--steps", type=int, default=10000, help="Number of steps to simulate.")
+    parser.add_argument("--delta-time", type=int, default=None, help="Simulated milliseconds per step.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a reproducible run.")
+    parser.add_argument("--shards", default="2x2", help="Shard layout as COLSxROWS, for example 4x2.")
+    parser.add_argument("--check", action="store_true", help="Also run the single-process controller and compare tiles.")
+    args = parser.parse_args()
+    shard_cols, shard_rows = (int(part) for part in args.shards.lower().split("x"))
+
+    runner = HeadlessRunner(args.config, args.units, args.delta_time, use_unit_store=True, seed=args.seed)
+    with ShardedSimulation(runner, shard_cols, shard_rows) as sharded:
+        start = time.perf_counter()
+        sharded.run(args.steps)
+        elapsed = time.perf_counter() - start
+        codes = sharded.tile_codes()
+        stats = gamelogic.calculate_tile_affiliation_percentages(sharded.tiles())
+    print(
+        f"Blue: {stats['blue']:.2f}%  |  "
+        f"Red: {stats['red']:.2f}%  |  "
+        f"None: {stats['none']:.2f}%"
+    )
+    print(f"{args.steps} steps on {shard_cols}x{shard_rows} shards in {elapsed:.3f}s ({args.steps / elapsed:.0f} ticks/sec)")
+    if args.check:
+        reference = HeadlessRunner(args.config, args.units, args.delta_time, use_unit_store=True, seed=args.seed)
+        reference.run(args.steps)
+        matches = reference.tiles.tobytes() == codes
+        print("Matches the single-process controller" if matches else "Differs from the single-process controller")
+
+if __name__ == "__main__":
+    main()
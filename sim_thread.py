@@ -0,0 +1,225 @@
+import threading
+import time
+from controllers import SimulationController
+from game_objects import TileGrid, TEAM_CODES, CODE_TEAMS
+
+class SnapshotUnit:
+    """
+    A unit as it was when a FrameSnapshot was taken, with the attributes the renderer
+    reads from a Unit. move_progress is extrapolated to the snapshot's render_time, so
+    moves animate smoothly between snapshots.
+    """
+    __slots__ = ("snapshot", "col", "row", "team", "is_moving", "start_tile", "target_tile",
+                 "progress", "move_duration")
+
+    def __init__(self, snapshot: "FrameSnapshot", col: int, row: int, team, is_moving: bool,
+                 start_tile: tuple[int, int], target_tile: tuple[int, int], progress: float, move_duration: float):
+        self.snapshot = snapshot
+        self.col = col
+        self.row = row
+        self.team = team
+        self.is_moving = is_moving
+        self.start_tile = start_tile
+        self.target_tile = target_tile
+        self.progress = progress
+        self.move_duration = move_duration
+
+    @property
+    def move_progress(self) -> float:
+        if not self.is_moving:
+            return self.progress
+        return min(self.progress + (self.snapshot.render_time - self.snapshot.time) / self.move_duration, 1.0)
+
+class TerritorySnapshot:
+    """
+    Region and frontline metrics copied from a TerritoryTracker, read by the renderer
+    through the same get_stats() as the tracker itself.
+    """
+    __slots__ = ("stats",)
+
+    def __init__(self, stats: dict):
+        self.stats = stats
+
+    def get_stats(self) -> dict:
+        return self.stats
+
+class FrameSnapshot:
+    """
+    Tile affiliations and unit states copied from the simulation after one tick. The
+    simulation thread never touches a snapshot after publishing it; the renderer only
+    sets render_time, the simulated time it is drawing.
+
+    The first snapshot of a TileGrid carries every tile in codes. Later ones leave codes
+    as None and carry only the tiles changed since the previous snapshot in changes, a
+    dict of cell (col * rows + row) -> affiliation code, so publishing and applying a
+    snapshot costs the tiles that changed hands rather than the map size.
+    """
+    def __init__(self, simulation_controller: SimulationController, published_at: float,
+                 previous: "FrameSnapshot" = None, unseen: bool = False):
+        """
+        Args:
+            simulation_controller (SimulationController): The simulation to copy.
+            published_at (float): perf_counter() time of publication.
+            previous (FrameSnapshot, optional): The snapshot published before this one;
+                without it every tile is copied.
+            unseen (bool): The renderer never took previous, so its changes are carried over.
+        """
+        sim = simulation_controller
+        self.tick = sim.tick
+        self.time = sim.time
+        self.render_time = sim.time
+        self.published_at = published_at
+        self.codes = None
+        self.changes = None
+        tiles = sim.tiles
+        if not isinstance(tiles, TileGrid):
+            self.codes = bytes(TEAM_CODES[tile.affiliation] for column in tiles for tile in column)
+        elif previous is None or (unseen and previous.codes is not None):
+            tiles.enable_dirty_tracking()
+            tiles.pop_dirty()
+            self.codes = tiles.tobytes()
+        else:
+            self.changes = dict(previous.changes) if unseen else {}
+            rows = tiles.rows
+            for col, row in tiles.pop_dirty():
+                self.changes[col * rows + row] = tiles.get_code(col, row)
+        self.territory = None if sim.territory is None else TerritorySnapshot(sim.territory.get_stats())
+        self.units = self._copy_units(sim)
+
+    def _copy_units(self, sim: SimulationController) -> list[SnapshotUnit]:
+        store = sim.unit_store
+        if store is None:
+            return [SnapshotUnit(self, unit.col, unit.row, unit.team, unit.is_moving, unit.start_tile,
+                                 unit.target_tile, unit.move_progress, unit.move_duration) for unit in sim.units]
+        n = store.size
+        columns = zip(store.col[:n].tolist(), store.row[:n].tolist(), store.team[:n].tolist(),
+                      store.is_moving[:n].tolist(), store.start_col[:n].tolist(), store.start_row[:n].tolist(),
+                      store.target_col[:n].tolist(), store.target_row[:n].tolist(),
+                      store.move_progress[:n].tolist(), store.move_duration[:n].tolist())
+        return [SnapshotUnit(self, col, row, CODE_TEAMS[code], moving, (start_col, start_row),
+                             (target_col, target_row), progress, duration)
+                for col, row, code, moving, start_col, start_row, target_col, target_row, progress, duration in columns]
+
+class SimulationThread(threading.Thread):
+    """
+    Runs the team AI and SimulationController.update() at a fixed tick rate on a worker
+    thread and publishes a FrameSnapshot after each tick, so a slow frame never stretches
+    a tick and a slow tick never blocks the window.
+
+    Snapshots are double buffered: the renderer draws the front snapshot it took while
+    the worker builds the next one. While the front snapshot has not been taken, a new
+    one is only built once it is max_snapshot_age old, so fast-forwarding does not copy
+    state every tick that nobody will draw.
+    """
+    def __init__(self, simulation_controller: SimulationController, tick_ms: int = 16, speed: float = 1.0,
+                 max_snapshot_age: float = 0.016):
+        """
+        Args:
+            simulation_controller (SimulationController): The simulation to run. Only this
+                thread may touch it until stop() returns.
+            tick_ms (int): Simulated milliseconds advanced per tick.
+            speed (float): Simulated time per real time; None runs ticks back to back. It may
+                be changed while the thread runs and applies from the next tick.
+            max_snapshot_age (float): Real seconds after which an untaken snapshot is replaced.
+
+        Raises:
+            ValueError: If tick_ms is not positive.
+        """
+        super().__init__(name="simulation", daemon=True)
+        if tick_ms <= 0:
+            raise ValueError(f"tick_ms must be positive, got {tick_ms}")
+        self.simulation_controller = simulation_controller
+        self.tick_ms = tick_ms
+        self._wake = threading.Event()  # Cuts short the wait between ticks
+        self.speed = speed
+        self.max_snapshot_age = max_snapshot_age
+        self.ticks_per_second = 0  # Ticks run in the last full second of wall-clock time
+        self.error = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._front = None  # Latest published snapshot
+        self._taken = True  # Whether the renderer has taken the front snapshot
+        self.publish()
+
+    def publish(self):
+        now = time.perf_counter()
+        with self._lock:
+            front, taken = self._front, self._taken
+        if not taken and now - front.published_at < self.max_snapshot_age:
+            return
+        # If the renderer takes front meanwhile, carrying its changes over is harmless
+        snapshot = FrameSnapshot(self.simulation_controller, now, front, unseen=not taken)
+        with self._lock:
+            self._front = snapshot
+            self._taken = False
+
+    def take_snapshot(self) -> FrameSnapshot:
+        """
+        Returns the most recent snapshot and lets the worker publish the next one.
+
+        Raises:
+            RuntimeError: If the simulation thread stopped because of an error.
+        """
+        if self.error is not None:
+            raise RuntimeError("Simulation thread failed") from self.error
+        with self._lock:
+            self._taken = True
+            return self._front
+
+    @property
+    def speed(self) -> float | None:
+        return self._speed
+
+    @speed.setter
+    def speed(self, speed: float | None):
+        self._speed = speed
+        self._wake.set()  # A wait timed for the old speed ends at once
+
+    def status(self) -> str:
+        speed = "max" if self.speed is None else f"{self.speed:g}x"
+        return f"Speed: {speed} ({self.ticks_per_second} ticks/s)"
+
+    def run(self):
+        sim = self.simulation_controller
+        next_tick = time.perf_counter()
+        second_start, second_ticks = next_tick, 0
+        try:
+            while not self._stop_event.is_set():
+                self._wake.clear()
+                sim.blue_controller.move_units_randomly()
+                sim.red_controller.move_units_randomly()
+                sim.update(self.tick_ms)
+                self.publish()
+                second_ticks += 1
+                now = time.perf_counter()
+                if now - second_start >= 1.0:
+                    self.ticks_per_second = second_ticks
+                    second_start, second_ticks = now, 0
+                speed = self.speed
+                if speed is None:
+                    next_tick = time.perf_counter()
+                    continue
+                next_tick += self.tick_ms / 1000 / speed
+                delay = next_tick - time.perf_counter()
+                if delay > 0:
+                    if self._wake.wait(delay):
+                        next_tick = time.perf_counter()  # Woken by a speed change or stop()
+                elif delay < -0.25:
+                    next_tick = time.perf_counter()  # Too far behind: drop the backlog instead of bursting
+        except Exception as e:
+            self.error = e
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+        self.join()
+
+def render_time(snapshot: FrameSnapshot, speed: float, tick_ms: int, now: float = None) -> float:
+    """
+    Estimates the simulated time to draw a snapshot at, from the real time elapsed since it
+    was published. The estimate never runs more than one tick past the snapshot.
+    """
+    now = time.perf_counter() if now is None else now
+    if speed is None:
+        return snapshot.time
+    return snapshot.time + min((now - snapshot.published_at) * 1000 * speed, tick_ms)
@@ -0,0 +1,224 @@
+import heapq
+import math
+import struct
+from array import array
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for unit store snapshots
+    np = None
+from controllers import SimulationController, TeamController
+from game_objects import Team, Unit, TileGrid, ChunkedTileGrid, TEAM_CODES, CODE_TEAMS
+from unit_store import UnitView, make_rng
+
+MAGIC = b"HOISNAP\0"
+VERSION = 2
+# magic, version, uses unit store, uses scheduler, tracks territory, rows, cols,
+# chunk size (0 for a dense grid), tick, time, unit count, moves started, moves completed
+HEADER = struct.Struct("<8sHBBBiiIIdIQQ")
+PREFIX = struct.Struct("<8sH")  # The start of the header shared by every version: magic, version
+# A chunked grid stores its allocated chunks only: their number, then each chunk's index
+# followed by its chunk_size * chunk_size codes
+CHUNK_COUNT = struct.Struct("<I")
+CHUNK_INDEX = struct.Struct("<I")
+# Per-unit columns in file order, with their array typecodes. Columns are written in
+# native byte order, so snapshots are meant to be restored on the same kind of machine.
+UNIT_COLUMNS = (
+    ("col", "i"), ("row", "i"), ("team", "b"), ("speed", "d"), ("is_moving", "B"),
+    ("start_col", "i"), ("start_row", "i"), ("target_col", "i"), ("target_row", "i"),
+    ("elapsed_time", "d"), ("move_duration", "d"), ("move_progress", "d"), ("move_start_time", "d"),
+)
+# random.Random state: version, 625 state words, gauss_next (NaN when unset)
+PY_RNG = struct.Struct("<i625Id")
+# NumPy PCG64 state: present flag, state, increment, has_uint32, uinteger
+NP_RNG = struct.Struct("<B16s16sBI")
+
+def save_snapshot(simulation_controller: SimulationController, filename: str):
+    """
+    Writes tile affiliations, unit positions, in-flight moves, the move counters and
+    both teams' RNG states to a binary snapshot. Each unit field is stored as one
+    contiguous column. A ChunkedTileGrid keeps its chunk size and only its allocated chunks.
+
+    Args:
+        simulation_controller (SimulationController): The simulation to save.
+        filename (str): Path of the snapshot file to create.
+    """
+    sim = simulation_controller
+    store = sim.unit_store
+    chunked = isinstance(sim.tiles, ChunkedTileGrid)
+    with open(filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, store is not None, sim.use_scheduler, sim.territory is not None,
+                            sim.rows, sim.cols, sim.tiles.chunk_size if chunked else 0, sim.tick, sim.time,
+                            len(sim.units), sim.moves_started, sim.moves_completed))
+        if chunked:
+            f.write(CHUNK_COUNT.pack(len(sim.tiles.chunks)))
+            for chunk in sorted(sim.tiles.chunks):
+                f.write(CHUNK_INDEX.pack(chunk) + sim.tiles.chunks[chunk])
+        elif isinstance(sim.tiles, TileGrid):
+            f.write(sim.tiles.tobytes())
+        else:
+            f.write(bytes(TEAM_CODES[tile.affiliation] for column in sim.tiles for tile in column))
+
+        if store is not None:
+            n = store.size
+            for name, typecode in UNIT_COLUMNS:
+                if name == "move_start_time":
+                    values = sim.time - store.elapsed_time[:n]
+                else:
+                    values = getattr(store, name)[:n]
+                f.write(values.astype(np.dtype(typecode), copy=False).tobytes())
+        else:
+            for name, typecode in UNIT_COLUMNS:
+                f.write(array(typecode, (_unit_field(unit, name) for unit in sim.units)).tobytes())
+
+        for controller in (sim.blue_controller, sim.red_controller):
+            f.write(_pack_rngs(controller))
+
+def _unit_field(unit, name: str):
+    """
+    Reads one snapshot column value from a Unit object.
+    """
+    if name == "team":
+        return TEAM_CODES[unit.team]
+    if name in ("start_col", "start_row"):
+        return unit.start_tile[name == "start_row"]
+    if name in ("target_col", "target_row"):
+        return unit.target_tile[name == "target_row"]
+    if name == "move_start_time":
+        return math.nan if unit.move_start_time is None else unit.move_start_time
+    if name == "move_progress":
+        return unit._move_progress
+    return getattr(unit, name)
+
+def _pack_rngs(controller: TeamController) -> bytes:
+    version, words, gauss_next = controller.rng.getstate()
+    packed = PY_RNG.pack(version, *words, math.nan if gauss_next is None else gauss_next)
+    if controller.array_rng is None:
+        return packed + NP_RNG.pack(0, bytes(16), bytes(16), 0, 0)
+    state = controller.array_rng.bit_generator.state
+    return packed + NP_RNG.pack(1, state["state"]["state"].to_bytes(16, "little"),
+                                state["state"]["inc"].to_bytes(16, "little"),
+                                state["has_uint32"], state["uinteger"])
+
+def _unpack_rngs(controller: TeamController, data: memoryview, offset: int) -> int:
+    version, *words, gauss_next = PY_RNG.unpack_from(data, offset)
+    controller.rng.setstate((version, tuple(words), None if math.isnan(gauss_next) else gauss_next))
+    offset += PY_RNG.size
+    present, state, inc, has_uint32, uinteger = NP_RNG.unpack_from(data, offset)
+    if present:
+        controller.array_rng = make_rng(0)
+        controller.array_rng.bit_generator.state = {
+            "bit_generator": "PCG64",
+            "state": {"state": int.from_bytes(state, "little"), "inc": int.from_bytes(inc, "little")},
+            "has_uint32": has_uint32,
+            "uinteger": uinteger,
+        }
+    return offset + NP_RNG.size
+
+def restore_snapshot(filename: str, blue_controller: TeamController, red_controller: TeamController,
+                     event_log=None) -> SimulationController:
+    """
+    Rebuilds a SimulationController from a snapshot. Neither config.json nor the unit file
+    is read; the team controllers receive the restored units and RNG states.
+
+    Args:
+        filename (str): Path of the snapshot file.
+        blue_controller (TeamController): Empty controller for the blue team.
+        red_controller (TeamController): Empty controller for the red team.
+        event_log (EventLogWriter, optional): Log to attach to the restored simulation.
+
+    Returns:
+        SimulationController: The restored simulation.
+
+    Raises:
+        ValueError: If the file is not a snapshot of a supported version.
+    """
+    with open(filename, 'rb') as f:
+        data = memoryview(f.read())
+    magic, version = PREFIX.unpack_from(data, 0) if len(data) >= PREFIX.size else (None, None)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{filename} is not a version {VERSION} snapshot")
+    (_, _, uses_store, uses_scheduler, tracks_territory, rows, cols, chunk_size, tick, time, unit_count,
+     moves_started, moves_completed) = HEADER.unpack_from(data, 0)
+    offset = HEADER.size
+
+    if chunk_size:
+        tiles = ChunkedTileGrid(cols, rows, chunk_size)
+        (chunk_count,) = CHUNK_COUNT.unpack_from(data, offset)
+        offset += CHUNK_COUNT.size
+        chunks = {}
+        for _ in range(chunk_count):
+            (chunk,) = CHUNK_INDEX.unpack_from(data, offset)
+            offset += CHUNK_INDEX.size
+            chunks[chunk] = data[offset:offset + chunk_size * chunk_size]
+            offset += chunk_size * chunk_size
+    else:
+        tiles = TileGrid(cols, rows)
+        codes = data[offset:offset + rows * cols]
+        offset += rows * cols
+
+    columns = {}
+    for name, typecode in UNIT_COLUMNS:
+        size = array(typecode).itemsize * unit_count
+        columns[name] = data[offset:offset + size]
+        offset += size
+
+    sim = SimulationController(blue_controller, red_controller, tiles, None,
+                               bool(uses_store), bool(uses_scheduler), event_log, bool(tracks_territory))
+    sim.tick = tick
+    sim.time = time
+    sim.moves_started = moves_started
+    sim.moves_completed = moves_completed
+    teams = {Team.BLUE: blue_controller, Team.RED: red_controller}
+
+    if uses_store:
+        store = sim.unit_store
+        store.load_columns({name: np.frombuffer(columns[name], dtype=np.dtype(typecode))
+                            for name, typecode in UNIT_COLUMNS if name != "move_start_time"}, unit_count)
+        store.elapsed_time[:unit_count] = time - np.frombuffer(columns["move_start_time"], dtype=np.float64)
+        for index in range(unit_count):
+            unit = UnitView(store, index, sim)
+            unit.unit_id = index
+            sim.units.append(unit)
+            sim.occupancy.add(index, unit.team, unit.col, unit.row)
+            teams[unit.team].add_unit(unit)
+    else:
+        values = {}
+        for name, typecode in UNIT_COLUMNS:
+            values[name] = array(typecode)
+            values[name].frombytes(columns[name])
+        for index in range(unit_count):
+            # Built directly, like the store's views, so nothing is logged or claimed twice
+            unit = Unit.__new__(Unit)
+            unit.col = values["col"][index]
+            unit.row = values["row"][index]
+            unit.team = CODE_TEAMS[values["team"][index]]
+            unit.speed = values["speed"][index]
+            unit.simulation_controller = sim
+            unit.is_moving = bool(values["is_moving"][index])
+            unit.start_tile = (values["start_col"][index], values["start_row"][index])
+            unit.target_tile = (values["target_col"][index], values["target_row"][index])
+            unit.elapsed_time = values["elapsed_time"][index]
+            unit.move_duration = values["move_duration"][index]
+            unit.move_progress = values["move_progress"][index]
+            unit.move_start_time = None
+            unit.unit_id = index
+            sim.units.append(unit)
+            sim.occupancy.add(index, unit.team, unit.col, unit.row)
+            start_time = values["move_start_time"][index]
+            if not math.isnan(start_time):
+                unit.move_start_time = start_time
+                if unit.is_moving:
+                    heapq.heappush(sim.move_queue, (start_time + unit.move_duration, index, unit))
+            teams[unit.team].add_unit(unit)
+
+    if chunk_size:
+        tiles.load_chunks(chunks)
+    else:
+        tiles.load_codes(codes)
+    if sim.territory is not None:
+        sim.territory.rebuild_all()  # Loading bypassed the tracker, so read the grid again
+    offset = _unpack_rngs(blue_controller, data, offset)
+    _unpack_rngs(red_controller, data, offset)
+    if event_log is not None:
+        event_log.keyframe(sim)  # Give replays a starting point for the restored state
+    return sim
@@ -0,0 +1,247 @@
+from collections import deque
+from gamelogic import HexTopology
+from game_objects import Team, TileGrid, TEAM_CODES
+
+# Direction indices (see game_objects.DIRECTIONS) in order around a hex: E, SE, SW, W, NW, NE.
+# Consecutive entries, including the last and first, are neighbors of each other.
+RING = (3, 2, 4, 0, 5, 1)
+ENEMY_CODES = (0, 2, 1)  # Indexed by team code; neutral tiles have no enemy
+
+class TeamRegions:
+    """
+    Incremental union-find over one team's tiles. Every claim allocates a fresh node, so a
+    tile the team loses and later retakes never inherits its old component; the stale
+    node stays behind as an interior link until the next rebuild compacts the forest.
+
+    Losing a tile cannot split its region when the team's tiles around it form a single
+    arc of the hex ring, because they then still touch each other. Any other loss may
+    split a region, which union-find cannot undo, so the team is marked stale until rebuilt.
+    """
+    def __init__(self, code: int):
+        self.code = code
+        self.parent = []  # node -> parent node
+        self.sizes = {}  # root node -> live tiles in its region
+        self.cell_nodes = {}  # cell -> node, for every tile the team holds
+        self.stale = False  # A loss may have split a region since the last rebuild
+
+    def find(self, node: int) -> int:
+        parent = self.parent
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:  # Path compression
+            parent[node], node = root, parent[node]
+        return root
+
+    def union(self, a: int, b: int):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+        if self.sizes[a] < self.sizes[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.sizes[a] += self.sizes.pop(b)
+
+    def add(self, cell: int, neighbors: list[int]):
+        """
+        Adds a claimed cell and joins it to the regions of its neighbors the team already holds.
+        """
+        node = len(self.parent)
+        self.parent.append(node)
+        self.sizes[node] = 1
+        self.cell_nodes[cell] = node
+        for neighbor in neighbors:
+            other = self.cell_nodes.get(neighbor)
+            if other is not None:
+                self.union(node, other)
+
+    def remove(self, cell: int, ring: list[int]):
+        """
+        Removes a lost cell. ring holds its six neighbors in RING order (-1 when off-grid).
+        """
+        root = self.find(self.cell_nodes.pop(cell))
+        self.sizes[root] -= 1
+        if self.sizes[root] == 0:
+            del self.sizes[root]
+            return
+        held = [neighbor >= 0 and neighbor in self.cell_nodes for neighbor in ring]
+        arcs = sum(1 for i in range(6) if held[i] and not held[i - 1])
+        if arcs > 1:
+            self.stale = True
+
+    def rebuild(self, cells: list[int], topology: HexTopology):
+        """
+        Rebuilds the forest from scratch with a flood fill over the team's current cells.
+        """
+        self.parent = []
+        self.sizes = {}
+        self.cell_nodes = {}
+        held = set(cells)
+        for start in cells:
+            if start in self.cell_nodes:
+                continue
+            root = len(self.parent)
+            queue = deque([start])
+            self.cell_nodes[start] = root
+            self.parent.append(root)
+            size = 0
+            while queue:
+                cell = queue.popleft()
+                size += 1
+                for neighbor in topology.neighbor_ring(cell):
+                    if neighbor in held and neighbor not in self.cell_nodes:
+                        self.cell_nodes[neighbor] = len(self.parent)
+                        self.parent.append(root)
+                        queue.append(neighbor)
+            self.sizes[root] = size
+        self.stale = False
+
+    def needs_rebuild(self) -> bool:
+        # Compact once stale nodes outnumber live ones
+        return self.stale or len(self.parent) > 2 * len(self.cell_nodes) + 64
+
+class TerritoryTracker:
+    """
+    Keeps per-team territory structure up to date as tiles change hands: the connected
+    regions each team holds and their sizes, plus the frontline where blue and red tiles
+    touch. Every change is applied locally, touching only the tile and its six neighbors.
+
+    Frontline membership and edge counts are always exact. Region counts and sizes are
+    exact too, except after a loss that may have split a region; the team is then rebuilt
+    on the next maybe_rebuild() at least rebuild_interval ticks after its last rebuild.
+    """
+    def __init__(self, tiles: TileGrid, topology: HexTopology, rebuild_interval: int = 30):
+        """
+        Args:
+            tiles (TileGrid): The grid to track. Its current affiliations are read once here;
+                afterwards every change must be reported through record_change(s).
+            topology (HexTopology): Adjacency of the grid.
+            rebuild_interval (int): Minimum ticks between rebuilds of a team's regions.
+                Use 1 for exact region metrics after every tick.
+
+        Raises:
+            ValueError: If tiles is not a TileGrid or rebuild_interval is not positive.
+        """
+        if not isinstance(tiles, TileGrid):
+            raise ValueError("Territory tracking needs a TileGrid.")
+        if rebuild_interval <= 0:
+            raise ValueError(f"rebuild_interval must be positive, got {rebuild_interval}")
+        self.tiles = tiles
+        self.rows = tiles.rows
+        self.topology = topology
+        self.rebuild_interval = rebuild_interval
+        self.regions = {TEAM_CODES[Team.BLUE]: TeamRegions(TEAM_CODES[Team.BLUE]),
+                        TEAM_CODES[Team.RED]: TeamRegions(TEAM_CODES[Team.RED])}
+        self.last_rebuild = {code: 0 for code in self.regions}
+        self.frontline = set()  # Cells holding a team's tile next to an enemy tile
+        self.frontline_edges = 0  # Adjacent blue/red tile pairs
+        self.rebuild_all()
+
+    def code_at(self, cell: int, pending: dict[int, int] = None) -> int:
+        if pending:
+            code = pending.get(cell)
+            if code is not None:
+                return code
+        col, row = divmod(cell, self.rows)
+        return self.tiles.get_code(col, row)
+
+    def record_change(self, cell: int, old: int, pending: dict[int, int] = None):
+        """
+        Applies one tile's change of hands. Call it after the grid has been written.
+
+        Args:
+            cell (int): The changed cell (col * rows + row).
+            old (int): Its affiliation code before the change.
+            pending (dict[int, int], optional): Previous codes of cells written to the grid
+                whose changes have not been recorded yet; they are read as those codes.
+        """
+        new = self.code_at(cell)
+        if new == old:
+            return
+        neighbors = self.topology.neighbor_ring(cell)
+        neighbor_codes = [self.code_at(neighbor, pending) if neighbor >= 0 else 0 for neighbor in neighbors]
+
+        if old:
+            self.regions[old].remove(cell, [neighbors[d] for d in RING])
+            self.frontline_edges -= neighbor_codes.count(ENEMY_CODES[old])
+        if new:
+            self.regions[new].add(cell, [n for n, code in zip(neighbors, neighbor_codes) if code == new])
+            self.frontline_edges += neighbor_codes.count(ENEMY_CODES[new])
+
+        self._update_frontline(cell, new, neighbor_codes)
+        for neighbor, code in zip(neighbors, neighbor_codes):
+            if neighbor >= 0:
+                self._update_frontline(neighbor, code, pending=pending)
+
+    def record_changes(self, cells, old_codes):
+        """
+        Applies a batch of changes given as parallel sequences (or NumPy arrays) of distinct
+        cells and their previous codes, as returned by TileGrid.assign_codes(). The changes
+        are replayed one at a time, as if each had been written to the grid on its own.
+        """
+        if hasattr(cells, "tolist"):
+            cells, old_codes = cells.tolist(), old_codes.tolist()
+        pending = dict(zip(cells, old_codes))
+        for cell, old in zip(cells, old_codes):
+            del pending[cell]
+            self.record_change(cell, old, pending)
+
+    def _update_frontline(self, cell: int, code: int, neighbor_codes: list[int] = None, pending: dict[int, int] = None):
+        if code:
+            if neighbor_codes is None:
+                neighbor_codes = [self.code_at(neighbor, pending)
+                                  for neighbor in self.topology.neighbor_ring(cell) if neighbor >= 0]
+            if ENEMY_CODES[code] in neighbor_codes:
+                self.frontline.add(cell)
+                return
+        self.frontline.discard(cell)
+
+    def maybe_rebuild(self, tick: int):
+        """
+        Rebuilds each team whose regions may be out of date, at most once per rebuild_interval ticks.
+        """
+        for code, regions in self.regions.items():
+            if regions.needs_rebuild() and tick - self.last_rebuild[code] >= self.rebuild_interval:
+                self.rebuild_team(code)
+                self.last_rebuild[code] = tick
+
+    def rebuild_team(self, code: int):
+        # The team's cells are already known, so only its own tiles are visited
+        regions = self.regions[code]
+        regions.rebuild(list(regions.cell_nodes), self.topology)
+
+    def rebuild_all(self):
+        """
+        Recomputes every metric from the grid's current affiliations.
+        """
+        for code, regions in self.regions.items():
+            regions.rebuild(self.tiles.cells_with(code), self.topology)
+        self.frontline = set()
+        self.frontline_edges = 0
+        for cell in self.regions[TEAM_CODES[Team.BLUE]].cell_nodes:
+            red = sum(1 for neighbor in self.topology.neighbor_ring(cell)
+                      if neighbor >= 0 and self.code_at(neighbor) == TEAM_CODES[Team.RED])
+            if red:
+                self.frontline.add(cell)
+                self.frontline_edges += red
+        for cell in self.regions[TEAM_CODES[Team.RED]].cell_nodes:
+            self._update_frontline(cell, TEAM_CODES[Team.RED])
+
+    def region_sizes(self, team: Team) -> list[int]:
+        """
+        Returns the sizes of a team's connected regions, largest first.
+        """
+        return sorted(self.regions[TEAM_CODES[team]].sizes.values(), reverse=True)
+
+    def get_stats(self) -> dict[str, dict[str, int] | int]:
+        """
+        Returns region counts and the largest region per team, keyed "blue" and "red", plus
+        the number of frontline tiles ("frontline") and blue/red adjacencies ("frontline_edges").
+        """
+        stats = {}
+        for team in (Team.BLUE, Team.RED):
+            sizes = self.regions[TEAM_CODES[team]].sizes.values()
+            stats[team.value] = {"regions": len(sizes), "largest": max(sizes, default=0)}
+        stats["frontline"] = len(self.frontline)
+        stats["frontline_edges"] = self.frontline_edges
+        return stats
@@ -0,0 +1,51 @@
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def make_world(tmp_path):
+    """
+    Writes a config and a random unit file to tmp_path and returns their paths.
+    Extra keyword arguments are added to the config (for example chunk_size).
+    """
+    def make(cols=24, rows=18, units=60, seed=0, **config):
+        rng = random.Random(seed)
+        config_filename = tmp_path / "config.json"
+        units_filename = tmp_path / "units.json"
+        config_filename.write_text(json.dumps({"rows": rows, "cols": cols, "fps": 60, **config}))
+        units_filename.write_text(json.dumps([
+            {"col": rng.randrange(cols), "row": rng.randrange(rows), "team": rng.choice(("blue", "red")),
+             "speed": rng.choice((1, 2, 3))}
+            for _ in range(units)
+        ]))
+        return str(config_filename), str(units_filename)
+    return make
+
+@pytest.fixture
+def make_simulation():
+    """
+    Builds a seeded SimulationController for a world written by make_world.
+    """
+    import controllers
+    import initialization
+    from game_objects import Team
+
+    def make(config_filename, units_filename, **options):
+        blue = controllers.TeamController(Team.BLUE, random.Random(1))
+        red = controllers.TeamController(Team.RED, random.Random(2))
+        tiles = initialization.initialize_tiles(config_filename)
+        sim = controllers.SimulationController(blue, red, tiles, config_filename, **options)
+        initialization.load_units(units_filename, blue, red, sim)
+        return sim
+    return make
+
+def step_randomly(sim, steps: int, delta_time: int = 50):
+    for _ in range(steps):
+        sim.blue_controller.move_units_randomly()
+        sim.red_controller.move_units_randomly()
+        sim.update(delta_time)
@@ -0,0 +1,93 @@
+import random
+
+import pytest
+
+import event_log
+from controllers import SimulationController, TeamController
+from game_objects import Direction, Team, TileGrid
+
+def record_run(filename, ticks=120, keyframe_interval=25, close=True):
+    """
+    Records a small seeded run and returns {time: (tile codes, unit positions)} after each tick.
+    """
+    blue, red = TeamController(Team.BLUE, random.Random(1)), TeamController(Team.RED, random.Random(2))
+    log = event_log.EventLogWriter(filename, 6, 8, keyframe_interval, buffer_size=256)
+    sim = SimulationController(blue, red, TileGrid(8, 6), None, event_log=log)
+    rng = random.Random(9)
+    for _ in range(12):
+        team = rng.choice((Team.BLUE, Team.RED))
+        (blue if team is Team.BLUE else red).add_unit(sim.create_unit(rng.randrange(8), rng.randrange(6), team, 2))
+    states = {}
+    for _ in range(ticks):
+        sim.update(100)
+        states[sim.time] = (sim.tiles.tobytes(), [(unit.col, unit.row) for unit in sim.units])
+        blue.move_units_randomly()
+        red.move_units_randomly()
+    if close:
+        log.close()
+    else:
+        log.flush()
+        log.file.close()
+    return log, states
+
+def test_records_are_fixed_width(tmp_path):
+    filename = str(tmp_path / "run.log")
+    blue, red = TeamController(Team.BLUE), TeamController(Team.RED)
+    with event_log.EventLogWriter(filename, 4, 5) as log:
+        sim = SimulationController(blue, red, TileGrid(5, 4), None, event_log=log)
+        unit = sim.create_unit(1, 1, Team.RED, 4)
+        sim.move_unit(unit, Direction.E)
+        for _ in range(3):
+            sim.update(100)
+    reader = event_log.EventLogReader(filename)
+    try:
+        records = [record for _, record in reader.records(event_log.HEADER.size)]
+        assert reader.end == event_log.HEADER.size + len(records) * event_log.RECORD.size
+    finally:
+        reader.close()
+    assert [record[0] for record in records] == [
+        event_log.UNIT_ADDED, event_log.AFFILIATION, event_log.MOVE_START, event_log.MOVE_COMPLETE, event_log.AFFILIATION]
+    assert records[0][1:] == (2, 0, 0, 1, 1, 4.0)  # Red unit 0 at (1, 1) with speed 4
+    assert records[2][1:] == (3, 0, 0, 2, 1, 0.0)  # East to (2, 1) at time 0
+    assert records[3][1:] == (0, 3, 0, 2, 1, 300.0)
+
+@pytest.mark.parametrize("close", [True, False])
+def test_keyframe_index_survives_unclean_shutdown(tmp_path, close):
+    filename = str(tmp_path / "run.log")
+    log, _ = record_run(filename, close=close)
+    reader = event_log.EventLogReader(filename)
+    try:
+        assert reader.keyframes == log.keyframes
+        assert [tick for tick, _, _ in reader.keyframes] == [25, 50, 75, 100]
+    finally:
+        reader.close()
+
+def test_torn_keyframe_is_dropped(tmp_path):
+    filename = tmp_path / "run.log"
+    log, _ = record_run(str(filename), close=False)
+    filename.write_bytes(filename.read_bytes()[:log.keyframes[-1][2] + event_log.RECORD.size + 10])
+    reader = event_log.EventLogReader(str(filename))
+    try:
+        assert reader.keyframes == log.keyframes[:-1]
+    finally:
+        reader.close()
+
+def test_replay_seeks_by_time_in_both_directions(tmp_path):
+    filename = str(tmp_path / "run.log")
+    _, states = record_run(filename)
+    reader = event_log.EventLogReader(filename)
+    try:
+        replay = event_log.ReplayState(reader)
+        for time in (5000.0, 1200.0, 12000.0, 2500.0, 2600.0, 100.0):
+            replay.seek_time(time)
+            codes, positions = states[time]
+            assert replay.tiles.tobytes() == codes
+            assert [(unit.col, unit.row) for unit in replay.units] == positions
+    finally:
+        reader.close()
+
+def test_rejects_other_files(tmp_path):
+    filename = tmp_path / "other.log"
+    filename.write_bytes(b"NOTALOG!" + bytes(64))
+    with pytest.raises(ValueError):
+        event_log.EventLogReader(str(filename))
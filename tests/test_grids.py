@@ -0,0 +1,93 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+import gamelogic
+from controllers import SimulationController, TeamController
+from game_objects import ChunkedTileGrid, TileGrid, Team, DIRECTIONS
+from headless import HeadlessRunner
+from pathfinding import FlowField
+
+@pytest.mark.parametrize("rows, cols", [(1, 1), (7, 5), (18, 24)])
+def test_implicit_topology_matches_table(rows, cols):
+    table = gamelogic.HexTopology(rows, cols)
+    implicit = gamelogic.ImplicitHexTopology(rows, cols)
+    for cell in range(rows * cols):
+        assert implicit.neighbor_ring(cell) == table.neighbor_ring(cell)
+        assert implicit.neighbors_of(cell) == table.neighbors_of(cell)
+        for direction in range(len(DIRECTIONS)):
+            assert implicit.neighbor(cell, direction) == table.neighbor(cell, direction)
+
+def test_move_targets_match_table():
+    rows, cols = 9, 11
+    neighbors = gamelogic.HexTopology(rows, cols).as_array()
+    cells = np.repeat(np.arange(rows * cols), len(DIRECTIONS))
+    directions = np.tile(np.arange(len(DIRECTIONS)), rows * cols)
+    expected = neighbors[cells, directions]
+    implicit = gamelogic.ImplicitHexTopology(rows, cols)
+    assert np.array_equal(implicit.move_targets(cells, directions), expected)
+    assert np.array_equal(implicit.move_targets(np.arange(rows * cols)[:, None], np.arange(6)), neighbors)
+
+@pytest.mark.parametrize("implicit", [False, True])
+def test_get_move_target_follows_topology(implicit):
+    rows, cols = 9, 11
+    topology = gamelogic.get_topology(rows, cols, implicit)
+    neighbors = gamelogic.HexTopology(rows, cols).neighbors
+    for cell in range(rows * cols):
+        for direction in range(len(DIRECTIONS)):
+            target = neighbors[cell * 6 + direction]
+            move = gamelogic.get_move_target(*divmod(cell, rows), DIRECTIONS[direction], topology)
+            assert move == (None if target < 0 else divmod(target, rows))
+    assert gamelogic.get_move_target(cols, 0, DIRECTIONS[0], topology) is None
+    with pytest.raises(ValueError):
+        gamelogic.get_move_target(0, 0, "up", topology)
+
+@pytest.mark.parametrize("tiles, topology_type", [
+    (TileGrid(12, 10), gamelogic.HexTopology),
+    (ChunkedTileGrid(12, 10, chunk_size=4), gamelogic.ImplicitHexTopology),
+])
+def test_only_chunked_grids_skip_the_table(tiles, topology_type):
+    sim = SimulationController(TeamController(Team.BLUE), TeamController(Team.RED), tiles, None,
+                               use_unit_store=True)
+    assert type(sim.topology) is topology_type
+    assert sim.unit_store.topology is sim.topology
+    assert sim.occupancy.topology is sim.topology
+    assert sim.flow_fields.topology is sim.topology
+
+def test_flow_field_without_table_matches_table():
+    rows, cols = 14, 17
+    goals, blocked = {5, 100, 230}, {40, 41, 42, 57, 100}
+    table = FlowField(gamelogic.HexTopology(rows, cols), goals, blocked)
+    implicit = FlowField(gamelogic.ImplicitHexTopology(rows, cols), goals, blocked)
+    assert implicit.distance == table.distance
+    assert implicit.direction == table.direction
+
+def test_chunked_grid_reads_and_writes_like_dense():
+    dense = TileGrid(13, 10)
+    chunked = ChunkedTileGrid(13, 10, chunk_size=4)
+    rng = np.random.default_rng(1)
+    for _ in range(5):
+        cells = rng.integers(0, 130, size=40)
+        codes = rng.integers(0, 3, size=40).astype(np.int8)
+        assert [a.tolist() for a in dense.assign_codes(cells, codes)] == \
+               [a.tolist() for a in chunked.assign_codes(cells, codes)]
+        assert chunked.tobytes() == dense.tobytes()
+        assert np.array_equal(chunked.as_array(), dense.as_array())
+        assert chunked.get_counts() == dense.get_counts()
+        for code in (1, 2):
+            assert chunked.cells_with(code) == dense.cells_with(code)
+    chunked.load_codes(bytes(130))
+    assert not chunked.chunks
+
+@pytest.mark.parametrize("use_unit_store", [False, True])
+def test_chunked_run_matches_dense_run(make_world, use_unit_store):
+    config_filename, units_filename = make_world()
+    dense = HeadlessRunner(config_filename, units_filename, use_unit_store=use_unit_store, seed=3)
+    dense.run(300)
+    config_filename, units_filename = make_world(chunk_size=8)
+    chunked = HeadlessRunner(config_filename, units_filename, use_unit_store=use_unit_store, seed=3)
+    assert isinstance(chunked.tiles, ChunkedTileGrid)
+    assert isinstance(chunked.simulation_controller.topology, gamelogic.ImplicitHexTopology)
+    chunked.run(300)
+    assert chunked.tiles.tobytes() == dense.tiles.tobytes()
+    assert chunked.tiles.get_counts() == dense.tiles.get_counts()
@@ -0,0 +1,31 @@
+import io
+import json
+
+import pytest
+
+from initialization import iter_json_records
+
+RECORDS = [{"col": i, "row": i % 7, "team": "blue" if i % 2 else "red", "speed": 1.5} for i in range(50)]
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1 << 16])
+def test_iter_json_records_matches_json_load(chunk_size):
+    text = json.dumps(RECORDS, indent=2)
+    assert list(iter_json_records(io.StringIO(text), chunk_size)) == RECORDS
+    assert list(iter_json_records(io.StringIO("[ ]"), chunk_size)) == []
+    assert list(iter_json_records(io.StringIO(json.dumps(RECORDS[0])), chunk_size)) == [RECORDS[0]]
+
+@pytest.mark.parametrize("text", [
+    '[{"col": 1},]',
+    '[{"col": 1}, ]',
+    '[1, 2,\n]',
+    '[,]',
+    '[{"col": 1},,{"col": 2}]',
+    '[{"col": 1} {"col": 2}]',
+    '[{"col": 1}',
+    '{"col": 1',
+    '"units"',
+])
+@pytest.mark.parametrize("chunk_size", [1, 4, 1 << 16])
+def test_iter_json_records_rejects_malformed_arrays(text, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_json_records(io.StringIO(text), chunk_size))
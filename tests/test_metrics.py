@@ -0,0 +1,92 @@
+import csv
+import threading
+
+import pytest
+
+from metrics import FIELDS, MetricsSink, read_metrics, BLOCK_PRODUCER, DROP_NEWEST, DROP_OLDEST
+
+def row(i: int) -> tuple[float, ...]:
+    return tuple(float(i * 10 + field) for field in range(len(FIELDS)))
+
+def written_ids(sink, filename) -> list[int]:
+    if sink.binary:
+        return [int(value) // 10 for value in read_metrics(filename)["tick"]]
+    with open(filename, newline="") as f:
+        return [int(float(record["tick"])) // 10 for record in csv.DictReader(f)]
+
+def stall_writer(sink: MetricsSink) -> tuple[threading.Event, threading.Event]:
+    """
+    Makes the writer thread wait inside its next write until the returned release event
+    is set. The first event is set once the writer is waiting.
+    """
+    entered, release = threading.Event(), threading.Event()
+    write = sink._write
+
+    def stalled(rows):
+        entered.set()
+        release.wait()
+        write(rows)
+    sink._write = stalled
+    return entered, release
+
+@pytest.mark.parametrize("name", ["metrics.bin", "metrics.csv"])
+def test_round_trip_keeps_every_sample_in_order(tmp_path, name):
+    filename = str(tmp_path / name)
+    # A small blocking buffer makes the producer outrun the writer over and over
+    with MetricsSink(filename, capacity=16, policy=BLOCK_PRODUCER, flush_interval=0.01) as sink:
+        for i in range(1000):
+            sink.record(row(i))
+    assert written_ids(sink, filename) == list(range(1000))
+    assert sink.dropped == 0
+    if sink.binary:
+        columns = read_metrics(filename)
+        assert list(columns) == list(FIELDS)
+        assert columns["blue"][7] == row(7)[FIELDS.index("blue")]
+
+def test_decimation_keeps_every_nth_sample(tmp_path):
+    filename = str(tmp_path / "metrics.bin")
+    with MetricsSink(filename, every=3) as sink:
+        for i in range(10):
+            sink.record(row(i))
+    assert written_ids(sink, filename) == [0, 3, 6, 9]
+
+@pytest.mark.parametrize("policy, kept", [
+    (DROP_OLDEST, [0, 1, 4, 5, 6, 7]),
+    (DROP_NEWEST, [0, 1, 2, 3, 4, 5]),
+])
+def test_full_buffer_drops_by_policy(tmp_path, policy, kept):
+    filename = str(tmp_path / "metrics.bin")
+    sink = MetricsSink(filename, capacity=4, policy=policy, flush_interval=10)
+    entered, release = stall_writer(sink)
+    sink.record(row(0))
+    sink.record(row(1))  # Half full: the writer takes both rows and stalls writing them
+    assert entered.wait(5)
+    for i in range(2, 8):
+        sink.record(row(i))
+    assert sink.dropped == 2
+    release.set()
+    sink.close()
+    assert written_ids(sink, filename) == kept
+
+def test_full_buffer_blocks_producer_until_drained(tmp_path):
+    filename = str(tmp_path / "metrics.bin")
+    sink = MetricsSink(filename, capacity=4, policy=BLOCK_PRODUCER, flush_interval=10)
+    entered, release = stall_writer(sink)
+    sink.record(row(0))
+    sink.record(row(1))
+    assert entered.wait(5)
+    producer = threading.Thread(target=lambda: [sink.record(row(i)) for i in range(2, 8)])
+    producer.start()
+    producer.join(0.2)
+    assert producer.is_alive()  # Waiting for room after filling the buffer
+    release.set()
+    producer.join(5)
+    assert not producer.is_alive()
+    sink.close()
+    assert sink.dropped == 0
+    assert written_ids(sink, filename) == list(range(8))
+
+def test_rejects_bad_arguments(tmp_path):
+    for options in ({"capacity": 0}, {"every": 0}, {"policy": "spill"}):
+        with pytest.raises(ValueError):
+            MetricsSink(str(tmp_path / "metrics.bin"), **options)
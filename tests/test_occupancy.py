@@ -0,0 +1,141 @@
+import random
+
+import pytest
+
+from controllers import SimulationController, TeamController
+from game_objects import DIRECTIONS, Team, TileGrid
+from gamelogic import get_move_target, get_topology
+from occupancy import OccupancyIndex
+
+COLS, ROWS = 9, 7
+
+def hex_distances(col, row):
+    """
+    Hex steps from (col, row) to every tile, by breadth-first search over get_move_target().
+    """
+    topology = get_topology(ROWS, COLS)
+    distances = {(col, row): 0}
+    ring = [(col, row)]
+    while ring:
+        next_ring = []
+        for tile in ring:
+            for direction in DIRECTIONS:
+                target = get_move_target(*tile, direction, topology)
+                if target is not None and target not in distances:
+                    distances[target] = distances[tile] + 1
+                    next_ring.append(target)
+        ring = next_ring
+    return distances
+
+def scatter(count=60, seed=3):
+    """
+    Returns an index and the (team, col, row) it holds per unit id, with deliberate stacks.
+    """
+    rng = random.Random(seed)
+    index = OccupancyIndex(ROWS, COLS)
+    placed = []
+    for unit_id in range(count):
+        team = rng.choice((Team.BLUE, Team.RED))
+        col, row = (4, 3) if unit_id % 5 == 0 else (rng.randrange(COLS), rng.randrange(ROWS))
+        index.add(unit_id, team, col, row)
+        placed.append((team, col, row))
+    return index, placed
+
+def scan(placed, tiles, team=None):
+    return [unit_id for unit_id, (unit_team, col, row) in enumerate(placed)
+            if (col, row) in tiles and team in (None, unit_team)]
+
+@pytest.mark.parametrize("team", [None, Team.BLUE, Team.RED])
+def test_tile_queries_match_a_scan(team):
+    index, placed = scatter()
+    for col in range(COLS):
+        for row in range(ROWS):
+            expected = scan(placed, {(col, row)}, team)
+            assert index.units_at(col, row, team) == expected
+            assert index.count_at(col, row, team) == len(expected)
+            counts = index.counts_at(col, row)
+            assert counts == {Team.BLUE: len(scan(placed, {(col, row)}, Team.BLUE)),
+                              Team.RED: len(scan(placed, {(col, row)}, Team.RED))}
+            assert index.is_contested(col, row) == (counts[Team.BLUE] > 0 and counts[Team.RED] > 0)
+
+@pytest.mark.parametrize("center", [(0, 0), (4, 3), (8, 6), (3, 0)])
+def test_radius_queries_match_a_scan(center):
+    index, placed = scatter()
+    distances = hex_distances(*center)
+    for radius in range(4):
+        within = {tile for tile, distance in distances.items() if distance <= radius}
+        cells = index.cells_within(*center, radius)
+        assert sorted(cells) == sorted(col * ROWS + row for col, row in within)
+        assert [distances[divmod(cell, ROWS)] for cell in cells] == sorted(distances[divmod(cell, ROWS)] for cell in cells)
+        assert index.units_within(*center, radius) == scan(placed, within)
+        assert index.units_within(*center, radius, Team.RED) == scan(placed, within, Team.RED)
+    ring = {tile for tile, distance in distances.items() if distance == 1}
+    assert index.units_adjacent(*center) == scan(placed, ring)
+    assert index.units_adjacent(*center, Team.BLUE) == scan(placed, ring, Team.BLUE)
+
+def test_stacks_shrink_back_to_a_single_id_and_then_nothing():
+    index = OccupancyIndex(ROWS, COLS)
+    index.add(0, Team.BLUE, 2, 2)
+    index.add(1, Team.RED, 2, 2)
+    index.add(2, Team.BLUE, 2, 2)
+    assert index.units_at(2, 2) == [0, 1, 2]
+    assert index.is_contested(2, 2)
+
+    index.move(1, (2, 2), (2, 3))
+    assert index.units_at(2, 2) == [0, 2]
+    assert not index.is_contested(2, 2)
+    index.remove(0, 2, 2)
+    assert index.occupants[2 * ROWS + 2] == 2  # A lone unit is stored bare, not as a set
+    index.remove(2, 2, 2)
+    assert 2 * ROWS + 2 not in index.occupants
+    assert index.units_at(2, 2) == []
+    assert index.counts_at(2, 3) == {Team.BLUE: 0, Team.RED: 1}
+
+def test_batch_operations_match_single_ones():
+    single, batch = OccupancyIndex(ROWS, COLS), OccupancyIndex(ROWS, COLS)
+    cells = [5, 5, 12, 40, 5]
+    codes = [1, 2, 2, 1, 1]
+    for unit_id, (cell, code) in enumerate(zip(cells, codes)):
+        single.add(unit_id, (Team.BLUE, Team.RED)[code - 1], *divmod(cell, ROWS))
+    batch.add_many(range(5), codes, cells)
+    assert batch.occupants == single.occupants
+    assert batch.unit_codes == single.unit_codes
+
+    moves = [(0, 5, 6), (2, 12, 5), (4, 5, 40)]
+    for unit_id, old_cell, new_cell in moves:
+        single.move(unit_id, divmod(old_cell, ROWS), divmod(new_cell, ROWS))
+    batch.move_many(*zip(*moves))
+    assert batch.occupants == single.occupants
+
+def brute_force_occupancy(sim):
+    expected = {}
+    for unit in sim.units:
+        expected.setdefault((unit.col, unit.row), []).append(unit.unit_id)
+    return expected
+
+@pytest.mark.parametrize("use_unit_store", [False, True])
+def test_controller_keeps_the_index_in_step_with_its_units(use_unit_store):
+    if use_unit_store:
+        pytest.importorskip("numpy")
+    blue, red = TeamController(Team.BLUE, random.Random(5)), TeamController(Team.RED, random.Random(6))
+    sim = SimulationController(blue, red, TileGrid(COLS, ROWS), None, use_unit_store=use_unit_store)
+    rng = random.Random(11)
+    for _ in range(40):
+        team = rng.choice((Team.BLUE, Team.RED))
+        unit = sim.create_unit(rng.randrange(COLS), rng.randrange(ROWS), team, rng.choice((1, 2, 3)))
+        if not use_unit_store:
+            (blue if team is Team.BLUE else red).add_unit(unit)
+    start = [(unit.col, unit.row) for unit in sim.units]
+    for _ in range(150):
+        blue.move_units_randomly()
+        red.move_units_randomly()
+        sim.update(16)
+        expected = brute_force_occupancy(sim)
+        for col in range(COLS):
+            for row in range(ROWS):
+                assert sim.occupancy.units_at(col, row) == expected.get((col, row), [])
+    assert start != [(unit.col, unit.row) for unit in sim.units]
+    unit = sim.units[0]
+    assert [neighbor.unit_id for neighbor in sim.adjacent_enemies(unit)] == \
+        [other.unit_id for other in sim.units if other.team is not unit.team
+         and hex_distances(unit.col, unit.row)[(other.col, other.row)] == 1]
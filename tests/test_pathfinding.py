@@ -0,0 +1,142 @@
+import random
+
+import pytest
+
+import pathfinding
+from controllers import SimulationController, TeamController
+from game_objects import DIRECTIONS, Team, TileGrid
+from gamelogic import get_move_target, get_topology
+from pathfinding import UNREACHABLE, FlowField, FlowFieldCache
+
+COLS, ROWS = 11, 8
+
+@pytest.fixture(params=["numpy", "python"])
+def build(request, monkeypatch):
+    """
+    Runs a test once per way of building fields; the Python path is forced by hiding NumPy.
+    """
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(pathfinding, "np", None)
+    return request.param
+
+def cell(col, row):
+    return col * ROWS + row
+
+def bfs_distances(goals, blocked=frozenset()):
+    """
+    Moves from every tile to the nearest goal, by breadth-first search over get_move_target().
+    """
+    topology = get_topology(ROWS, COLS)
+    distances = {goal: 0 for goal in goals if goal not in blocked}
+    frontier = list(distances)
+    while frontier:
+        next_frontier = []
+        for col, row in (divmod(index, ROWS) for index in frontier):
+            for direction in DIRECTIONS:
+                target = get_move_target(col, row, direction, topology)
+                if target is not None and cell(*target) not in distances and cell(*target) not in blocked:
+                    distances[cell(*target)] = distances[cell(col, row)] + 1
+                    next_frontier.append(cell(*target))
+        frontier = next_frontier
+    return [distances.get(index, UNREACHABLE) for index in range(COLS * ROWS)]
+
+def check_directions(field):
+    topology = get_topology(ROWS, COLS)
+    for index in range(COLS * ROWS):
+        col, row = divmod(index, ROWS)
+        distance = field.distance_to_goal(col, row)
+        direction = field.next_direction(col, row)
+        if distance <= 0:
+            assert direction == -1
+            continue
+        # The first direction in DIRECTIONS order that leads one step closer
+        targets = [get_move_target(col, row, d, topology) for d in DIRECTIONS]
+        closer = [index for index, target in enumerate(targets)
+                  if target is not None and field.distance_to_goal(*target) == distance - 1]
+        assert direction == closer[0]
+
+@pytest.mark.parametrize("goals", [[cell(0, 0)], [cell(5, 4)], [cell(0, 7), cell(10, 0), cell(6, 3)]])
+def test_distances_match_breadth_first_search(build, goals):
+    field = FlowField(get_topology(ROWS, COLS), goals)
+    assert list(field.distance) == bfs_distances(goals)
+    check_directions(field)
+
+def test_blocked_cells_are_walked_around(build):
+    wall = {cell(4, row) for row in range(ROWS - 1)}  # Leaves a gap in the bottom row
+    goals = [cell(8, 2), cell(4, 3)]  # The second goal is blocked and ignored
+    field = FlowField(get_topology(ROWS, COLS), goals, wall)
+    assert list(field.distance) == bfs_distances(goals, wall)
+    check_directions(field)
+    assert all(field.distance[blocked] == UNREACHABLE and field.direction[blocked] == -1 for blocked in wall)
+    assert field.distance_to_goal(0, 0) > field.distance_to_goal(8, 0)
+
+def test_sealed_off_cells_are_unreachable(build):
+    wall = {cell(4, row) for row in range(ROWS)}
+    field = FlowField(get_topology(ROWS, COLS), [cell(8, 2)], wall)
+    assert field.distance_to_goal(1, 1) == UNREACHABLE
+    assert field.next_direction(1, 1) == -1
+    assert field.distance_to_goal(6, 6) > 0
+
+def test_builds_agree():
+    pytest.importorskip("numpy")
+    topology = get_topology(ROWS, COLS)
+    blocked = set(random.Random(4).sample(range(COLS * ROWS), 20))
+    fast = FlowField(topology, [cell(2, 5), cell(9, 1)], blocked)
+    pathfinding.np, np = None, pathfinding.np
+    try:
+        slow = FlowField(topology, [cell(2, 5), cell(9, 1)], blocked)
+    finally:
+        pathfinding.np = np
+    assert fast.distance == slow.distance
+    assert fast.direction == slow.direction
+
+@pytest.mark.parametrize("goal", [-1, COLS * ROWS])
+def test_goal_outside_the_grid_is_rejected(goal):
+    with pytest.raises(ValueError):
+        FlowField(get_topology(ROWS, COLS), [goal])
+
+def test_cache_shares_evicts_and_invalidates():
+    cache = FlowFieldCache(get_topology(ROWS, COLS), max_fields=2)
+    first = cache.get([cell(1, 1), cell(2, 2)])
+    assert cache.get((cell(2, 2), cell(1, 1))) is first  # Goal order does not matter
+    second = cache.get([cell(3, 3)])
+    cache.get([cell(4, 4)])  # Evicts the oldest goal set
+    assert list(cache.fields) == [frozenset([cell(3, 3)]), frozenset([cell(4, 4)])]
+    assert cache.get([cell(1, 1), cell(2, 2)]) is not first
+
+    cache.set_blocked([cell(5, 5)])
+    assert not cache.fields
+    blocked_field = cache.get([cell(3, 3)])
+    assert blocked_field is not second and blocked_field.blocked == {cell(5, 5)}
+    cache.set_blocked({cell(5, 5)})  # Unchanged: fields stay
+    assert cache.get([cell(3, 3)]) is blocked_field
+
+@pytest.mark.parametrize("use_unit_store", [False, True])
+def test_units_walk_to_their_goals(use_unit_store):
+    if use_unit_store:
+        pytest.importorskip("numpy")
+    blue, red = TeamController(Team.BLUE, random.Random(1)), TeamController(Team.RED, random.Random(2))
+    sim = SimulationController(blue, red, TileGrid(COLS, ROWS), None, use_unit_store=use_unit_store)
+    starts = [(0, 0), (10, 7), (5, 0), (0, 7)]
+    for col, row in starts:
+        unit = sim.create_unit(col, row, Team.BLUE, 3)
+        if not use_unit_store:
+            blue.add_unit(unit)
+    blue.set_goals([(6, 4)])
+    for _ in range(200):
+        blue.move_units_to_goals()
+        sim.update(16)
+    assert [(unit.col, unit.row) for unit in sim.units] == [(6, 4)] * len(starts)
+    assert not any(unit.is_moving for unit in sim.units)
+
+def test_set_goals_rejects_tiles_outside_the_grid():
+    blue, red = TeamController(Team.BLUE), TeamController(Team.RED)
+    SimulationController(blue, red, TileGrid(COLS, ROWS), None)
+    with pytest.raises(ValueError):
+        blue.set_goals([(COLS, 0)])
+    with pytest.raises(ValueError):
+        blue.set_goals([(0, -1)])
+    blue.set_goals([])
+    blue.move_units_to_goals()  # No goals: nothing to do
@@ -0,0 +1,22 @@
+from profiler import FrameProfiler, NULL_PROFILER
+
+def test_tick_samples_stay_out_of_the_frame():
+    profiler = FrameProfiler(history=10)
+    for _ in range(3):
+        profiler.begin_frame()
+        for _ in range(100):  # A fast-forwarded frame runs many ticks
+            profiler.sample("tick_update", 2_000_000)
+        profiler.mark("simulate")
+        profiler.end_frame()
+    stats = profiler.stats()
+    assert set(stats) == {"tick_update", "simulate"}
+    assert stats["tick_update"] == (2.0, 2.0, 2.0)
+    assert len(profiler.samples["simulate"]) == 3
+    assert [[phase for phase, _, _ in frame] for frame in profiler.trace] == [["simulate"]] * 3
+
+def test_null_profiler_accepts_every_hook():
+    assert not NULL_PROFILER.enabled
+    NULL_PROFILER.begin_frame()
+    NULL_PROFILER.sample("tick_update", 1)
+    NULL_PROFILER.mark("simulate")
+    NULL_PROFILER.end_frame()
@@ -0,0 +1,83 @@
+import os
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from game_objects import ChunkedTileGrid, TileGrid, TEAM_CODES
+from renderer import PixelMap, pixel_to_tile
+
+@pytest.mark.parametrize("size", [7.3, 12, 25.5])
+def test_pixel_map_matches_pixel_to_tile_while_panning(size):
+    rng = random.Random(0)
+    pixel_map = PixelMap(30, 25, size, (160, 120))
+    for _ in range(200):
+        offset = (rng.uniform(-100, 600), rng.uniform(-100, 500))
+        x, y = rng.randrange(160), rng.randrange(120)
+        # The patch is placed on whole pixels, so boundaries may move by one pixel
+        near = set()
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                col, row = pixel_to_tile(x + offset[0] + dx, y + offset[1] + dy, size)
+                near.add((col, row) if 0 <= col < 30 and 0 <= row < 25 else None)
+        assert pixel_map.tile_at(x, y, offset) in near
+
+def test_pixel_map_paints_chunked_grid_like_dense():
+    codes = np.random.default_rng(0).integers(0, 3, 30 * 25).astype(np.int8).tobytes()
+    dense, chunked = TileGrid(30, 25), ChunkedTileGrid(30, 25, chunk_size=4)
+    dense.load_codes(codes)
+    chunked.load_codes(codes)
+    pixel_map = PixelMap(30, 25, 12, (160, 120))
+    surface = pygame.Surface((160, 120))
+    for offset in ((0, 0), (-50.5, -20.25), (200.7, 180.1), (2000, 2000)):
+        pixel_map.draw(surface, dense, offset)
+        expected = pygame.surfarray.array3d(surface)
+        pixel_map.draw(surface, chunked, offset)
+        assert (pygame.surfarray.array3d(surface) == expected).all()
+
+def fresh_screen(tiles, hex_size, camera=(0, 0)):
+    from renderer import RenderController
+    controller = RenderController(pygame.Surface((400, 300)), 60, hex_size, tiles, [])
+    controller.camera.x, controller.camera.y = camera
+    controller.draw_map()
+    return pygame.surfarray.array3d(controller.screen)
+
+@pytest.mark.parametrize("hex_size", [8, 13.5, 20])
+def test_redrawn_tiles_match_fresh_chunks(hex_size):
+    pygame.font.init()
+    from renderer import RenderController
+    tiles = TileGrid(30, 24)
+    controller = RenderController(pygame.Surface((400, 300)), 60, hex_size, tiles, [])
+    controller.camera.x, controller.camera.y = 37.5, 21.25
+    controller.draw_map()
+    rng = random.Random(3)
+    teams = list(TEAM_CODES)
+    for _ in range(4):
+        for _ in range(60):
+            tiles.set_affiliation(rng.randrange(30), rng.randrange(24), rng.choice(teams))
+        controller.draw_map()
+        redrawn = pygame.surfarray.array3d(controller.screen)
+        assert (redrawn == fresh_screen(tiles, hex_size, (37.5, 21.25))).all()
+
+def test_large_map_is_drawn_from_cached_chunks(monkeypatch):
+    pygame.font.init()
+    from renderer import RenderController
+    tiles = TileGrid(200, 200)
+    controller = RenderController(pygame.Surface((1280, 720)), 60, 40, tiles, [])
+    rendered = []
+    render_chunk = RenderController.render_chunk
+    monkeypatch.setattr(RenderController, "render_chunk",
+                        lambda self, *chunk: rendered.append(chunk[:2]) or render_chunk(self, *chunk))
+    controller.draw_map()
+    first = len(rendered)
+    assert 0 < first <= 12  # Only the chunks in view, not all 200 x 200 tiles
+    tiles.set_affiliation(3, 4, list(TEAM_CODES)[1])
+    controller.camera.pan(30, 20)
+    controller.draw_map()
+    assert len(rendered) == first  # Panning and repainting a tile reuse the cached chunks
+    controller.camera.zoom_at(1.1, 640, 360)
+    controller.draw_map()
+    assert first < len(rendered) <= 2 * first + 4
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+from controllers import SimulationController, TeamController
+from game_objects import Direction, Team, TileGrid
+
+def make_sim(use_scheduler, units=30, cols=10, rows=8):
+    blue, red = TeamController(Team.BLUE, random.Random(1)), TeamController(Team.RED, random.Random(2))
+    sim = SimulationController(blue, red, TileGrid(cols, rows), None, use_scheduler=use_scheduler)
+    rng = random.Random(7)
+    for _ in range(units):
+        team = rng.choice((Team.BLUE, Team.RED))
+        (blue if team is Team.BLUE else red).add_unit(
+            sim.create_unit(rng.randrange(cols), rng.randrange(rows), team, rng.choice((1, 2, 3))))
+    return sim
+
+def state(sim):
+    return [(unit.col, unit.row, unit.is_moving, unit.target_tile, round(unit.move_progress, 9))
+            for unit in sim.units]
+
+def test_scheduled_run_matches_per_unit_updates():
+    loop, scheduled = make_sim(False), make_sim(True)
+    delta_rng = random.Random(3)
+    for _ in range(200):
+        delta_time = delta_rng.choice((16, 17, 50, 333))
+        for sim in (loop, scheduled):
+            sim.blue_controller.move_units_randomly()
+            sim.red_controller.move_units_randomly()
+            sim.update(delta_time)
+        assert state(scheduled) == state(loop)
+    assert scheduled.tiles.tobytes() == loop.tiles.tobytes()
+    assert (scheduled.moves_started, scheduled.moves_completed) == (loop.moves_started, loop.moves_completed)
+
+def test_update_only_touches_due_moves():
+    sim = make_sim(True, units=0)
+    slow = sim.create_unit(3, 3, Team.BLUE, 1)  # 1000 ms moves
+    fast = sim.create_unit(3, 3, Team.RED, 4)  # 250 ms moves
+    idle = sim.create_unit(0, 0, Team.BLUE, 2)
+    sim.move_unit(slow, Direction.E)
+    sim.move_unit(fast, Direction.W)
+    assert len(sim.move_queue) == 2
+
+    sim.update(100)
+    assert len(sim.move_queue) == 2
+    assert slow.elapsed_time == 0  # Not visited; progress is derived from the clock
+    assert slow.move_progress == pytest.approx(0.1)
+    assert fast.move_progress == pytest.approx(0.4)
+
+    sim.update(150)
+    assert [entry[2] for entry in sim.move_queue] == [slow]
+    assert not fast.is_moving and (fast.col, fast.row) == (2, 3)
+    assert fast.move_progress == 1.0
+    assert slow.move_progress == pytest.approx(0.25)
+    assert not idle.is_moving
+
+def test_scheduler_rejects_unit_store():
+    with pytest.raises(ValueError):
+        SimulationController(TeamController(Team.BLUE), TeamController(Team.RED), TileGrid(4, 4), None,
+                             use_unit_store=True, use_scheduler=True)
@@ -0,0 +1,51 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from headless import HeadlessRunner
+from sharded import ShardedSimulation
+
+@pytest.mark.parametrize("shard_cols, shard_rows", [(1, 1), (2, 1), (2, 2), (3, 2)])
+def test_sharded_run_matches_single_process(make_world, shard_cols, shard_rows):
+    config_filename, units_filename = make_world(units=200)
+    reference = HeadlessRunner(config_filename, units_filename, use_unit_store=True, seed=5)
+    reference.run(200)
+    runner = HeadlessRunner(config_filename, units_filename, use_unit_store=True, seed=5)
+    with ShardedSimulation(runner, shard_cols, shard_rows) as sharded:
+        sharded.run(200)
+        assert sharded.tile_codes() == reference.tiles.tobytes()
+        assert sharded.get_counts() == reference.tiles.get_counts()
+
+def test_dead_worker_fails_step_instead_of_hanging(make_world):
+    config_filename, units_filename = make_world()
+    runner = HeadlessRunner(config_filename, units_filename, use_unit_store=True, seed=5)
+    sharded = ShardedSimulation(runner, 2, 1, timeout=5.0)
+    sharded.run(10)
+    sharded.workers[1].kill()
+    sharded.workers[1].join()
+    with pytest.raises(RuntimeError, match="shard 1 exited"):
+        sharded.step()
+    assert not sharded.workers
+    sharded.close()  # Already shut down
+
+def test_dead_worker_fails_close(make_world):
+    config_filename, units_filename = make_world()
+    runner = HeadlessRunner(config_filename, units_filename, use_unit_store=True, seed=5)
+    sharded = ShardedSimulation(runner, 2, 2, timeout=5.0)
+    sharded.run(10)
+    sharded.workers[0].kill()
+    sharded.workers[0].join()
+    with pytest.raises(RuntimeError, match="shard 0 exited"):
+        sharded.close()
+
+def test_worker_error_fails_step_instead_of_hanging(make_world):
+    config_filename, units_filename = make_world()
+    runner = HeadlessRunner(config_filename, units_filename, use_unit_store=True, seed=5)
+    sharded = ShardedSimulation(runner, 2, 2, timeout=5.0)
+    sharded.run(10)
+    sharded.shared["is_moving"][:] = True
+    sharded.shared["elapsed_time"][:] = 1e9  # Every move completes this tick,
+    sharded.shared["target_col"][:] = 10 ** 6  # onto a cell off the map
+    with pytest.raises(RuntimeError, match="exited with code 1"):
+        sharded.step()
+    assert not sharded.workers
@@ -0,0 +1,66 @@
+import os
+import random
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from controllers import SimulationController, TeamController
+from game_objects import Team, TileGrid
+from renderer import RenderController
+from sim_thread import SimulationThread
+
+def make_thread(cols=16, rows=12, units=40):
+    rng = random.Random(5)
+    tiles = TileGrid(cols, rows)
+    sim = SimulationController(TeamController(Team.BLUE, random.Random(1)), TeamController(Team.RED, random.Random(2)),
+                               tiles, None, track_territory=True)
+    for _ in range(units):
+        sim.create_unit(rng.randrange(cols), rng.randrange(rows), rng.choice((Team.BLUE, Team.RED)), 3)
+    return sim, SimulationThread(sim, tick_ms=50, max_snapshot_age=0)
+
+def tick(sim):
+    sim.blue_controller.move_units_randomly()
+    sim.red_controller.move_units_randomly()
+    sim.update(50)
+
+def test_snapshots_carry_only_changed_tiles():
+    pygame.font.init()
+    sim, thread = make_thread()
+    mirror = TileGrid(sim.tiles.cols, sim.tiles.rows)
+    view = RenderController(pygame.Surface((200, 150)), 60, 10, mirror, [])
+    first = thread.take_snapshot()
+    assert first.codes == sim.tiles.tobytes() and first.changes is None
+    view.show_snapshot(first)
+    for step in range(60):
+        tick(sim)
+        thread.publish()
+        if step % 3 == 0:  # The renderer misses some snapshots; their changes must not be lost
+            snapshot = thread.take_snapshot()
+            assert snapshot.codes is None
+            view.show_snapshot(snapshot)
+            assert mirror.tobytes() == sim.tiles.tobytes()
+            assert mirror.get_counts() == sim.tiles.get_counts()
+            assert view.territory.get_stats() == sim.territory.get_stats()
+
+def test_untaken_first_snapshot_stays_complete():
+    sim, thread = make_thread()
+    tick(sim)
+    thread.publish()
+    snapshot = thread.take_snapshot()
+    assert snapshot.codes == sim.tiles.tobytes()
+
+def test_speed_changes_apply_while_running():
+    sim, thread = make_thread()
+    thread.speed = 0.001  # One tick every 50 real seconds
+    thread.start()
+    try:
+        thread.speed = None  # Back to back from the next tick
+        deadline = pygame.time.get_ticks() + 5000
+        while sim.tick < 20 and pygame.time.get_ticks() < deadline:
+            pygame.time.wait(10)
+    finally:
+        thread.stop()
+    assert sim.tick >= 20
+    assert thread.status().startswith("Speed: max")
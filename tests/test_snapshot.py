@@ -0,0 +1,114 @@
+import random
+
+import pytest
+
+import controllers
+import event_log
+from conftest import step_randomly
+from game_objects import Direction, Team, TileGrid, TEAM_CODES
+from headless import HeadlessRunner
+
+def unit_state(sim):
+    return [(unit.col, unit.row, unit.team, unit.is_moving, unit.target_tile) for unit in sim.units]
+
+def restore(filename):
+    blue = controllers.TeamController(Team.BLUE, random.Random())
+    red = controllers.TeamController(Team.RED, random.Random())
+    return controllers.SimulationController.from_snapshot(filename, blue, red)
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"use_scheduler": True},
+    {"use_unit_store": True},
+    {"track_territory": True},
+    {"use_unit_store": True, "track_territory": True},
+])
+@pytest.mark.parametrize("chunk_size", [None, 4])
+def test_snapshot_round_trip_continues_identically(tmp_path, make_world, make_simulation, options, chunk_size):
+    if options.get("use_unit_store"):
+        pytest.importorskip("numpy")
+    extra = {} if chunk_size is None else {"chunk_size": chunk_size}
+    sim = make_simulation(*make_world(**extra), **options)
+    step_randomly(sim, 150)
+    filename = str(tmp_path / "state.snap")
+    sim.save_snapshot(filename)
+    restored = restore(filename)
+
+    assert type(restored.tiles) is type(sim.tiles)
+    if chunk_size is not None:
+        assert restored.tiles.chunk_size == chunk_size
+        assert set(restored.tiles.chunks) == set(sim.tiles.chunks)
+    assert (restored.tick, restored.time) == (sim.tick, sim.time)
+    assert (restored.moves_started, restored.moves_completed) == (sim.moves_started, sim.moves_completed)
+    assert (restored.territory is None) == (sim.territory is None)
+
+    step_randomly(sim, 150)
+    step_randomly(restored, 150)
+    assert restored.tiles.tobytes() == sim.tiles.tobytes()
+    assert restored.tiles.get_counts() == sim.tiles.get_counts()
+    assert unit_state(restored) == unit_state(sim)
+    assert (restored.moves_started, restored.moves_completed) == (sim.moves_started, sim.moves_completed)
+    if sim.territory is not None:
+        assert restored.territory.frontline == sim.territory.frontline
+        assert restored.territory.frontline_edges == sim.territory.frontline_edges
+        for team in (Team.BLUE, Team.RED):
+            restored.territory.rebuild_team(TEAM_CODES[team])
+            sim.territory.rebuild_team(TEAM_CODES[team])
+            assert restored.territory.region_sizes(team) == sim.territory.region_sizes(team)
+
+def test_restore_rejects_other_files(tmp_path):
+    filename = tmp_path / "not.snap"
+    filename.write_bytes(b"HOISNAP\0\x01\x00")
+    with pytest.raises(ValueError):
+        restore(str(filename))
+
+@pytest.mark.parametrize("use_unit_store", [False, True])
+def test_replay_reproduces_recorded_run(tmp_path, make_world, use_unit_store):
+    if use_unit_store:
+        pytest.importorskip("numpy")
+    filename = str(tmp_path / "run.log")
+    runner = HeadlessRunner(*make_world(), use_unit_store=use_unit_store, seed=4, event_log_filename=filename,
+                            keyframe_interval=50)
+    checkpoints = {}
+    for tick in range(1, 181):
+        runner.step()
+        if tick % 30 == 0:
+            checkpoints[tick] = runner.tiles.tobytes()
+    runner.close()
+
+    reader = event_log.EventLogReader(filename)
+    try:
+        state = event_log.ReplayState(reader)
+        for tick in (60, 30, 180, 120, 90):  # Backwards seeks restart from a keyframe
+            state.seek_tick(tick)
+            assert state.tiles.tobytes() == checkpoints[tick]
+    finally:
+        reader.close()
+
+@pytest.mark.parametrize("use_unit_store", [False, True])
+def test_restore_logs_only_a_keyframe(tmp_path, use_unit_store):
+    if use_unit_store:
+        pytest.importorskip("numpy")
+    tiles = TileGrid(6, 5)
+    sim = controllers.SimulationController(controllers.TeamController(Team.BLUE), controllers.TeamController(Team.RED),
+                                           tiles, None, use_unit_store=use_unit_store)
+    for col, row, team in ((0, 0, Team.BLUE), (3, 2, Team.RED), (5, 4, Team.BLUE)):
+        sim.create_unit(col, row, team, 2)
+    sim.move_unit(sim.units[1], Direction.E)
+    sim.update(100)
+    snapshot_filename = str(tmp_path / "state.snap")
+    sim.save_snapshot(snapshot_filename)
+
+    log_filename = str(tmp_path / "restored.log")
+    with event_log.EventLogWriter(log_filename, 5, 6) as log:
+        restored = controllers.SimulationController.from_snapshot(
+            snapshot_filename, controllers.TeamController(Team.BLUE), controllers.TeamController(Team.RED), log)
+    reader = event_log.EventLogReader(log_filename)
+    try:
+        assert [record[0] for _, record in reader.records(event_log.HEADER.size)] == [event_log.KEYFRAME]
+        _, _, codes, units = reader.read_keyframe(reader.keyframes[0][2])
+        assert bytes(codes) == tiles.tobytes()
+        assert len(units) == 3
+    finally:
+        reader.close()
+    assert unit_state(restored) == unit_state(sim)
@@ -0,0 +1,76 @@
+from collections import deque
+
+import pytest
+
+import gamelogic
+from conftest import step_randomly
+from game_objects import Team, TEAM_CODES
+from territory import TerritoryTracker
+
+def flood_fill_stats(tiles) -> dict:
+    """
+    Computes the tracker's metrics from scratch: region sizes per team by flood fill,
+    plus the frontline tiles and blue/red adjacencies.
+    """
+    topology = gamelogic.HexTopology(tiles.rows, tiles.cols)
+    codes = tiles.tobytes()
+    sizes = {TEAM_CODES[Team.BLUE]: [], TEAM_CODES[Team.RED]: []}
+    seen = set()
+    for start, code in enumerate(codes):
+        if not code or start in seen:
+            continue
+        seen.add(start)
+        queue = deque([start])
+        size = 0
+        while queue:
+            cell = queue.popleft()
+            size += 1
+            for neighbor in topology.neighbors_of(cell):
+                if codes[neighbor] == code and neighbor not in seen:
+                    seen.add(neighbor)
+                    queue.append(neighbor)
+        sizes[code].append(size)
+    frontline = {cell for cell, code in enumerate(codes)
+                 if code and any(codes[n] == 3 - code for n in topology.neighbors_of(cell))}
+    edges = sum(1 for cell, code in enumerate(codes) if code == TEAM_CODES[Team.BLUE]
+                for n in topology.neighbors_of(cell) if codes[n] == TEAM_CODES[Team.RED])
+    return {"sizes": {code: sorted(found, reverse=True) for code, found in sizes.items()},
+            "frontline": frontline, "edges": edges}
+
+def assert_matches(tracker, expected, regions=True):
+    assert tracker.frontline == expected["frontline"]
+    assert tracker.frontline_edges == expected["edges"]
+    if regions:
+        for team in (Team.BLUE, Team.RED):
+            assert tracker.region_sizes(team) == expected["sizes"][TEAM_CODES[team]]
+
+@pytest.mark.parametrize("use_unit_store, chunk_size", [(False, None), (True, None), (True, 4)])
+def test_incremental_tracking_matches_flood_fill(make_world, make_simulation, use_unit_store, chunk_size):
+    if use_unit_store:
+        pytest.importorskip("numpy")
+    extra = {} if chunk_size is None else {"chunk_size": chunk_size}
+    sim = make_simulation(*make_world(cols=16, rows=12, units=80, **extra), use_unit_store=use_unit_store,
+                          track_territory=True)
+    sim.territory.rebuild_interval = 1
+    for _ in range(400):
+        step_randomly(sim, 1)
+        assert_matches(sim.territory, flood_fill_stats(sim.tiles))
+
+def test_stale_regions_catch_up_on_rebuild(make_world, make_simulation):
+    sim = make_simulation(*make_world(cols=16, rows=12, units=80), track_territory=True)
+    tracker = sim.territory
+    for _ in range(300):
+        step_randomly(sim, 1)
+        expected = flood_fill_stats(sim.tiles)
+        assert_matches(tracker, expected, regions=False)
+        for team in (Team.BLUE, Team.RED):
+            if not tracker.regions[TEAM_CODES[team]].stale:
+                assert tracker.region_sizes(team) == expected["sizes"][TEAM_CODES[team]]
+    for code in tracker.regions:
+        tracker.rebuild_team(code)
+    assert_matches(tracker, flood_fill_stats(sim.tiles))
+
+def test_tracker_reads_existing_affiliations(make_world, make_simulation):
+    sim = make_simulation(*make_world(cols=16, rows=12, units=80, chunk_size=4))
+    step_randomly(sim, 100)
+    assert_matches(TerritoryTracker(sim.tiles, sim.topology), flood_fill_stats(sim.tiles))
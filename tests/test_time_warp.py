@@ -0,0 +1,82 @@
+import pytest
+
+import time_warp
+from time_warp import SPEEDS, TimeWarp
+
+class FakeClock:
+    """
+    Stands in for time.perf_counter() in time_warp; each tick costs tick_cost seconds.
+    """
+    def __init__(self, tick_cost=0.0):
+        self.now = 100.0
+        self.tick_cost = tick_cost
+        self.steps = []
+
+    def __call__(self):
+        return self.now
+
+    def step(self, step_ms):
+        self.steps.append(step_ms)
+        self.now += self.tick_cost
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(time_warp.time, "perf_counter", clock)
+    return clock
+
+def test_one_x_runs_one_tick_of_the_frame_delta(clock):
+    warp = TimeWarp(16, 12)
+    assert warp.advance(clock.step, 23) == 1
+    assert clock.steps == [23]
+
+def test_faster_speeds_run_fixed_ticks_and_carry_the_remainder(clock):
+    warp = TimeWarp(16, 12, speed_index=SPEEDS.index(10))
+    assert warp.advance(clock.step, 17) == 10  # 170 ms of simulated time, 10 ms left over
+    assert warp.advance(clock.step, 17) == 11  # 180 ms
+    assert set(clock.steps) == {16}
+    assert warp.pending_ms == 4
+
+def test_budget_caps_ticks_and_drops_the_backlog(clock):
+    clock.tick_cost = 0.004
+    warp = TimeWarp(16, 10, speed_index=SPEEDS.index(100))
+    assert warp.advance(clock.step, 16) == 3  # The third tick crosses the 10 ms budget
+    assert warp.pending_ms == 16  # 1600 ms were owed; at most one tick is carried over
+    clock.tick_cost = 0.0
+    assert warp.advance(clock.step, 0) == 1
+
+def test_max_speed_runs_until_the_budget_is_spent(clock):
+    clock.tick_cost = 0.001
+    warp = TimeWarp(16, 5, speed_index=SPEEDS.index(None))
+    assert warp.advance(clock.step, 16) == 5
+    assert warp.status() == "Speed: max (5 ticks/s)"
+
+def test_set_speed_forgets_time_owed_to_the_old_speed(clock):
+    warp = TimeWarp(16, 12, speed_index=SPEEDS.index(10))
+    warp.advance(clock.step, 17)
+    warp.set_speed(SPEEDS.index(100))
+    assert warp.pending_ms == 0
+    assert warp.speed == 100
+
+def test_render_every_skips_draws_until_enough_ticks_ran(clock):
+    warp = TimeWarp(16, 12, render_every=3)
+    draws = []
+    for _ in range(7):
+        warp.advance(clock.step, 16)
+        draws.append(warp.should_draw())
+    assert draws == [False, False, True, False, False, True, False]
+    assert warp.should_draw(force=True)
+    assert not warp.should_draw()
+
+def test_ticks_per_second_counts_the_last_second(clock):
+    warp = TimeWarp(16, 12, speed_index=SPEEDS.index(10))
+    for _ in range(10):
+        warp.advance(clock.step, 16)  # 10 ticks per frame
+        clock.now += 0.25
+    assert warp.ticks_per_second() == 50  # Frames at 0.0 .. 1.0 seconds ago
+    assert warp.status() == "Speed: 10x (50 ticks/s)"
+
+@pytest.mark.parametrize("arguments", [(0, 12), (16, 0), (16, 12, 0), (-1, 12)])
+def test_rejects_non_positive_parameters(arguments):
+    with pytest.raises(ValueError):
+        TimeWarp(*arguments)
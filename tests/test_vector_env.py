@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from controllers import SimulationController, TeamController
+from game_objects import Team, TileGrid, DIRECTIONS, TEAM_CODES
+from vector_env import STAY, VectorEnv
+
+COLS, ROWS = 9, 7
+
+def make_sim(use_unit_store):
+    blue, red = TeamController(Team.BLUE, random.Random(1)), TeamController(Team.RED, random.Random(2))
+    sim = SimulationController(blue, red, TileGrid(COLS, ROWS), None, use_unit_store=use_unit_store)
+    rng = random.Random(4)
+    for _ in range(25):
+        team = rng.choice((Team.BLUE, Team.RED))
+        (blue if team is Team.BLUE else red).add_unit(
+            sim.create_unit(rng.randrange(COLS), rng.randrange(ROWS), team, rng.choice((1, 2, 3))))
+    return sim
+
+def apply_actions(sim, actions):
+    """
+    Issues one env's actions to a SimulationController, as its TeamControllers would.
+    """
+    for unit, action in zip(sim.units, actions.tolist()):
+        if action != STAY:
+            sim.move_unit(unit, DIRECTIONS[action])
+
+def assert_env_matches(env, index, sim):
+    observation = env.observation()
+    assert env.codes[index].tobytes() == sim.tiles.tobytes()
+    assert observation["unit_col"][index].tolist() == [unit.col for unit in sim.units]
+    assert observation["unit_row"][index].tolist() == [unit.row for unit in sim.units]
+    assert observation["is_moving"][index].tolist() == [unit.is_moving for unit in sim.units]
+    counts = sim.tiles.get_counts()
+    assert env.shares()[index].tolist() == [counts[team] / (COLS * ROWS) for team in (None, Team.BLUE, Team.RED)]
+
+@pytest.mark.parametrize("use_unit_store", [False, True])
+def test_stepping_with_controller_actions_matches_simulation(use_unit_store):
+    sims = [make_sim(use_unit_store) for _ in range(3)]
+    env = VectorEnv.from_simulation(sims[0], 3, delta_time=150)
+    rng = np.random.default_rng(0)
+    for _ in range(60):
+        actions = env.random_actions(rng)
+        actions[rng.random(actions.shape) < 0.2] = STAY
+        before = env.shares().copy()
+        _, rewards = env.step(actions)
+        for index, sim in enumerate(sims):
+            apply_actions(sim, actions[index])
+            sim.update(150)
+            assert_env_matches(env, index, sim)
+        assert np.allclose(rewards, (env.shares() - before)[:, [TEAM_CODES[Team.BLUE], TEAM_CODES[Team.RED]]])
+
+def test_copy_keeps_moves_in_flight():
+    sim = make_sim(False)
+    apply_actions(sim, np.full(len(sim.units), 3))  # Everyone heads east
+    sim.update(150)
+    env = VectorEnv.from_simulation(sim, 2, delta_time=150)
+    for _ in range(10):
+        env.step(np.full((2, len(sim.units)), STAY))
+        sim.update(150)
+        assert_env_matches(env, 0, sim)
+        assert_env_matches(env, 1, sim)
+
+def test_field_actions_follow_each_teams_table():
+    env = VectorEnv(2, ROWS, COLS, [0, 4, 8], [0, 3, 6], [1, 2, 1], [1, 1, 1], delta_time=100)
+    blue_table = np.full(ROWS * COLS, 3, dtype=np.int8)
+    blue_table[8 * ROWS + 6] = -1
+    actions = env.field_actions({Team.BLUE: blue_table})
+    assert actions.tolist() == [[3, STAY, STAY]] * 2  # Red has no table; blue stays on its goal
+
+def test_step_rejects_wrong_action_shape():
+    env = VectorEnv(2, ROWS, COLS, [0], [0], [1], [1], delta_time=100)
+    with pytest.raises(ValueError):
+        env.step(np.zeros((3, 1)))
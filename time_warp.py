@@ -0,0 +1,102 @@
+import time
+from collections import deque
+
+SPEEDS = (1, 10, 100, None)  # Time scales offered in the window; None runs as many ticks as the budget allows
+
+class TimeWarp:
+    """
+    Decides how many simulation ticks to run per displayed frame and which frames to draw.
+
+    At 1x every frame runs one tick of the frame's real delta_time, as the lockstep loop
+    always has. Faster speeds run fixed ticks of tick_ms until the frame's share of
+    simulated time is used up or budget_ms of CPU time has been spent, whichever comes
+    first, so input stays responsive however far the simulation falls behind. Simulated
+    time that does not fit in the budget is dropped rather than carried over.
+    """
+    def __init__(self, tick_ms: int, budget_ms: float, render_every: int = 1, speed_index: int = 0):
+        """
+        Args:
+            tick_ms (int): Simulated milliseconds per tick above 1x.
+            budget_ms (float): Wall-clock milliseconds per frame the ticks may take.
+            render_every (int): Draw the map only once this many ticks have run since the last draw.
+            speed_index (int): Index of the starting speed in SPEEDS.
+
+        Raises:
+            ValueError: If tick_ms, budget_ms or render_every is not positive.
+        """
+        if tick_ms <= 0 or budget_ms <= 0 or render_every <= 0:
+            raise ValueError("tick_ms, budget_ms and render_every must be positive.")
+        self.tick_ms = tick_ms
+        self.budget_ms = budget_ms
+        self.render_every = render_every
+        self.speed_index = speed_index
+        self.pending_ms = 0.0  # Simulated time owed to the current speed, below one tick
+        self.ticks_since_draw = 0
+        self.recent = deque()  # (perf_counter(), ticks) of recent frames, for the achieved rate
+        self.recent_ticks = 0
+
+    @property
+    def speed(self) -> int | None:
+        return SPEEDS[self.speed_index]
+
+    def set_speed(self, index: int):
+        self.speed_index = index
+        self.pending_ms = 0.0
+
+    def advance(self, step, delta_time: int) -> int:
+        """
+        Runs this frame's ticks.
+
+        Args:
+            step (Callable[[int], None]): Runs one tick of the given simulated milliseconds.
+            delta_time (int): Real milliseconds since the previous frame.
+
+        Returns:
+            int: The number of ticks run.
+        """
+        start = time.perf_counter()
+        deadline = start + self.budget_ms / 1000
+        if self.speed == 1:
+            step(delta_time)
+            ticks = 1
+        else:
+            ticks = 0
+            if self.speed is not None:
+                self.pending_ms += delta_time * self.speed
+            while self.speed is None or self.pending_ms >= self.tick_ms:
+                step(self.tick_ms)
+                ticks += 1
+                if self.speed is not None:
+                    self.pending_ms -= self.tick_ms
+                if time.perf_counter() >= deadline:
+                    self.pending_ms = min(self.pending_ms, self.tick_ms)  # Drop what the budget could not cover
+                    break
+        now = time.perf_counter()
+        self.recent.append((now, ticks))
+        self.recent_ticks += ticks
+        while now - self.recent[0][0] > 1.0:
+            self.recent_ticks -= self.recent.popleft()[1]
+        self.ticks_since_draw += ticks
+        return ticks
+
+    def should_draw(self, force: bool = False) -> bool:
+        """
+        Returns True if the map is due to be drawn this frame, and starts counting again if so.
+
+        Args:
+            force (bool): Draw regardless of the tick count, for example after the view moved.
+        """
+        if not force and self.ticks_since_draw < self.render_every:
+            return False
+        self.ticks_since_draw = 0
+        return True
+
+    def ticks_per_second(self) -> int:
+        """
+        Returns the number of ticks run in the last second of wall-clock time.
+        """
+        return self.recent_ticks
+
+    def status(self) -> str:
+        speed = "max" if self.speed is None else f"{self.speed}x"
+        return f"Speed: {speed} ({self.ticks_per_second()} ticks/s)"
@@ -0,0 +1,252 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from controllers import SimulationController
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the unit store needs it
+    np = None
+import gamelogic
+from game_objects import Team, Unit, DIRECTIONS, TEAM_CODES, CODE_TEAMS
+
+class UnitStore:
+    """
+    Struct-of-arrays storage for units, so movement can be updated for the
+    whole population with NumPy array operations instead of per-object loops.
+    """
+    def __init__(self, rows: int, cols: int, capacity: int = 1024, seed: int = None,
+                 topology: gamelogic.HexTopology = None):
+        """
+        Args:
+            rows (int): Number of grid rows.
+            cols (int): Number of grid columns.
+            capacity (int): Initial number of unit slots to allocate.
+            seed (int, optional): Seed for the store's random generator.
+            topology (HexTopology, optional): Adjacency moves follow, normally
+                SimulationController.topology. Defaults to the shared table for the grid size.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("UnitStore requires NumPy to be installed.")
+        self.rows = rows
+        self.cols = cols
+        self.topology = gamelogic.get_topology(rows, cols) if topology is None else topology
+        self.size = 0
+        self.rng = np.random.default_rng(seed)
+        self._allocate(max(capacity, 1))
+
+    def _allocate(self, capacity: int):
+        """
+        Allocates (or grows) every column to the given capacity, keeping existing rows.
+        """
+        old = getattr(self, "col", None)
+        columns = {
+            "col": np.int32, "row": np.int32, "team": np.int8, "speed": np.float64,
+            "is_moving": np.bool_, "move_progress": np.float64,
+            "elapsed_time": np.float64, "move_duration": np.float64,
+            "start_col": np.int32, "start_row": np.int32,
+            "target_col": np.int32, "target_row": np.int32, "direction": np.int8,
+        }
+        for name, dtype in columns.items():
+            column = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                column[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def append(self, col: int, row: int, team: Team, speed: float) -> int:
+        """
+        Adds a stationary unit and returns its index in the store.
+        """
+        if self.size == self.capacity:
+            self._allocate(self.capacity * 2)
+        index = self.size
+        self.col[index] = self.start_col[index] = self.target_col[index] = col
+        self.row[index] = self.start_row[index] = self.target_row[index] = row
+        self.team[index] = TEAM_CODES[team]
+        self.speed[index] = speed
+        self.size += 1
+        return index
+
+    def extend(self, cols: "np.ndarray", rows: "np.ndarray", team_codes: "np.ndarray",
+               speeds: "np.ndarray") -> "np.ndarray":
+        """
+        Adds a batch of stationary units in one pass and returns their indices.
+
+        Args:
+            cols (np.ndarray): Column of each unit.
+            rows (np.ndarray): Row of each unit.
+            team_codes (np.ndarray): Team code of each unit (see game_objects.TEAM_CODES).
+            speeds (np.ndarray): Speed of each unit.
+        """
+        count = len(cols)
+        if self.size + count > self.capacity:
+            self._allocate(max(self.capacity * 2, self.size + count))
+        indices = np.arange(self.size, self.size + count)
+        self.col[indices] = self.start_col[indices] = self.target_col[indices] = cols
+        self.row[indices] = self.start_row[indices] = self.target_row[indices] = rows
+        self.team[indices] = team_codes
+        self.speed[indices] = speeds
+        self.size += count
+        return indices
+
+    def load_columns(self, columns: dict[str, "np.ndarray"], size: int):
+        """
+        Replaces the store's contents with the given column arrays in one bulk copy.
+        Columns that are not given are reset to zero.
+        """
+        self.size = 0
+        self._allocate(max(size, self.capacity))
+        for name, values in columns.items():
+            getattr(self, name)[:size] = values
+        self.size = size
+
+    def start_moves(self, indices: "np.ndarray", directions: "np.ndarray") -> "np.ndarray":
+        """
+        Starts moving the given units one hex in the given directions. Units that
+        are already moving, or whose move would leave the grid, are ignored.
+
+        Args:
+            indices (np.ndarray): Unit indices.
+            directions (np.ndarray): Direction indices (see game_objects.DIRECTIONS), one per unit.
+
+        Returns:
+            np.ndarray: Indices of the units that actually started moving.
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        directions = np.asarray(directions, dtype=np.intp)
+        idle = ~self.is_moving[indices]
+        indices = indices[idle]
+        directions = directions[idle]
+
+        cells = self.col[indices] * self.rows + self.row[indices]
+        targets = self.topology.move_targets(cells, directions)
+        valid = targets >= 0
+        indices = indices[valid]
+        new_col, new_row = np.divmod(targets[valid], self.rows)
+
+        self.is_moving[indices] = True
+        self.move_progress[indices] = 0.0
+        self.start_col[indices] = self.col[indices]
+        self.start_row[indices] = self.row[indices]
+        self.target_col[indices] = new_col
+        self.target_row[indices] = new_row
+        self.direction[indices] = directions[valid]
+        self.move_duration[indices] = gamelogic.BASE_MOVE_DURATION / self.speed[indices]
+        self.elapsed_time[indices] = 0
+        return indices
+
+    def move_randomly(self, team: Team, rng: "np.random.Generator" = None) -> "np.ndarray":
+        """
+        Starts a move in a random direction for every idle unit of the given team.
+
+        Returns:
+            np.ndarray: Indices of the units that actually started moving.
+        """
+        rng = self.rng if rng is None else rng
+        n = self.size
+        candidates = np.flatnonzero((self.team[:n] == TEAM_CODES[team]) & ~self.is_moving[:n])
+        directions = rng.integers(0, len(DIRECTIONS), size=len(candidates))
+        return self.start_moves(candidates, directions)
+
+    def move_along(self, team: Team, directions: "np.ndarray") -> "np.ndarray":
+        """
+        Starts a move for every idle unit of the given team in the direction its current
+        cell holds in a per-cell direction table, such as a flow field. Cells holding -1
+        leave their units in place.
+
+        Returns:
+            np.ndarray: Indices of the units that actually started moving.
+        """
+        n = self.size
+        candidates = np.flatnonzero((self.team[:n] == TEAM_CODES[team]) & ~self.is_moving[:n])
+        steps = directions[self.col[candidates] * self.rows + self.row[candidates]]
+        keep = steps >= 0
+        return self.start_moves(candidates[keep], steps[keep])
+
+    def update(self, delta_time: int) -> "np.ndarray":
+        """
+        Advances every moving unit by delta_time and completes finished moves.
+
+        Args:
+            delta_time (int): Milliseconds elapsed since the last update.
+
+        Returns:
+            np.ndarray: Indices (ascending) of the units whose move completed.
+        """
+        moving = np.flatnonzero(self.is_moving[:self.size])
+        self.elapsed_time[moving] += delta_time
+        progress = np.minimum(self.elapsed_time[moving] / self.move_duration[moving], 1.0)
+        self.move_progress[moving] = progress
+        done = moving[progress >= 1.0]
+        self.is_moving[done] = False
+        self.col[done] = self.target_col[done]
+        self.row[done] = self.target_row[done]
+        return done
+
+def make_rng(seed: int) -> "np.random.Generator":
+    """
+    Creates a NumPy random generator for driving UnitStore moves.
+    """
+    return np.random.default_rng(seed)
+
+def _column_property(name: str, convert):
+    """
+    Builds a property that reads and writes one UnitStore column for a UnitView.
+    """
+    def getter(self):
+        return convert(getattr(self._store, name)[self.index])
+
+    def setter(self, value):
+        getattr(self._store, name)[self.index] = value
+
+    return property(getter, setter)
+
+class UnitView(Unit):
+    """
+    A thin Unit-compatible view onto one row of a UnitStore.
+    """
+    col = _column_property("col", int)
+    row = _column_property("row", int)
+    speed = _column_property("speed", float)
+    is_moving = _column_property("is_moving", bool)
+    move_progress = _column_property("move_progress", float)
+    elapsed_time = _column_property("elapsed_time", float)
+    move_duration = _column_property("move_duration", float)
+
+    def __init__(self, store: UnitStore, index: int, simulation_controller: "SimulationController"):
+        """
+        Args:
+            store (UnitStore): The store holding the unit's data.
+            index (int): The unit's row in the store.
+            simulation_controller (SimulationController): The controller that owns the store.
+        """
+        self._store = store
+        self.index = index
+        self.simulation_controller = simulation_controller
+
+    @property
+    def team(self) -> Team:
+        return CODE_TEAMS[self._store.team[self.index]]
+
+    @team.setter
+    def team(self, team: Team):
+        self._store.team[self.index] = TEAM_CODES[team]
+
+    @property
+    def start_tile(self) -> tuple[int, int]:
+        return int(self._store.start_col[self.index]), int(self._store.start_row[self.index])
+
+    @start_tile.setter
+    def start_tile(self, tile: tuple[int, int]):
+        self._store.start_col[self.index], self._store.start_row[self.index] = tile
+
+    @property
+    def target_tile(self) -> tuple[int, int]:
+        return int(self._store.target_col[self.index]), int(self._store.target_row[self.index])
+
+    @target_tile.setter
+    def target_tile(self, tile: tuple[int, int]):
+        self._store.target_col[self.index], self._store.target_row[self.index] = tile
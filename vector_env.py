@@ -0,0 +1,219 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from controllers import SimulationController
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; only the vectorized environment needs it
+    np = None
+import gamelogic
+from game_objects import Team, TileGrid, DIRECTIONS, TEAM_CODES
+
+STAY = -1  # Action for a unit that should not start a move this step
+
+class VectorEnv:
+    """
+    K independent copies of one simulation world stepped in lockstep, for evaluating
+    policies in batches. Every per-unit and per-tile quantity is a (K, ...) array, and a
+    step is a fixed number of array operations regardless of K, with no per-env loop.
+
+    Moves follow the same rules as SimulationController with a unit store: a step first
+    starts the moves chosen by the actions, then advances time by delta_time, completes
+    finished moves in unit order and lets each unit claim the tile it arrives on. An env
+    stepped with the actions its TeamControllers would have issued matches the controller.
+    """
+    def __init__(self, num_envs: int, rows: int, cols: int, unit_cols, unit_rows, team_codes, speeds,
+                 delta_time: int, tile_codes=None):
+        """
+        Args:
+            num_envs (int): Number of environment copies (K).
+            rows (int): Number of grid rows.
+            cols (int): Number of grid columns.
+            unit_cols (Sequence[int] | np.ndarray): Starting column of each unit.
+            unit_rows (Sequence[int] | np.ndarray): Starting row of each unit.
+            team_codes (Sequence[int] | np.ndarray): Team code of each unit (see game_objects.TEAM_CODES).
+            speeds (Sequence[float] | np.ndarray): Speed of each unit.
+            delta_time (int): Simulated milliseconds advanced per step.
+            tile_codes (bytes | np.ndarray, optional): Starting affiliation codes in column-major
+                order. Defaults to a neutral map on which each unit claims its starting tile.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            ValueError: If num_envs or delta_time is not positive.
+        """
+        if np is None:
+            raise ImportError("VectorEnv requires NumPy to be installed.")
+        if num_envs <= 0:
+            raise ValueError(f"num_envs must be positive, got {num_envs}")
+        if delta_time <= 0:
+            raise ValueError(f"delta_time must be positive, got {delta_time}")
+        self.num_envs = num_envs
+        self.rows = rows
+        self.cols = cols
+        self.cell_count = rows * cols
+        self.delta_time = delta_time
+        self._neighbors = gamelogic.get_topology(rows, cols).as_array()
+        self.team = np.asarray(team_codes, dtype=np.int8)
+        self.move_duration = gamelogic.BASE_MOVE_DURATION / np.asarray(speeds, dtype=np.float64)
+        self.unit_count = len(self.team)
+
+        self._initial_cells = np.asarray(unit_cols, dtype=np.int64) * rows + np.asarray(unit_rows, dtype=np.int64)
+        if tile_codes is None:
+            codes = np.zeros(self.cell_count, dtype=np.int8)
+            codes[self._initial_cells] = self.team  # Later units win shared tiles, as in order
+        else:
+            codes = np.frombuffer(bytes(tile_codes), dtype=np.int8).copy()
+        self._initial_codes = codes
+        self._initial_moves = None  # (is_moving, elapsed_time, target) when copied mid-move
+        self.reset()
+
+    @classmethod
+    def from_simulation(cls, simulation_controller: "SimulationController", num_envs: int,
+                        delta_time: int) -> "VectorEnv":
+        """
+        Creates K copies of a SimulationController's current world, including moves in flight.
+
+        Raises:
+            ValueError: If the controller's tiles are not a TileGrid.
+        """
+        sim = simulation_controller
+        if not isinstance(sim.tiles, TileGrid):
+            raise ValueError("VectorEnv can only copy a simulation backed by a TileGrid.")
+        units = sim.units
+        store = sim.unit_store
+        if store is not None:
+            n = store.size
+            cols, rows, team_codes, speeds = store.col[:n], store.row[:n], store.team[:n], store.speed[:n]
+            is_moving = store.is_moving[:n].copy()
+            elapsed = store.elapsed_time[:n].copy()
+            targets = store.target_col[:n].astype(np.int64) * sim.rows + store.target_row[:n]
+        else:
+            cols = [unit.col for unit in units]
+            rows = [unit.row for unit in units]
+            team_codes = [TEAM_CODES[unit.team] for unit in units]
+            speeds = [unit.speed for unit in units]
+            is_moving = np.array([unit.is_moving for unit in units], dtype=np.bool_)
+            # Scheduled moves track their start time instead of the elapsed time
+            elapsed = np.array([sim.time - unit.move_start_time if unit.is_moving and unit.move_start_time is not None
+                                else unit.elapsed_time for unit in units], dtype=np.float64)
+            targets = np.array([unit.target_tile[0] * sim.rows + unit.target_tile[1] if unit.target_tile
+                                else unit.col * sim.rows + unit.row for unit in units], dtype=np.int64)
+        env = cls(num_envs, sim.rows, sim.cols, cols, rows, team_codes, speeds, delta_time, sim.tiles.tobytes())
+        env._initial_moves = (is_moving, elapsed, targets)
+        env.reset()
+        return env
+
+    def reset(self) -> dict[str, "np.ndarray"]:
+        """
+        Puts every env back into the starting state and returns the observation.
+        """
+        k = self.num_envs
+        self.cells = np.tile(self._initial_cells, (k, 1))  # (K, units) cell each unit stands on
+        self.codes = np.tile(self._initial_codes, (k, 1))  # (K, cells) affiliation codes
+        if self._initial_moves is None:
+            self.is_moving = np.zeros((k, self.unit_count), dtype=np.bool_)
+            self.elapsed_time = np.zeros((k, self.unit_count), dtype=np.float64)
+            self.targets = self.cells.copy()
+        else:
+            is_moving, elapsed, targets = self._initial_moves
+            self.is_moving = np.tile(is_moving, (k, 1))
+            self.elapsed_time = np.tile(elapsed, (k, 1))
+            self.targets = np.tile(targets, (k, 1))
+        self.counts = self._count_codes()
+        self.steps = 0
+        return self.observation()
+
+    def _count_codes(self) -> "np.ndarray":
+        """
+        Returns the (K, 3) number of tiles holding each affiliation code.
+        """
+        offsets = np.arange(self.num_envs)[:, None] * 3
+        return np.bincount((self.codes + offsets).reshape(-1), minlength=3 * self.num_envs).reshape(self.num_envs, 3)
+
+    def observation(self) -> dict[str, "np.ndarray"]:
+        """
+        Returns the stacked observation of every env:
+        "affiliation" (K, cols, rows) tile codes, "unit_col" and "unit_row" (K, units)
+        grid positions (moving units at their start tile) and "is_moving" (K, units).
+        The arrays are views of the live state and change on the next step.
+        """
+        unit_col, unit_row = np.divmod(self.cells, self.rows)
+        return {
+            "affiliation": self.codes.reshape(self.num_envs, self.cols, self.rows),
+            "unit_col": unit_col,
+            "unit_row": unit_row,
+            "is_moving": self.is_moving,
+        }
+
+    def step(self, actions) -> tuple[dict[str, "np.ndarray"], "np.ndarray"]:
+        """
+        Starts the chosen moves in every env and advances them all by delta_time.
+
+        Args:
+            actions (np.ndarray): (K, units) direction indices (see game_objects.DIRECTIONS),
+                or STAY. Actions for units already moving, or that would leave the grid, are ignored.
+
+        Returns:
+            tuple[dict[str, np.ndarray], np.ndarray]: The observation after the step, and the
+                (K, 2) change in blue and red territory share (fraction of all tiles) it caused.
+
+        Raises:
+            ValueError: If actions does not have shape (K, units).
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if actions.shape != (self.num_envs, self.unit_count):
+            raise ValueError(f"actions must have shape {(self.num_envs, self.unit_count)}, got {actions.shape}")
+
+        # Start moves: idle units with an action whose target lies on the grid
+        targets = self._neighbors[self.cells, np.maximum(actions, 0)]
+        start = ~self.is_moving & (actions >= 0) & (targets >= 0)
+        self.targets[start] = targets[start]
+        self.elapsed_time[start] = 0
+        self.is_moving |= start
+
+        # Advance time and complete the moves that finish, as UnitStore.update() does
+        self.elapsed_time[self.is_moving] += self.delta_time
+        progress = np.minimum(self.elapsed_time / self.move_duration, 1.0)
+        done = self.is_moving & (progress >= 1.0)
+        self.is_moving &= ~done
+        self.cells[done] = self.targets[done]
+
+        # Claim arrival tiles. Flattened (env, unit) order is unit order within each env,
+        # so keeping the last entry per tile means the highest unit index wins, as in order.
+        env_index, unit_index = np.nonzero(done)
+        flat = env_index * self.cell_count + self.cells[env_index, unit_index]
+        flat, last = np.unique(flat[::-1], return_index=True)
+        new = self.team[unit_index[::-1][last]]
+        codes = self.codes.reshape(-1)
+        old = codes[flat]
+        codes[flat] = new
+        env_of = flat // self.cell_count
+        delta = (np.bincount(env_of * 3 + new, minlength=3 * self.num_envs)
+                 - np.bincount(env_of * 3 + old, minlength=3 * self.num_envs)).reshape(self.num_envs, 3)
+        self.counts += delta
+        self.steps += 1
+        rewards = delta[:, [TEAM_CODES[Team.BLUE], TEAM_CODES[Team.RED]]] / self.cell_count
+        return self.observation(), rewards
+
+    def shares(self) -> "np.ndarray":
+        """
+        Returns each env's (K, 3) neutral, blue and red territory share, indexed by team code.
+        """
+        return self.counts / self.cell_count
+
+    def random_actions(self, rng: "np.random.Generator") -> "np.ndarray":
+        """
+        Returns a random direction for every unit in every env, as move_units_randomly() picks.
+        """
+        return rng.integers(0, len(DIRECTIONS), size=(self.num_envs, self.unit_count))
+
+    def field_actions(self, directions: dict[Team, "np.ndarray"]) -> "np.ndarray":
+        """
+        Returns each unit's action from a per-cell direction table for its team, such as a
+        FlowField's directions_array(). Units of teams without a table stay where they are.
+        """
+        actions = np.full((self.num_envs, self.unit_count), STAY, dtype=np.int64)
+        for team, table in directions.items():
+            mine = self.team == TEAM_CODES[team]
+            actions[:, mine] = table[self.cells[:, mine]]
+        return actions